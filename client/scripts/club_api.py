@@ -1,18 +1,244 @@
+import base64
+import hashlib
+import json
 import logging
-from typing import Any, Dict, Optional, Union
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import requests
-from requests_toolbelt.multipart.encoder import MultipartEncoder
+from requests_toolbelt.multipart.encoder import (
+    MultipartEncoder,
+    MultipartEncoderMonitor,
+)
+
+# Sessions, persisted queries and page queries are shared with the test
+# clients in scripts/
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts")
+)
+from http_session import create_session, post_idempotent
+from pagination import MAX_PAGE_SIZE, PAGE_QUERIES
+from persisted_queries import PersistedQueryCache, is_persisted_query_not_found
 
 logging.basicConfig(level=logging.INFO)
 
 BASE_URL = "http://localhost:4010"  # Change to your backend URL
 
+# progress(bytes_sent, total_bytes)
+ProgressCallback = Callable[[int, int], None]
+
+
+class TokenCache:
+    """
+    JWTs kept per server in a JSON file readable only by the owner, so
+    separate CLI runs reuse one login until shortly before it expires.
+    """
+
+    def __init__(self, path: str, refresh_margin: float = 3600):
+        self.path = path
+        self.refresh_margin = refresh_margin
+
+    @staticmethod
+    def expires_at(token: str) -> Optional[float]:
+        """
+        The token's `exp` claim; the signature is the server's business.
+        """
+        try:
+            claims = token.split(".")[1]
+            claims += "=" * (-len(claims) % 4)
+            return float(json.loads(base64.urlsafe_b64decode(claims))["exp"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    def is_fresh(self, token: str) -> bool:
+        expires_at = self.expires_at(token)
+        return expires_at is None or time.time() + self.refresh_margin < expires_at
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, tokens: Dict[str, Dict[str, Any]]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(tokens, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, base_url: str) -> Optional[str]:
+        token = self._read().get(base_url, {}).get("token")
+        if token and self.is_fresh(token):
+            return token
+        return None
+
+    def set(self, base_url: str, token: str) -> None:
+        tokens = self._read()
+        tokens[base_url] = {"token": token, "expires_at": self.expires_at(token)}
+        self._write(tokens)
+
+    def clear(self, base_url: str) -> None:
+        tokens = self._read()
+        if tokens.pop(base_url, None) is not None:
+            self._write(tokens)
+
+
+class UploadSessions:
+    """
+    Ids of unfinished resumable uploads, kept in a JSON file so an upload
+    interrupted in one run continues from the server's offset in the next.
+    Entries are keyed by URL, path, size and mtime: a changed file starts over.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, file_path: str) -> str:
+        stat = os.stat(file_path)
+        return f"{url} {os.path.abspath(file_path)} {stat.st_size} {stat.st_mtime_ns}"
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, sessions: Dict[str, str]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(sessions, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._read().get(key)
+
+    def set(self, key: str, upload_id: str) -> None:
+        with self._lock:
+            sessions = self._read()
+            sessions[key] = upload_id
+            self._write(sessions)
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            sessions = self._read()
+            if sessions.pop(key, None) is not None:
+                self._write(sessions)
+
+
+def _file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class GraphQLBatch:
+    """
+    Queues GraphQL operations and sends them as one JSON-array POST.
+    Each `add` returns a Future resolving to the operation's `data`, or
+    raising like `ClubAPI.graphql` does when the operation has errors.
+    """
+
+    def __init__(self, api: "ClubAPI", max_size: int = 50):
+        self.api = api
+        self.max_size = max_size
+        self._pending: List[Tuple[Dict[str, Any], Future]] = []
+
+    def add(self, query: Union[str, Any], variables: Dict[str, Any] = None) -> Future:
+        payload = {"query": getattr(query, "text", query)}
+        if variables:
+            payload["variables"] = variables
+        future: Future = Future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        return future
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            results = self.api._post_graphql([payload for payload, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            if "errors" in result:
+                logging.error(f"GraphQL error: {result['errors']}")
+                future.set_exception(Exception(result["errors"]))
+            else:
+                future.set_result(result.get("data"))
+
+    def cancel(self) -> None:
+        pending, self._pending = self._pending, []
+        for _, future in pending:
+            future.cancel()
+
 
 class ClubAPI:
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        persisted_queries: bool = False,
+        persisted_query_registry: Optional[str] = None,
+        token_cache: Optional[TokenCache] = None,
+    ):
         self.base_url = base_url.rstrip("/")
-        self.token = None
+        self.token_cache = token_cache
+        self.token = token_cache.get(self.base_url) if token_cache else None
+        # Set by ensure_token, to log in again when the server rejects the token
+        self.credentials: Optional[Callable[[], Tuple[str, str]]] = None
+        self._login_lock = threading.Lock()
+        self.session = create_session(
+            pool_connections, pool_maxsize, max_retries, backoff_factor
+        )
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.persisted_queries = (
+            PersistedQueryCache(registry_file=persisted_query_registry)
+            if persisted_queries or persisted_query_registry
+            else None
+        )
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "ClubAPI":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
     def get_login_token(self, username: str, password: str) -> Optional[str]:
         """
@@ -20,103 +246,545 @@ class ClubAPI:
         """
         url = f"{self.base_url}/login"
         payload = {"email": username, "password": password}
-        response = requests.post(url, json=payload)
+        response = self.session.post(url, json=payload)
         if response.status_code == 200:
             data = response.json()
             self.token = data.get("token")
+            if self.token_cache and self.token:
+                self.token_cache.set(self.base_url, self.token)
             logging.info("Login successful.")
             return self.token
         else:
             logging.error(f"Login failed: {response.status_code} {response.text}")
             return None
 
+    def ensure_token(self, credentials: Callable[[], Tuple[str, str]]) -> Optional[str]:
+        """
+        Return a usable token, calling `credentials()` for a username and
+        password and logging in only when there is no cached token or it
+        is about to expire. Requests the server rejects as unauthenticated
+        later call `credentials()` again, once, to log in and retry.
+        """
+        self.credentials = credentials
+        if self.token and (
+            self.token_cache is None or self.token_cache.is_fresh(self.token)
+        ):
+            return self.token
+        username, password = credentials()
+        return self.get_login_token(username, password)
+
+    def _relogin(self, rejected: Optional[str]) -> bool:
+        """
+        Forget the `rejected` token and log in again with the credentials
+        given to ensure_token; False if there are none. Concurrent callers
+        rejected with the same token share one login.
+        """
+        if self.credentials is None:
+            return False
+        with self._login_lock:
+            if self.token and self.token != rejected:
+                return True
+            self.logout()
+            username, password = self.credentials()
+            return self.get_login_token(username, password) is not None
+
+    @staticmethod
+    def _is_unauthenticated(result: Any) -> bool:
+        return isinstance(result, dict) and any(
+            (error.get("extensions") or {}).get("code") == "UNAUTHENTICATED"
+            for error in result.get("errors") or []
+        )
+
+    def logout(self) -> None:
+        """
+        Forget the token, including its cached copy.
+        """
+        self.token = None
+        if self.token_cache:
+            self.token_cache.clear(self.base_url)
+
     def _headers(self, extra: Dict[str, str] = None) -> Dict[str, str]:
         headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
         if extra:
             headers.update(extra)
         return headers
 
-    def api_get(self, endpoint: str, params: Dict[str, Any] = None) -> Any:
+    def _request(self, method: str, endpoint: str, **kwargs: Any) -> Any:
         url = f"{self.base_url}{endpoint}"
-        response = requests.get(url, headers=self._headers(), params=params)
+        token = self.token
+        response = self.session.request(method, url, headers=self._headers(), **kwargs)
+        if response.status_code == 401 and self._relogin(token):
+            response = self.session.request(
+                method, url, headers=self._headers(), **kwargs
+            )
         response.raise_for_status()
         return response.json()
 
+    def api_get(self, endpoint: str, params: Dict[str, Any] = None) -> Any:
+        return self._request("GET", endpoint, params=params)
+
     def api_post(self, endpoint: str, data: Dict[str, Any]) -> Any:
-        url = f"{self.base_url}{endpoint}"
-        response = requests.post(url, headers=self._headers(), json=data)
-        response.raise_for_status()
-        return response.json()
+        return self._request("POST", endpoint, json=data)
 
     def api_put(self, endpoint: str, data: Dict[str, Any]) -> Any:
-        url = f"{self.base_url}{endpoint}"
-        response = requests.put(url, headers=self._headers(), json=data)
-        response.raise_for_status()
-        return response.json()
+        return self._request("PUT", endpoint, json=data)
 
     def api_delete(self, endpoint: str) -> Any:
-        url = f"{self.base_url}{endpoint}"
-        response = requests.delete(url, headers=self._headers())
-        response.raise_for_status()
-        return response.json()
+        return self._request("DELETE", endpoint)
 
-    def graphql(self, query: str, variables: Dict[str, Any] = None) -> Any:
+    def _post_graphql(
+        self,
+        payload: Union[Dict, List[Dict]],
+        retry: bool = False,
+        relogin: bool = True,
+    ) -> Any:
         """
-        Perform a GraphQL query or mutation.
+        POST one operation or a batch. Operations rejected as unauthenticated
+        are sent again after logging in anew, unless `relogin` is False.
         """
         url = f"{self.base_url}/graphql"
-        payload = {"query": query}
-        if variables:
-            payload["variables"] = variables
-        response = requests.post(
-            url,
-            headers=self._headers({"Content-Type": "application/json"}),
-            json=payload,
-        )
+        token = self.token
+        headers = self._headers({"Content-Type": "application/json"})
+        if retry:
+            response = post_idempotent(
+                self.session,
+                url,
+                self.max_retries,
+                self.backoff_factor,
+                headers=headers,
+                json=payload,
+            )
+        else:
+            response = self.session.post(url, headers=headers, json=payload)
+        if response.status_code == 401 and relogin and self._relogin(token):
+            return self._post_graphql(payload, retry, relogin=False)
         response.raise_for_status()
         data = response.json()
+        if isinstance(payload, list) and (
+            not isinstance(data, list) or len(data) != len(payload)
+        ):
+            # Server does not accept batched requests
+            raise Exception(data.get("errors") if isinstance(data, dict) else data)
+        if not relogin:
+            return data
+        if not isinstance(payload, list):
+            if self._is_unauthenticated(data) and self._relogin(token):
+                data = self._post_graphql(payload, retry, relogin=False)
+            return data
+        # Only the rejected operations of a batch are sent again
+        rejected = [
+            i for i, result in enumerate(data) if self._is_unauthenticated(result)
+        ]
+        if rejected and self._relogin(token):
+            retried = self._post_graphql(
+                [payload[i] for i in rejected], retry, relogin=False
+            )
+            for i, result in zip(rejected, retried):
+                data[i] = result
+        return data
+
+    def graphql(
+        self,
+        query: Union[str, Any],
+        variables: Dict[str, Any] = None,
+        retry: bool = False,
+    ) -> Any:
+        """
+        Perform a GraphQL query or mutation.
+        `query` is a query string or a `query_registry.Document`, whose
+        precomputed hash and operation name are reused. With `retry`,
+        timeouts and gateway errors are retried as well as failed
+        connections; pass it only for queries, never for mutations.
+        """
+        text = getattr(query, "text", query)
+        if self.persisted_queries is not None:
+            data = self._persisted_graphql(
+                text, variables, getattr(query, "sha256_hash", None), retry
+            )
+        else:
+            payload = {"query": text}
+            if variables:
+                payload["variables"] = variables
+            data = self._post_graphql(payload, retry)
         if "errors" in data:
             logging.error(f"GraphQL error: {data['errors']}")
             raise Exception(data["errors"])
         return data.get("data")
 
+    def _persisted_graphql(
+        self,
+        query: str,
+        variables: Dict[str, Any] = None,
+        known_hash: Optional[str] = None,
+        retry: bool = False,
+    ) -> Any:
+        """
+        Send only the query hash when the server already knows the query,
+        falling back to the full text on PersistedQueryNotFound.
+        """
+        cache = self.persisted_queries
+        payload = cache.build_payload(query, variables, known_hash)
+        data = self._post_graphql(payload, retry)
+        if "query" not in payload and is_persisted_query_not_found(data):
+            cache.discard(query)
+            payload = cache.build_payload(query, variables, known_hash)
+            data = self._post_graphql(payload, retry)
+        if "data" in data:
+            cache.add(query, payload["extensions"]["persistedQuery"]["sha256Hash"])
+        return data
+
+    @contextmanager
+    def batch(self, max_size: int = 50) -> Iterator[GraphQLBatch]:
+        """
+        Send every operation added inside the block as a single request on exit.
+        """
+        graphql_batch = GraphQLBatch(self, max_size)
+        try:
+            yield graphql_batch
+        except BaseException:
+            graphql_batch.cancel()
+            raise
+        graphql_batch.flush()
+
+    def graphql_batch(
+        self, operations: Sequence[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Any]:
+        """
+        Perform several GraphQL operations in one round-trip.
+        Returns the `data` of each operation, in order.
+        """
+        with self.batch() as graphql_batch:
+            futures = [
+                graphql_batch.add(query, variables) for query, variables in operations
+            ]
+        return [future.result() for future in futures]
+
+    def iter_pages(
+        self,
+        query: Union[str, Any],
+        variables: Optional[Dict[str, Any]],
+        field: str,
+        page_size: int = 100,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the items of a paginated list field, passing the last
+        item's id as `after` for each next page. With `prefetch`, the next
+        page is requested while the caller works through the current one.
+        `page_size` is capped at MAX_PAGE_SIZE. If the `after` item is
+        deleted while iterating, the server's error is raised rather than
+        the list ending early.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        variables = dict(variables or {}, limit=page_size)
+
+        def fetch(after: Optional[str]) -> List[Dict[str, Any]]:
+            return self.graphql(query, dict(variables, after=after), retry=True)[field]
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = fetch(None)
+            while page:
+                last_page = len(page) < page_size
+                next_page = None
+                if executor and not last_page:
+                    next_page = executor.submit(fetch, page[-1]["id"])
+                yield from page
+                if last_page:
+                    break
+                page = next_page.result() if next_page else fetch(page[-1]["id"])
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_groups(self, page_size: int = 100, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        All groups, oldest first.
+        """
+        return self._iter_list("groups", {}, page_size, **kwargs)
+
+    def iter_events(
+        self, group_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        A group's events, soonest first.
+        """
+        return self._iter_list("events", {"groupId": group_id}, page_size, **kwargs)
+
+    def iter_messages(
+        self, group_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        A group's messages, newest first.
+        """
+        return self._iter_list("messages", {"groupId": group_id}, page_size, **kwargs)
+
+    def iter_group_expenses(
+        self, group_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        A group's expenses, newest first.
+        """
+        return self._iter_list(
+            "groupExpenses", {"groupId": group_id}, page_size, **kwargs
+        )
+
+    def iter_user_expenses(
+        self, user_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Expenses paid by a user, newest first.
+        """
+        return self._iter_list("userExpenses", {"userId": user_id}, page_size, **kwargs)
+
+    def iter_group_settlements(
+        self, group_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        A group's settlements, newest first.
+        """
+        return self._iter_list(
+            "groupSettlements", {"groupId": group_id}, page_size, **kwargs
+        )
+
+    def _iter_list(
+        self,
+        field: str,
+        variables: Dict[str, Any],
+        page_size: int,
+        query: Union[str, Any, None] = None,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        return self.iter_pages(
+            query or PAGE_QUERIES[field], variables, field, page_size, prefetch
+        )
+
     def upload_file(
         self,
         endpoint: str,
         file_path: str,
         field_name: str = "file",
         extra_data: Dict[str, Any] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> Any:
         """
-        Upload a file using multipart/form-data.
+        Upload a file using multipart/form-data, streamed from disk rather
+        than read into memory. `progress(sent, total)` is called as the
+        request body goes out.
         """
         url = f"{self.base_url}{endpoint}"
-        m_data = {field_name: (file_path, open(file_path, "rb"))}
-        if extra_data:
-            m_data.update(extra_data)
-        m = MultipartEncoder(fields=m_data)
-        headers = self._headers({"Content-Type": m.content_type})
-        response = requests.post(url, headers=headers, data=m)
+        with open(file_path, "rb") as f:
+            m_data = {field_name: (os.path.basename(file_path), f)}
+            if extra_data:
+                m_data.update(extra_data)
+            m = MultipartEncoder(fields=m_data)
+            if progress:
+                m = MultipartEncoderMonitor(
+                    m, lambda monitor: progress(monitor.bytes_read, monitor.len)
+                )
+            headers = self._headers({"Content-Type": m.content_type})
+            response = self.session.post(url, headers=headers, data=m)
         response.raise_for_status()
         return response.json()
 
+    def _upload_status(self, url: str, upload_id: str) -> Dict[str, Any]:
+        response = self.session.get(f"{url}/{upload_id}", headers=self._headers())
+        response.raise_for_status()
+        return response.json()
+
+    def upload_file_resumable(
+        self,
+        endpoint: str,
+        file_path: str,
+        chunk_size: int = 4 * 1024 * 1024,
+        extra_data: Dict[str, Any] = None,
+        progress: Optional[ProgressCallback] = None,
+        sessions: Optional[UploadSessions] = None,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+    ) -> Any:
+        """
+        Upload a file in chunks, resuming from the server's offset after a
+        dropped connection instead of sending the whole file again:
+
+          POST {endpoint}       {"filename", "size", "sha256", ...extra_data}
+                                -> {"uploadId", "offset"}
+          GET  {endpoint}/{id}  -> {"offset"}, like PUT's once complete
+          PUT  {endpoint}/{id}  Content-Range: bytes <first>-<last>/<size>
+                                -> {"offset"}, plus "complete": true and the
+                                   upload's details once all bytes arrived
+
+        A PUT at the wrong offset gets 409 with the server's offset. With
+        `sessions`, an upload interrupted in one run resumes in the next.
+        If the final response is lost, the GET tells whether the upload
+        completed; a server that has forgotten the upload (404), on a GET
+        or a PUT, gets it again from the start. A file that shrinks below
+        its declared size while uploading raises ValueError.
+        """
+        url = f"{self.base_url}{endpoint}"
+        size = os.path.getsize(file_path)
+        key = sessions.key(url, file_path) if sessions else None
+
+        def start() -> Tuple[str, int]:
+            payload = {
+                "filename": os.path.basename(file_path),
+                "size": size,
+                "sha256": _file_sha256(file_path),
+            }
+            if extra_data:
+                payload.update(extra_data)
+            response = self.session.post(url, headers=self._headers(), json=payload)
+            response.raise_for_status()
+            data = response.json()
+            if sessions:
+                sessions.set(key, data["uploadId"])
+            return data["uploadId"], data.get("offset", 0)
+
+        upload_id = sessions.get(key) if sessions else None
+        offset = 0
+        result = None
+        # A saved upload is resumed from the server's offset; an upload the
+        # server does not know (404) is started over
+        restart = upload_id is None
+        resync = not restart
+        retries = 0
+        with open(file_path, "rb") as f:
+            while result is None:
+                try:
+                    if restart:
+                        upload_id, offset = start()
+                        restart = resync = False
+                        continue
+                    if resync:
+                        status = self._upload_status(url, upload_id)
+                        resync = False
+                        offset = status["offset"]
+                        if status.get("complete"):
+                            # The final PUT went through, maybe in an earlier run
+                            result = status
+                            continue
+                    if progress:
+                        progress(offset, size)
+                    f.seek(offset)
+                    chunk = f.read(chunk_size)
+                    if not chunk and offset < size:
+                        raise ValueError(
+                            f"{file_path} is shorter than the {size} bytes "
+                            "declared for its upload"
+                        )
+                    content_range = (
+                        f"bytes {offset}-{offset + len(chunk) - 1}/{size}"
+                        if chunk
+                        else f"bytes */{size}"  # nothing left: ask for the result
+                    )
+                    response = self.session.put(
+                        f"{url}/{upload_id}",
+                        headers=self._headers(
+                            {
+                                "Content-Range": content_range,
+                                "Content-Type": "application/octet-stream",
+                            }
+                        ),
+                        data=chunk,
+                    )
+                    if response.status_code == 404:
+                        response.raise_for_status()
+                except (
+                    requests.ConnectionError,
+                    requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError,
+                ):
+                    retries += 1
+                    if retries > max_retries:
+                        raise
+                    logging.warning(
+                        f"Upload of {file_path} interrupted at {offset}/{size} bytes, "
+                        f"retry {retries}/{max_retries}"
+                    )
+                    time.sleep(backoff_factor * 2 ** (retries - 1))
+                    resync = True
+                    continue
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code != 404:
+                        raise
+                    # Expired, or completed and forgotten before the final
+                    # response arrived: there is nothing left to resume
+                    retries += 1
+                    if retries > max_retries:
+                        raise
+                    logging.warning(
+                        f"Upload of {file_path} is unknown to the server, "
+                        "starting over"
+                    )
+                    restart = True
+                    continue
+                if response.status_code == 409:
+                    offset = response.json()["offset"]
+                    continue
+                response.raise_for_status()
+                retries = 0
+                data = response.json()
+                offset = data["offset"]
+                if data.get("complete"):
+                    result = data
+
+        if progress:
+            progress(size, size)
+        if sessions:
+            sessions.clear(key)
+        return result
+
+    def upload_files(
+        self,
+        endpoint: str,
+        file_paths: Sequence[str],
+        workers: int = 4,
+        resumable: bool = False,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+        **kwargs,
+    ) -> List[Any]:
+        """
+        Upload many files concurrently over the pooled session, with
+        `upload_file` or, if `resumable`, `upload_file_resumable` (extra
+        keyword arguments go to it). `progress(path, sent, total)` reports
+        each file. Returns the results in order; a failed upload's exception
+        takes its place so one bad file does not stop the rest.
+        """
+        upload = self.upload_file_resumable if resumable else self.upload_file
+
+        def upload_one(file_path: str) -> Any:
+            callback = None
+            if progress:
+                callback = lambda sent, total: progress(file_path, sent, total)
+            try:
+                return upload(endpoint, file_path, progress=callback, **kwargs)
+            except Exception as e:
+                logging.error(f"Upload of {file_path} failed: {e}")
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(upload_one, file_paths))
+
 
 # Example usage:
 if __name__ == "__main__":
-    api = ClubAPI()
-    token = api.get_login_token("your_username", "your_password")
-    if token:
-        # REST example
-        profile = api.api_get("/api/users/me")
-        print("Profile:", profile)
-
-        # GraphQL example
-        query = """
-        query GetMe { me { id username email } }
-        """
-        result = api.graphql(query)
-        print("GraphQL result:", result)
-
-        # File upload example (adjust endpoint and file path as needed)
-        # upload_result = api.upload_file("/api/upload", "./myfile.txt")
-        # print("Upload result:", upload_result)
+    with ClubAPI() as api:
+        token = api.get_login_token("your_username", "your_password")
+        if token:
+            # REST example
+            profile = api.api_get("/api/users/me")
+            print("Profile:", profile)
+
+            # GraphQL example
+            query = """
+            query GetMe { me { id username email } }
+            """
+            result = api.graphql(query)
+            print("GraphQL result:", result)
+
+            # File upload examples (try them against `python upload_server.py`)
+            # upload_result = api.upload_file("/upload", "./myfile.txt")
+            # print("Upload result:", upload_result)
+            # upload_result = api.upload_file_resumable(
+            #     "/uploads", "./big.bin", sessions=UploadSessions(".club_uploads.json")
+            # )
@@ -1,23 +1,63 @@
 #!/usr/bin/env python3
 import argparse
+import getpass
+import io
 import json
+import os
+import shlex
+import signal
+import socket
+import socketserver
 import sys
+import tempfile
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
 
-from club_api import ClubAPI
+# club_api (requests, requests_toolbelt) and the query registry are imported
+# only once a command runs locally: forwarding to a daemon skips them.
+
+TOKEN_CACHE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".club_token.json"
+)
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"club_cli-{os.getuid()}.sock")
 
 
 def pretty_print(data):
     print(json.dumps(data, indent=2, default=str))
 
 
-def main():
+def prompt_credentials():
+    username = os.environ.get("CLUB_USERNAME") or input("Username: ")
+    password = os.environ.get("CLUB_PASSWORD") or getpass.getpass("Password: ")
+    return username, password
+
+
+def env_credentials():
+    """
+    Credentials for the daemon, which cannot prompt while serving.
+    """
+    username = os.environ.get("CLUB_USERNAME")
+    password = os.environ.get("CLUB_PASSWORD")
+    if not username or not password:
+        raise RuntimeError(
+            "Token expired: run `club_cli.py login <username> <password>`"
+        )
+    return username, password
+
+
+def build_parser():
     parser = argparse.ArgumentParser(description="Club Management CLI")
+    parser.add_argument(
+        "--token-file",
+        default=TOKEN_CACHE,
+        help="Where logins are cached between runs (default: .club_token.json)",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # Login
     login_parser = subparsers.add_parser("login", help="Login and store token")
     login_parser.add_argument("username", help="Username")
     login_parser.add_argument("password", help="Password")
+    subparsers.add_parser("logout", help="Forget the cached token")
 
     # User
     user_parser = subparsers.add_parser("me", help="Get current user profile")
@@ -96,6 +136,53 @@ def main():
     )
     delete_tennis_league_parser.add_argument("id")
 
+    # Bulk export/import
+    export_parser = subparsers.add_parser(
+        "export", help="Export a group and its data to NDJSON"
+    )
+    export_parser.add_argument("groupId")
+    export_parser.add_argument(
+        "--output", "-o", help="Output file (default: <groupId>.ndjson)"
+    )
+    export_parser.add_argument(
+        "--workers", type=int, default=4, help="Concurrent requests (default: 4)"
+    )
+    export_parser.add_argument(
+        "--page-size",
+        type=int,
+        default=500,
+        help="Items per request for messages, expenses, events and settlements "
+        "(default: 500)",
+    )
+    import_parser = subparsers.add_parser(
+        "import", help="Create a group from an NDJSON export"
+    )
+    import_parser.add_argument("file", help="NDJSON file written by export")
+    import_parser.add_argument(
+        "--workers", type=int, default=4, help="Concurrent requests (default: 4)"
+    )
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50,
+        help="Operations per batched GraphQL request, at most 50 (default: 50)",
+    )
+    debts_parser = subparsers.add_parser(
+        "debts", help="Compute balances and settlements offline from an export"
+    )
+    debts_parser.add_argument("file", help="NDJSON file written by export")
+    debts_parser.add_argument(
+        "--include-paid",
+        action="store_true",
+        help="Subtract paid settlements from debts (the server does not)",
+    )
+    debts_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Compare with the server's groupDebtSummary for the exported group"
+        " (not with --include-paid)",
+    )
+
     # Generic GraphQL
     graphql_parser = subparsers.add_parser(
         "graphql", help="Run a raw GraphQL query or mutation"
@@ -115,27 +202,84 @@ def main():
         "--data", help="JSON string for POST/PUT data", default=None
     )
 
-    args = parser.parse_args()
-    api = ClubAPI()
+    # Warm sessions
+    subparsers.add_parser("shell", help="Interactive shell sharing one session")
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Serve commands over a Unix socket with one warm session"
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help=f"Socket path (default: {DEFAULT_SOCKET})",
+    )
+
+    return parser
+
 
-    # For demo: store token in memory only. For persistent CLI, use a config file.
-    token = None
+def run_debts(args, api, registry):
+    """
+    Offline debt summary and settlements for an export file; with --check,
+    compared against the server. Returns the exit code.
+    """
+    try:
+        from club_debts import (
+            Ledger,
+            cross_check,
+            debt_summary,
+            fetch_server_summary,
+            optimal_settlements,
+        )
+    except ImportError as e:
+        print(f"debts needs numpy: pip install numpy ({e})")
+        return 1
+    from club_transfer import read_records
+
+    with open(args.file, "r") as f:
+        ledger = Ledger.from_records(read_records(f))
+    summary = debt_summary(ledger, args.include_paid)
+    result = {
+        "groupId": ledger.group_id,
+        "expenses": ledger.expense_count,
+        "balances": summary,
+        "settlements": optimal_settlements(summary),
+    }
+    if args.check:
+        mismatches = cross_check(
+            summary, fetch_server_summary(api, registry, ledger.group_id)
+        )
+        result["check"] = {"ok": not mismatches, "mismatches": mismatches}
+    pretty_print(result)
+    return 1 if args.check and result["check"]["mismatches"] else 0
+
+
+def run_command(args, api, registry, credentials=prompt_credentials):
+    """
+    Run one parsed command against an authenticated API; returns the exit code.
+    """
     if args.command == "login":
         token = api.get_login_token(args.username, args.password)
         if token:
             print("Login successful.")
-        else:
-            print("Login failed.")
-        return
+            return 0
+        print("Login failed.")
+        return 1
+    elif args.command == "logout":
+        api.logout()
+        print("Logged out.")
+        return 0
+    elif args.command == "debts" and args.check and args.include_paid:
+        # The server's summary ignores paid settlements, so every paid pair
+        # would be reported as a mismatch
+        print("--check cannot be combined with --include-paid")
+        return 1
+    elif args.command == "debts" and not args.check:
+        return run_debts(args, api, registry)  # offline, no login needed
     else:
-        # Prompt for login if not already logged in
-        # For demo, ask for username/password each time
-        username = input("Username: ")
-        password = input("Password: ")
-        token = api.get_login_token(username, password)
+        # Reuse the cached token; log in again only when it is about to expire
+        token = api.ensure_token(credentials)
         if not token:
             print("Login failed.")
-            sys.exit(1)
+            return 1
 
     # User
     if args.command == "me":
@@ -148,14 +292,10 @@ def main():
             for k, v in vars(args).items()
             if k in ["username", "email", "firstName", "lastName", "bio"] and v
         }
-        query = """
-        mutation UpdateProfile($input: UpdateUserInput!) { updateProfile(input: $input) { id username email firstName lastName bio } }
-        """
+        query = registry["UpdateProfile"]
         pretty_print(api.graphql(query, {"input": data}))
     elif args.command == "delete-user":
-        query = """
-        mutation DeleteUser($userId: ID!) { deleteUser(userId: $userId) }
-        """
+        query = registry["DeleteUser"]
         pretty_print(api.graphql(query, {"userId": args.userId}))
 
     # Group
@@ -164,9 +304,7 @@ def main():
     elif args.command == "group":
         pretty_print(api.api_get(f"/api/groups/{args.id}"))
     elif args.command == "create-group":
-        query = """
-        mutation CreateGroup($input: CreateGroupInput!) { createGroup(input: $input) { id name description isPublic } }
-        """
+        query = registry["CreateGroup"]
         input_data = {
             "name": args.name,
             "description": args.description,
@@ -174,9 +312,7 @@ def main():
         }
         pretty_print(api.graphql(query, {"input": input_data}))
     elif args.command == "update-group":
-        query = """
-        mutation UpdateGroup($id: ID!, $input: UpdateGroupInput!) { updateGroup(id: $id, input: $input) { id name description isPublic } }
-        """
+        query = registry["UpdateGroup"]
         input_data = {
             k: v
             for k, v in vars(args).items()
@@ -184,9 +320,7 @@ def main():
         }
         pretty_print(api.graphql(query, {"id": args.id, "input": input_data}))
     elif args.command == "delete-group":
-        query = """
-        mutation DeleteGroup($id: ID!) { deleteGroup(id: $id) }
-        """
+        query = registry["DeleteGroup"]
         pretty_print(api.graphql(query, {"id": args.id}))
 
     # Event
@@ -195,9 +329,7 @@ def main():
     elif args.command == "event":
         pretty_print(api.api_get(f"/api/events/{args.id}"))
     elif args.command == "create-event":
-        query = """
-        mutation CreateEvent($input: CreateEventInput!) { createEvent(input: $input) { id group { id name } date description } }
-        """
+        query = registry["CreateEvent"]
         input_data = {
             "groupId": args.groupId,
             "date": args.date,
@@ -205,42 +337,30 @@ def main():
         }
         pretty_print(api.graphql(query, {"input": input_data}))
     elif args.command == "update-event":
-        query = """
-        mutation UpdateEvent($id: ID!, $input: CreateEventInput!) { updateEvent(id: $id, input: $input) { id date description } }
-        """
+        query = registry["UpdateEvent"]
         input_data = {
             k: v for k, v in vars(args).items() if k in ["date", "description"] and v
         }
         pretty_print(api.graphql(query, {"id": args.id, "input": input_data}))
     elif args.command == "delete-event":
-        query = """
-        mutation DeleteEvent($id: ID!) { deleteEvent(id: $id) }
-        """
+        query = registry["DeleteEvent"]
         pretty_print(api.graphql(query, {"id": args.id}))
 
     # Message
     elif args.command == "send-message":
-        query = """
-        mutation SendMessage($input: SendMessageInput!) { sendMessage(input: $input) { id content user { id username } group { id name } } }
-        """
+        query = registry["SendMessage"]
         input_data = {"groupId": args.groupId, "content": args.content}
         pretty_print(api.graphql(query, {"input": input_data}))
 
     # Tennis League
     elif args.command == "tennis-leagues":
-        query = """
-        query { tennisLeagues { id name description startDate endDate isActive } }
-        """
+        query = registry["TennisLeagues"]
         pretty_print(api.graphql(query))
     elif args.command == "tennis-league":
-        query = """
-        query TennisLeague($id: ID!) { tennisLeague(id: $id) { id name description startDate endDate isActive } }
-        """
+        query = registry["TennisLeague"]
         pretty_print(api.graphql(query, {"id": args.id}))
     elif args.command == "create-tennis-league":
-        query = """
-        mutation CreateTennisLeague($input: CreateTennisLeagueInput!) { createTennisLeague(input: $input) { id name description startDate endDate isActive } }
-        """
+        query = registry["CreateTennisLeague"]
         input_data = {
             "name": args.name,
             "startDate": args.startDate,
@@ -250,11 +370,29 @@ def main():
         }
         pretty_print(api.graphql(query, {"input": input_data}))
     elif args.command == "delete-tennis-league":
-        query = """
-        mutation DeleteTennisLeague($id: ID!) { deleteTennisLeague(id: $id) }
-        """
+        query = registry["DeleteTennisLeague"]
         pretty_print(api.graphql(query, {"id": args.id}))
 
+    # Bulk export/import
+    elif args.command == "export":
+        from club_transfer import export_group
+
+        output = args.output or f"{args.groupId}.ndjson"
+        with open(output, "w") as f:
+            counts = export_group(
+                api, registry, args.groupId, f, args.workers, args.page_size
+            )
+        pretty_print({"file": output, "records": counts})
+    elif args.command == "import":
+        from club_transfer import GroupImporter, read_records
+
+        importer = GroupImporter(api, registry, args.workers, args.batch_size)
+        with open(args.file, "r") as f:
+            counts = importer.import_records(read_records(f))
+        pretty_print({"groupId": importer.group_id, "records": counts})
+    elif args.command == "debts":
+        return run_debts(args, api, registry)
+
     # Generic GraphQL
     elif args.command == "graphql":
         query_str = args.query
@@ -278,8 +416,216 @@ def main():
             pretty_print(api.api_delete(args.endpoint))
         else:
             print(f"Unknown method: {method}")
-            sys.exit(1)
+            return 1
+
+    return 0
+
+
+def run_shell(parser, api, registry):
+    """
+    Read commands interactively and run them on the same session and token.
+    """
+    try:
+        import readline  # noqa: F401  (line editing and history for input())
+    except ImportError:
+        pass
+
+    print("Club shell: type a command (e.g. `groups`, `event <id>`), `exit` to quit.")
+    while True:
+        try:
+            line = input("club> ")
+        except EOFError:
+            print()
+            return 0
+        except KeyboardInterrupt:
+            print()
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Error: {e}")
+            continue
+        if not argv:
+            continue
+        if argv[0] in ("exit", "quit"):
+            return 0
+        if argv[0] in ("shell", "daemon"):
+            print(f"`{argv[0]}` is not available inside the shell")
+            continue
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit:
+            continue  # argparse already printed the usage or help
+        try:
+            run_command(args, api, registry)
+        except Exception as e:
+            print(f"Error: {e}")
+
+
+@contextmanager
+def redirect_logging(stream):
+    """
+    Point the root logger's stream handlers at `stream` for the duration.
+    basicConfig's handler keeps the sys.stderr it was created with, so
+    redirect_stderr alone does not capture log records.
+    """
+    import logging
+
+    handlers = [
+        handler
+        for handler in logging.getLogger().handlers
+        if type(handler) is logging.StreamHandler
+    ]
+    previous = [handler.stream for handler in handlers]
+    for handler in handlers:
+        handler.setStream(stream)
+    try:
+        yield
+    finally:
+        for handler, old in zip(handlers, previous):
+            handler.setStream(old)
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    One request per connection: a JSON line {"argv": [...], "cwd": "..."} in,
+    a JSON line {"output": "...", "status": <exit code>} out. Commands run
+    in the caller's directory, so relative paths mean what they did there.
+    """
+
+    def handle(self):
+        output = io.StringIO()
+        status = 0
+        with redirect_stdout(output), redirect_stderr(output), redirect_logging(output):
+            try:
+                try:
+                    request = json.loads(self.rfile.readline())
+                    argv, cwd = request["argv"], request.get("cwd") or os.getcwd()
+                except (ValueError, TypeError, KeyError, AttributeError) as e:
+                    raise ValueError(f"malformed request: {e}")
+                args = self.server.parser.parse_args(argv)
+                if args.command in ("shell", "daemon"):
+                    raise ValueError(f"`{args.command}` cannot be sent to the daemon")
+                status = self.run_in(cwd, args)
+            except SystemExit as e:
+                status = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                print(f"Error: {e}")
+                status = 1
+        response = {"output": output.getvalue(), "status": status}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+    def run_in(self, cwd, args):
+        """
+        Run a parsed command from `cwd`; safe because commands run one at
+        a time.
+        """
+        daemon_cwd = os.getcwd()
+        os.chdir(cwd)
+        try:
+            token_file = os.path.abspath(args.token_file)
+            if args.token_file != TOKEN_CACHE and token_file != self.server.token_file:
+                raise ValueError(
+                    "the daemon uses its own --token-file; "
+                    "unset CLUB_CLI_SOCKET to use another one"
+                )
+            return run_command(
+                args, self.server.api, self.server.registry, env_credentials
+            )
+        finally:
+            os.chdir(daemon_cwd)
+
+
+def run_daemon(parser, api, registry, socket_path):
+    """
+    Serve commands on a Unix socket until interrupted. Commands run one at a
+    time, as stdout is redirected per command.
+    """
+    if os.path.exists(socket_path):
+        if forward(socket_path, None) is not None:
+            print(f"A daemon is already listening on {socket_path}")
+            return 1
+        os.remove(socket_path)  # left behind by a daemon that died
+
+    server = socketserver.UnixStreamServer(socket_path, DaemonHandler)
+    os.chmod(socket_path, 0o600)  # the session carries your token
+    server.parser, server.api, server.registry = parser, api, registry
+    server.token_file = os.path.abspath(api.token_cache.path)
+    # A daemon started in the background ignores SIGINT; stop cleanly on kill
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Listening on {socket_path}")
+    print(f"export CLUB_CLI_SOCKET={socket_path} to send club_cli commands here")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(socket_path)
+    return 0
+
+
+def forward(socket_path, argv):
+    """
+    Run argv on the daemon at socket_path and print its output. Returns the
+    exit code, or None when no daemon answers or it dies before answering in
+    full. With argv=None it only checks that one is listening.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            if argv is None:
+                return 0
+            request = {"argv": argv, "cwd": os.getcwd()}
+            client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            line = client.makefile("rb").readline()
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None
+    except (ConnectionResetError, BrokenPipeError):
+        line = b""  # reported below
+    try:
+        response = json.loads(line)
+        output, status = response["output"], response["status"]
+    except (ValueError, TypeError, KeyError) as e:
+        # The daemon died mid-command; the command may have partly run there
+        print(
+            f"club_cli: no complete answer from the daemon on {socket_path} ({e}); "
+            "running the command here instead",
+            file=sys.stderr,
+        )
+        return None
+    sys.stdout.write(output)
+    return status
+
+
+def main():
+    # Hand the command to a running daemon before importing anything heavy
+    socket_path = os.environ.get("CLUB_CLI_SOCKET")
+    argv = sys.argv[1:]
+    if socket_path and argv and argv[0] not in ("shell", "daemon", "-h", "--help"):
+        status = forward(socket_path, argv)
+        if status is not None:
+            return status
+
+    from club_api import ClubAPI, TokenCache
+    from query_registry import QueryRegistry
+
+    parser = build_parser()
+    args = parser.parse_args()
+    api = ClubAPI(token_cache=TokenCache(args.token_file))
+    registry = QueryRegistry()
+
+    if args.command in ("shell", "daemon"):
+        # Authenticate once up front; later commands reuse the token
+        if not api.ensure_token(prompt_credentials):
+            print("Login failed.")
+            return 1
+        if args.command == "shell":
+            return run_shell(parser, api, registry)
+        return run_daemon(parser, api, registry, args.socket)
+
+    return run_command(args, api, registry)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
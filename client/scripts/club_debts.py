@@ -0,0 +1,263 @@
+"""
+Offline debt and settlement calculations over `club_cli export` files.
+
+Mirrors ExpensesService.getGroupDebtSummary and generateOptimalSettlements
+in server/src/expenses/services.ts, so what-if analyses run against a local
+export instead of the API. Splits are aggregated with NumPy rather than the
+server's per-split loop, which keeps groups with 100k expenses interactive.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from club_api import ClubAPI
+from query_registry import QueryRegistry
+
+# Amounts below this are treated as settled, as in the server's matching loop
+EPSILON = 0.01
+
+# The server sums every currency as USD
+CURRENCY = "USD"
+
+
+class Ledger:
+    """
+    A group's expense splits and paid settlements as parallel arrays of
+    user indices and amounts. Users are keyed by username, as in exports.
+    """
+
+    def __init__(self):
+        self.group_id: Optional[str] = None
+        self.users: List[Optional[str]] = []
+        self.members: List[str] = []
+        self.expense_count = 0
+        self._index: Dict[Optional[str], int] = {}
+        # One entry per split: the split's user owes `amount` to the payer
+        self.debtors = np.zeros(0, dtype=np.int64)
+        self.creditors = np.zeros(0, dtype=np.int64)
+        self.amounts = np.zeros(0, dtype=np.float64)
+        # One entry per paid settlement
+        self.payers = np.zeros(0, dtype=np.int64)
+        self.payees = np.zeros(0, dtype=np.int64)
+        self.paid = np.zeros(0, dtype=np.float64)
+
+    def user_index(self, username: Optional[str]) -> int:
+        index = self._index.get(username)
+        if index is None:
+            index = self._index[username] = len(self.users)
+            self.users.append(username)
+        return index
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "Ledger":
+        """
+        Build a ledger from export records (see club_transfer.export_group);
+        records other than members, expenses and settlements are skipped.
+        """
+        ledger = cls()
+        debtors, creditors, amounts = [], [], []
+        payers, payees, paid = [], [], []
+        for record in records:
+            kind, data = record.get("type"), record.get("data", {})
+            if kind == "export":
+                ledger.group_id = data.get("groupId")
+            elif kind == "member":
+                ledger.members.append(data["username"])
+                ledger.user_index(data["username"])
+            elif kind == "expense":
+                ledger.expense_count += 1
+                creditor = ledger.user_index(data["paidBy"])
+                for split in data["splits"]:
+                    debtors.append(ledger.user_index(split["username"]))
+                    creditors.append(creditor)
+                    amounts.append(float(split["amount"]))
+            elif kind == "settlement" and data.get("status") == "PAID":
+                payers.append(ledger.user_index(data["from"]))
+                payees.append(ledger.user_index(data["to"]))
+                paid.append(float(data["amount"]))
+        ledger.debtors = np.array(debtors, dtype=np.int64)
+        ledger.creditors = np.array(creditors, dtype=np.int64)
+        ledger.amounts = np.array(amounts, dtype=np.float64)
+        ledger.payers = np.array(payers, dtype=np.int64)
+        ledger.payees = np.array(payees, dtype=np.int64)
+        ledger.paid = np.array(paid, dtype=np.float64)
+        return ledger
+
+    def pairwise_debts(
+        self, include_settlements: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Total owed per (debtor, creditor) pair, as three arrays sorted by
+        debtor. Like the server, a payer's own split and opposite debts
+        between two users are kept apart rather than netted; with
+        `include_settlements`, paid settlements reduce their pair's debt.
+        """
+        n = len(self.users)
+        others = self.debtors != self.creditors
+        codes = self.debtors[others] * n + self.creditors[others]
+        weights = self.amounts[others]
+        if include_settlements and len(self.paid):
+            codes = np.concatenate([codes, self.payers * n + self.payees])
+            weights = np.concatenate([weights, -self.paid])
+        pairs, inverse = np.unique(codes, return_inverse=True)
+        totals = np.bincount(inverse, weights=weights, minlength=len(pairs))
+        if include_settlements:
+            # Drop pairs the settlements paid off
+            kept = np.abs(totals) >= EPSILON / 2
+            pairs, totals = pairs[kept], totals[kept]
+        return pairs // n, pairs % n, totals
+
+    def balances(
+        self, include_settlements: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        What each user owes and is owed in total, indexed like `users`.
+        """
+        debtors, creditors, totals = self.pairwise_debts(include_settlements)
+        n = len(self.users)
+        owed = np.bincount(debtors, weights=totals, minlength=n)
+        owed_to = np.bincount(creditors, weights=totals, minlength=n)
+        return owed, owed_to
+
+
+def debt_summary(
+    ledger: Ledger, include_settlements: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    One entry per member, shaped like the server's DebtSummary with users as
+    usernames: totals include debts to former members, `debts` lists only
+    those to current members.
+    """
+    debtors, creditors, totals = ledger.pairwise_debts(include_settlements)
+    owed, owed_to = ledger.balances(include_settlements)
+    members = set(ledger.members)
+    # Each member's pairs are one contiguous run of the debtor-sorted arrays
+    starts = np.searchsorted(debtors, np.arange(len(ledger.users)), side="left")
+    ends = np.searchsorted(debtors, np.arange(len(ledger.users)), side="right")
+
+    summaries = []
+    for username in ledger.members:
+        index = ledger.user_index(username)
+        debts = [
+            {"toUser": ledger.users[creditor], "amount": float(amount)}
+            for creditor, amount in zip(
+                creditors[starts[index] : ends[index]],
+                totals[starts[index] : ends[index]],
+            )
+            if ledger.users[creditor] in members
+        ]
+        summaries.append(
+            {
+                "user": username,
+                "totalOwed": float(owed[index]),
+                "totalOwedTo": float(owed_to[index]),
+                "netAmount": float(owed_to[index] - owed[index]),
+                "debts": [dict(debt, currency=CURRENCY) for debt in debts],
+            }
+        )
+    return summaries
+
+
+def optimal_settlements(summary: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The server's greedy matching over members' net amounts: the largest
+    creditor is paid by the largest debtor until one of them is settled.
+    Takes a debt summary, from `debt_summary` or the server.
+    """
+    creditors = sorted(
+        ([entry["user"], entry["netAmount"]] for entry in summary),
+        key=lambda creditor: -creditor[1],
+    )
+    creditors = [creditor for creditor in creditors if creditor[1] > EPSILON]
+    debtors = sorted(
+        ([entry["user"], entry["netAmount"]] for entry in summary),
+        key=lambda debtor: debtor[1],
+    )
+    debtors = [debtor for debtor in debtors if debtor[1] < -EPSILON]
+
+    settlements = []
+    creditor_index = debtor_index = 0
+    while creditor_index < len(creditors) and debtor_index < len(debtors):
+        creditor, credit = creditors[creditor_index]
+        debtor, debt = debtors[debtor_index]
+        amount = min(credit, abs(debt))
+        if amount > EPSILON:
+            settlements.append(
+                {"from": debtor, "to": creditor, "amount": amount, "currency": CURRENCY}
+            )
+        creditors[creditor_index][1] -= amount
+        debtors[debtor_index][1] += amount
+        if creditors[creditor_index][1] < EPSILON:
+            creditor_index += 1
+        if debtors[debtor_index][1] > -EPSILON:
+            debtor_index += 1
+    return settlements
+
+
+def fetch_server_summary(
+    api: ClubAPI, registry: QueryRegistry, group_id: str
+) -> List[Dict[str, Any]]:
+    """
+    The server's groupDebtSummary, reshaped like `debt_summary`. The
+    optimalSettlements query is not used: it stores the settlements it
+    returns.
+    """
+    data = api.graphql(registry["GroupDebtSummary"], {"groupId": group_id})
+    return [
+        {
+            "user": entry["user"]["username"],
+            "totalOwed": entry["totalOwed"],
+            "totalOwedTo": entry["totalOwedTo"],
+            "netAmount": entry["netAmount"],
+            "debts": [
+                {
+                    "toUser": debt["toUser"]["username"],
+                    "amount": debt["amount"],
+                    "currency": debt["currency"],
+                }
+                for debt in entry["debts"]
+            ],
+        }
+        for entry in data["groupDebtSummary"]
+    ]
+
+
+def cross_check(
+    summary: List[Dict[str, Any]],
+    server_summary: List[Dict[str, Any]],
+    tolerance: float = EPSILON,
+) -> List[str]:
+    """
+    Differences between an offline and a server debt summary, as messages;
+    empty when they agree to within `tolerance`. Settlements follow from
+    the net amounts, so agreeing summaries give the same settlements.
+    """
+    mismatches = []
+    local = {entry["user"]: entry for entry in summary}
+    remote = {entry["user"]: entry for entry in server_summary}
+    for username in sorted(set(local) ^ set(remote), key=str):
+        side = "server" if username in remote else "export"
+        mismatches.append(f"{username}: member only in the {side}")
+    for username in sorted(set(local) & set(remote), key=str):
+        ours, theirs = local[username], remote[username]
+        for key in ("totalOwed", "totalOwedTo", "netAmount"):
+            if abs(ours[key] - theirs[key]) > tolerance:
+                mismatches.append(
+                    f"{username}: {key} {ours[key]:.2f} offline, "
+                    f"{theirs[key]:.2f} on the server"
+                )
+        our_debts = {debt["toUser"]: debt["amount"] for debt in ours["debts"]}
+        their_debts = {debt["toUser"]: debt["amount"] for debt in theirs["debts"]}
+        for to_user in sorted(set(our_debts) | set(their_debts), key=str):
+            ours_amount = our_debts.get(to_user, 0.0)
+            theirs_amount = their_debts.get(to_user, 0.0)
+            if abs(ours_amount - theirs_amount) > tolerance:
+                mismatches.append(
+                    f"{username} -> {to_user}: {ours_amount:.2f} offline, "
+                    f"{theirs_amount:.2f} on the server"
+                )
+    if mismatches:
+        logging.warning(f"{len(mismatches)} differences from the server")
+    return mismatches
@@ -0,0 +1,609 @@
+"""
+Export a group to NDJSON and import it into another server.
+
+Imports replay the records through the API as the logged-in user, so they
+are not an exact copy: messages are re-sent by the importing user and get
+new timestamps (their original authors and createdAt stay in the file
+only), events are created by the importing user, only its own RSVPs are
+replayed, and records naming users unknown on the target are skipped.
+"""
+
+import itertools
+import json
+import logging
+import queue
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from club_api import ClubAPI
+from query_registry import QueryRegistry
+
+# Record types in the order they are written and must be imported
+RECORD_TYPES = [
+    "group",
+    "settings",
+    "member",
+    "event",
+    "rsvp",
+    "message",
+    "expense",
+    "settlement",
+    "tennis_league",
+    "tennis_team",
+]
+
+# Record types replayed one request at a time: the server stamps messages'
+# createdAt and runs the operations of one batch concurrently
+SEQUENTIAL_TYPES = {"message"}
+
+Operation = Tuple[Any, Optional[Dict[str, Any]]]
+
+
+def _record(kind: str, data: Dict[str, Any]) -> str:
+    return json.dumps({"type": kind, "data": data}, separators=(",", ":")) + "\n"
+
+
+def _username(user: Optional[Dict[str, Any]]) -> Optional[str]:
+    return user["username"] if user else None
+
+
+class _Prefetch:
+    """
+    Iterate `items` on an executor thread, staying at most `size` items
+    ahead of the consumer, so a list is fetched while earlier ones are
+    written without being held in memory.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, items: Iterator, size: int):
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue(size)
+        self._closed = threading.Event()
+        self._future = executor.submit(self._fill, items)
+
+    def _put(self, entry: Tuple[str, Any]) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _fill(self, items: Iterator) -> None:
+        try:
+            for item in items:
+                if not self._put(("item", item)):
+                    return
+        except Exception as e:
+            self._put(("error", e))
+        else:
+            self._put(("done", None))
+
+    def __iter__(self) -> Iterator:
+        while True:
+            kind, value = self._queue.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+
+    def close(self) -> None:
+        """Stop fetching; a producer blocked on a full queue gives up"""
+        self._closed.set()
+
+
+def _spool() -> IO[str]:
+    return tempfile.TemporaryFile("w+", encoding="utf-8")
+
+
+def export_group(
+    api: ClubAPI,
+    registry: QueryRegistry,
+    group_id: str,
+    out: IO[str],
+    workers: int = 4,
+    page_size: int = 500,
+) -> Dict[str, int]:
+    """
+    Write a group and everything attached to it to `out` as NDJSON.
+    The group and tennis leagues are fetched concurrently with the events
+    with RSVPs, messages, expenses and settlements. Each list is fetched
+    page by page, a couple of pages ahead of the writer, and written as it
+    arrives; RSVPs and the newest-first messages pass through temporary
+    files to be written in import order. Users are referenced by username
+    so the file can be imported into another server.
+    """
+    fetches = {
+        "group": ("ExportGroup", {"id": group_id}),
+        "tennis": ("ExportTennisLeagues", None),
+    }
+    lists = {
+        "events": (api.iter_events, "ExportEvents"),
+        "messages": (api.iter_messages, "ExportMessages"),
+        "expenses": (api.iter_group_expenses, "ExportExpenses"),
+        "settlements": (api.iter_group_settlements, "ExportSettlements"),
+    }
+    counts = {kind: 0 for kind in RECORD_TYPES}
+
+    def write(kind: str, data: Dict[str, Any], to: IO[str] = out) -> None:
+        to.write(_record(kind, data))
+        counts[kind] += 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            name: executor.submit(api.graphql, registry[query], variables)
+            for name, (query, variables) in fetches.items()
+        }
+        # Submitted in the order they are written, so a list never waits for
+        # a thread held by a later one
+        streams = {
+            name: _Prefetch(
+                executor,
+                iter_list(group_id, page_size, query=registry[query], prefetch=False),
+                2 * page_size,
+            )
+            for name, (iter_list, query) in lists.items()
+        }
+        try:
+            _write_group(group_id, futures["group"].result(), out, write)
+            _write_lists(streams, page_size, out, write)
+            _write_tennis(group_id, futures["tennis"].result(), write)
+        finally:
+            for stream in streams.values():
+                stream.close()
+    return counts
+
+
+def _write_group(
+    group_id: str, result: Dict[str, Any], out: IO[str], write: Callable
+) -> None:
+    group = result["group"]
+    if group is None:
+        raise KeyError(f"Group not found: {group_id}")
+    out.write(
+        _record(
+            "export",
+            {
+                "version": 1,
+                "groupId": group_id,
+                "exportedAt": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    )
+    write(
+        "group",
+        {key: group[key] for key in ("id", "name", "description", "isPublic")},
+    )
+    if result["groupSettings"]:
+        write("settings", result["groupSettings"])
+    for membership in group["memberships"]:
+        user = membership["user"]
+        write(
+            "member",
+            {
+                "username": user["username"],
+                "email": user["email"],
+                "isAdmin": membership["isAdmin"],
+                "joinedAt": membership["joinedAt"],
+            },
+        )
+
+
+def _write_lists(
+    streams: Dict[str, "_Prefetch"], page_size: int, out: IO[str], write: Callable
+) -> None:
+    # RSVPs follow all events, so the importer can map their event ids
+    with _spool() as rsvps:
+        for event in streams["events"]:
+            write(
+                "event",
+                {
+                    "id": event["id"],
+                    "date": event["date"],
+                    "description": event["description"],
+                    "createdBy": _username(event["createdBy"]),
+                },
+            )
+            for rsvp in event["rsvps"]:
+                write(
+                    "rsvp",
+                    {
+                        "id": rsvp["id"],
+                        "eventId": event["id"],
+                        "username": _username(rsvp["user"]),
+                        "status": rsvp["status"],
+                        "note": rsvp["note"],
+                        "createdAt": rsvp["createdAt"],
+                    },
+                    rsvps,
+                )
+        rsvps.seek(0)
+        shutil.copyfileobj(rsvps, out)
+
+    # Newest first from the server; written oldest first for replay. Pages
+    # are spooled one per line and read back last page first
+    messages = iter(streams["messages"])
+    with _spool() as pages:
+        offsets = []
+        while True:
+            page = list(itertools.islice(messages, page_size))
+            if not page:
+                break
+            offsets.append(pages.tell())
+            pages.write(json.dumps(page) + "\n")
+        for offset in reversed(offsets):
+            pages.seek(offset)
+            for message in reversed(json.loads(pages.readline())):
+                write(
+                    "message",
+                    {
+                        "id": message["id"],
+                        "username": _username(message["user"]),
+                        "content": message["content"],
+                        "createdAt": message["createdAt"],
+                    },
+                )
+
+    for expense in streams["expenses"]:
+        data = {key: value for key, value in expense.items() if key != "splits"}
+        data["paidBy"] = _username(expense["paidBy"])
+        data["splits"] = [
+            {
+                "username": _username(split["user"]),
+                "amount": split["amount"],
+                "percentage": split["percentage"],
+                "shares": split["shares"],
+            }
+            for split in expense["splits"]
+        ]
+        write("expense", data)
+
+    for settlement in streams["settlements"]:
+        data = {
+            key: value
+            for key, value in settlement.items()
+            if key not in ("fromUser", "toUser")
+        }
+        data["from"] = _username(settlement["fromUser"])
+        data["to"] = _username(settlement["toUser"])
+        write("settlement", data)
+
+
+def _write_tennis(group_id: str, result: Dict[str, Any], write: Callable) -> None:
+    # Leagues are shared between groups; keep those this group plays in
+    teams = []
+    for league in result["tennisLeagues"]:
+        league_teams = [
+            team for team in league["teams"] if team["group"]["id"] == group_id
+        ]
+        if not league_teams:
+            continue
+        write(
+            "tennis_league",
+            {key: value for key, value in league.items() if key != "teams"},
+        )
+        teams.extend((league["id"], team) for team in league_teams)
+    for league_id, team in teams:
+        write(
+            "tennis_team",
+            {
+                "id": team["id"],
+                "leagueId": league_id,
+                "captain": _username(team["captain"]),
+            },
+        )
+
+
+def read_records(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Parse NDJSON lines lazily, skipping blank lines.
+    """
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+class GroupImporter:
+    """
+    Replays an exported group through the API as the logged-in user.
+    Records of one type are sent as batched GraphQL requests, several
+    batches at a time; a type only starts once the previous one is done,
+    so events exist before their RSVPs. Messages are sent one by one to
+    keep the chat order. Ids in the file are mapped to the ids created on
+    the target server and users are matched by username. Settings are
+    applied with autoSettle off, so replayed expenses do not generate
+    settlements, and the exported autoSettle is restored at the end.
+    """
+
+    def __init__(
+        self,
+        api: ClubAPI,
+        registry: QueryRegistry,
+        workers: int = 4,
+        batch_size: int = 50,
+    ):
+        self.api = api
+        self.registry = registry
+        self.workers = workers
+        self.batch_size = batch_size
+        self.group_id: Optional[str] = None
+        self.users: Dict[str, str] = {}  # username -> user id on the target
+        self.ids: Dict[str, Dict[str, str]] = {
+            "event": {},
+            "settlement": {},
+            "tennis_league": {},
+        }
+        self.counts: Dict[str, int] = {"skipped": 0, "failed": 0}
+        self.me: Optional[str] = None
+        self.auto_settle = False
+
+    def import_records(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        me = self.api.graphql(self.registry["Me"])["me"]
+        self.me = me["username"]
+        self.users[me["username"]] = me["id"]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for kind, section in itertools.groupby(records, key=lambda r: r["type"]):
+                if kind == "export":
+                    continue  # file header
+                if kind not in RECORD_TYPES:
+                    logging.warning(f"Skipping unknown record type: {kind}")
+                    self.counts["skipped"] += sum(1 for _ in section)
+                    continue
+                if kind != "group" and self.group_id is None:
+                    raise ValueError("Import file must start with a group record")
+                if kind == "message":
+                    logging.warning(
+                        f"Messages are posted as {self.me} with new timestamps; "
+                        "their original authors and createdAt are not kept"
+                    )
+                self._import_section(executor, kind, (r["data"] for r in section))
+        if self.auto_settle:
+            self._restore_auto_settle()
+        return self.counts
+
+    def _restore_auto_settle(self) -> None:
+        try:
+            self.api.graphql(
+                self.registry["UpdateGroupSettings"],
+                {"groupId": self.group_id, "input": {"autoSettle": True}},
+            )
+        except Exception as e:
+            logging.error(f"Failed to re-enable autoSettle: {e}")
+            self.counts["failed"] += 1
+
+    def _run_batch(self, operations: List[Operation]) -> List[Any]:
+        """
+        Send operations in one request; failed ones come back as exceptions.
+        """
+        with self.api.batch(len(operations)) as batch:
+            futures = [batch.add(query, variables) for query, variables in operations]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _import_section(
+        self, executor: ThreadPoolExecutor, kind: str, records: Iterator[Dict]
+    ) -> None:
+        build = getattr(self, f"_{kind}")
+        created = getattr(self, f"_{kind}_created", None)
+        sequential = kind in SEQUENTIAL_TYPES
+        batch_size = 1 if sequential else self.batch_size
+        max_pending = 1 if sequential else self.workers * 2
+        followups: List[Operation] = []
+        pending: "deque[Tuple[List[Dict], Future]]" = deque()
+
+        def collect() -> None:
+            sources, future = pending.popleft()
+            for record, result in zip(sources, future.result()):
+                if isinstance(result, Exception):
+                    logging.error(f"Failed to import {kind} {record.get('id')}")
+                    self.counts["failed"] += 1
+                    continue
+                self.counts[kind] = self.counts.get(kind, 0) + 1
+                if created:
+                    followups.extend(created(record, result))
+
+        while True:
+            chunk = list(itertools.islice(records, batch_size))
+            if not chunk:
+                break
+            sources, operations = [], []
+            for record in chunk:
+                operation = build(record)
+                if operation is None:
+                    self.counts["skipped"] += 1
+                    continue
+                sources.append(record)
+                operations.append(operation)
+            if operations:
+                pending.append((sources, executor.submit(self._run_batch, operations)))
+            # Keep a bounded number of batches in flight
+            if len(pending) >= max_pending:
+                collect()
+        while pending:
+            collect()
+
+        for start in range(0, len(followups), self.batch_size):
+            for result in self._run_batch(followups[start : start + self.batch_size]):
+                if isinstance(result, Exception):
+                    self.counts["failed"] += 1
+
+    # Each record type has a builder returning the operation to send (or
+    # None to skip the record) and optionally a `_created` hook that maps
+    # ids and returns follow-up operations.
+
+    def _group(self, record: Dict) -> Operation:
+        return self.registry["CreateGroup"], {
+            "input": {
+                "name": record["name"],
+                "description": record.get("description"),
+                "isPublic": record.get("isPublic", False),
+            }
+        }
+
+    def _group_created(self, record: Dict, data: Dict) -> List[Operation]:
+        self.group_id = data["createGroup"]["id"]
+        logging.info(f"Created group {record['name']} ({self.group_id})")
+        return []
+
+    def _settings(self, record: Dict) -> Operation:
+        # With autoSettle on, every replayed expense would generate settlements
+        self.auto_settle = bool(record.get("autoSettle"))
+        return self.registry["UpdateGroupSettings"], {
+            "groupId": self.group_id,
+            "input": dict(record, autoSettle=False),
+        }
+
+    def _member(self, record: Dict) -> Optional[Operation]:
+        if record["username"] == self.me:
+            return None  # the group's creator is already a member
+        return self.registry["AddMemberByUsername"], {
+            "groupId": self.group_id,
+            "username": record["username"],
+        }
+
+    def _member_created(self, record: Dict, data: Dict) -> List[Operation]:
+        user_id = data["addMemberByUsername"]["user"]["id"]
+        self.users[record["username"]] = user_id
+        if record.get("isAdmin"):
+            return [
+                (
+                    self.registry["MakeAdmin"],
+                    {"groupId": self.group_id, "userId": user_id},
+                )
+            ]
+        return []
+
+    def _event(self, record: Dict) -> Operation:
+        return self.registry["CreateEvent"], {
+            "input": {
+                "groupId": self.group_id,
+                "date": record["date"],
+                "description": record["description"],
+            }
+        }
+
+    def _event_created(self, record: Dict, data: Dict) -> List[Operation]:
+        self.ids["event"][record["id"]] = data["createEvent"]["id"]
+        return []
+
+    def _rsvp(self, record: Dict) -> Optional[Operation]:
+        # The API only creates RSVPs for the logged-in user
+        event_id = self.ids["event"].get(record["eventId"])
+        if record["username"] != self.me or event_id is None:
+            return None
+        return self.registry["CreateRSVP"], {
+            "input": {
+                "eventId": event_id,
+                "status": record["status"],
+                "note": record.get("note"),
+            }
+        }
+
+    def _message(self, record: Dict) -> Operation:
+        return self.registry["SendMessage"], {
+            "input": {"groupId": self.group_id, "content": record["content"]}
+        }
+
+    def _expense(self, record: Dict) -> Optional[Operation]:
+        usernames = [record["paidBy"]] + [s["username"] for s in record["splits"]]
+        if any(username not in self.users for username in usernames):
+            return None
+        return self.registry["CreateExpense"], {
+            "input": {
+                "groupId": self.group_id,
+                "description": record["description"],
+                "amount": record["amount"],
+                "currency": record["currency"],
+                "category": record["category"],
+                "date": record["date"],
+                "receiptUrl": record.get("receiptUrl"),
+                "splitType": record["splitType"],
+                "paidBy": self.users[record["paidBy"]],
+                "splits": [
+                    {
+                        "userId": self.users[split["username"]],
+                        "amount": split.get("amount"),
+                        "percentage": split.get("percentage"),
+                        "shares": split.get("shares"),
+                    }
+                    for split in record["splits"]
+                ],
+            }
+        }
+
+    def _settlement(self, record: Dict) -> Optional[Operation]:
+        if record["from"] not in self.users or record["to"] not in self.users:
+            return None
+        return self.registry["CreateSettlement"], {
+            "input": {
+                "groupId": self.group_id,
+                "fromUserId": self.users[record["from"]],
+                "toUserId": self.users[record["to"]],
+                "amount": record["amount"],
+                "currency": record["currency"],
+                "paymentMethod": record.get("paymentMethod"),
+                "notes": record.get("notes"),
+            }
+        }
+
+    def _settlement_created(self, record: Dict, data: Dict) -> List[Operation]:
+        settlement_id = data["createSettlement"]["id"]
+        self.ids["settlement"][record["id"]] = settlement_id
+        if record.get("status") == "PAID":
+            return [
+                (
+                    self.registry["MarkSettlementPaid"],
+                    {
+                        "id": settlement_id,
+                        "input": {
+                            "paymentMethod": record.get("paymentMethod") or "OTHER",
+                            "notes": record.get("notes"),
+                        },
+                    },
+                )
+            ]
+        return []
+
+    def _tennis_league(self, record: Dict) -> Operation:
+        return self.registry["CreateTennisLeague"], {
+            "input": {
+                key: record.get(key)
+                for key in ("name", "description", "startDate", "endDate", "isActive")
+            }
+        }
+
+    def _tennis_league_created(self, record: Dict, data: Dict) -> List[Operation]:
+        self.ids["tennis_league"][record["id"]] = data["createTennisLeague"]["id"]
+        return []
+
+    def _tennis_team(self, record: Dict) -> Optional[Operation]:
+        league_id = self.ids["tennis_league"].get(record["leagueId"])
+        if league_id is None or record["captain"] not in self.users:
+            return None
+        return self.registry["CreateTennisTeam"], {
+            "leagueId": league_id,
+            "input": {
+                "groupId": self.group_id,
+                "captainId": self.users[record["captain"]],
+            },
+        }
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+QUERIES_DIR = os.path.join(SCRIPT_DIR, "queries")
+SCHEMA_FILES = [
+    os.path.join(SCRIPT_DIR, "..", "..", "server", "src", "schema.ts"),
+    os.path.join(SCRIPT_DIR, "..", "..", "server", "src", "expenses", "schema.ts"),
+]
+INTROSPECTION_CACHE = os.path.join(SCRIPT_DIR, ".schema_introspection.json")
+REGISTRY_CACHE = os.path.join(SCRIPT_DIR, ".query_registry.json")
+
+GQL_TEMPLATE = re.compile(r"gql`(.*?)`", re.S)
+
+
+class QueryValidationError(Exception):
+    pass
+
+
+class Document(NamedTuple):
+    """
+    A validated GraphQL document with its precomputed metadata.
+    """
+
+    name: str
+    text: str
+    operation_name: Optional[str]
+    sha256_hash: str
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class QueryRegistry:
+    """
+    Loads `.graphql` documents from `queries_dir` once, validates them against
+    the server schema and caches the result on disk. A document is only parsed
+    and validated again when its text or the schema source changes, so
+    repeated CLI runs reuse the validated documents without importing graphql.
+    """
+
+    def __init__(
+        self,
+        queries_dir: str = QUERIES_DIR,
+        schema_files: List[str] = None,
+        introspection_cache: str = INTROSPECTION_CACHE,
+        registry_cache: Optional[str] = REGISTRY_CACHE,
+    ):
+        self.queries_dir = queries_dir
+        self.schema_files = schema_files or SCHEMA_FILES
+        self.introspection_cache = introspection_cache
+        self.registry_cache = registry_cache
+        self._documents: Dict[str, Document] = {}
+        self._schema = None
+        self._schema_hash: Optional[str] = None
+        self._cache = (registry_cache and _read_json(registry_cache)) or {}
+
+    @property
+    def schema_hash(self) -> str:
+        """
+        Hash of the schema sources; falls back to the cached introspection
+        when the server sources are not available.
+        """
+        if self._schema_hash is None:
+            sources = []
+            for path in self.schema_files:
+                if os.path.exists(path):
+                    with open(path, "r") as f:
+                        sources.append(f.read())
+            if sources:
+                self._schema_hash = _sha256("".join(sources))
+            else:
+                cached = _read_json(self.introspection_cache) or {}
+                self._schema_hash = cached.get("schema_hash", "")
+        return self._schema_hash
+
+    def _load_schema(self):
+        """
+        Build the schema from its cached introspection, regenerating the cache
+        from the SDL in the server's schema.ts files when it is stale.
+        """
+        from graphql import build_client_schema, build_schema, introspection_from_schema
+
+        cached = _read_json(self.introspection_cache)
+        if cached and cached.get("schema_hash") == self.schema_hash:
+            return build_client_schema(cached["introspection"])
+
+        sdl = ""
+        for path in self.schema_files:
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    sdl += "".join(GQL_TEMPLATE.findall(f.read()))
+        if not sdl:
+            raise QueryValidationError("No GraphQL schema source or cache found")
+
+        schema = build_schema(sdl)
+        _write_json(
+            self.introspection_cache,
+            {
+                "schema_hash": self.schema_hash,
+                "introspection": introspection_from_schema(schema),
+            },
+        )
+        logging.info(f"Cached schema introspection to {self.introspection_cache}")
+        return schema
+
+    def _validate(self, name: str, text: str) -> Optional[str]:
+        """
+        Parse and validate a document, returning its operation name.
+        """
+        from graphql import GraphQLError, OperationDefinitionNode, parse, validate
+
+        if self._schema is None:
+            self._schema = self._load_schema()
+        try:
+            ast = parse(text)
+        except GraphQLError as e:
+            raise QueryValidationError(f"{name}: {e.message}") from e
+        errors = validate(self._schema, ast)
+        if errors:
+            messages = "; ".join(error.message for error in errors)
+            raise QueryValidationError(f"{name}: {messages}")
+
+        operations = [
+            definition
+            for definition in ast.definitions
+            if isinstance(definition, OperationDefinitionNode)
+        ]
+        if len(operations) == 1 and operations[0].name:
+            return operations[0].name.value
+        return None
+
+    def get(self, name: str) -> Document:
+        """
+        Return the document stored in `<queries_dir>/<name>.graphql`.
+        """
+        document = self._documents.get(name)
+        if document is not None:
+            return document
+
+        path = os.path.join(self.queries_dir, f"{name}.graphql")
+        if not os.path.exists(path):
+            raise KeyError(f"Unknown GraphQL document: {name}")
+        with open(path, "r") as f:
+            text = f.read()
+        sha256_hash = _sha256(text)
+
+        entry = self._cache.get(name)
+        if (
+            entry
+            and entry.get("sha256_hash") == sha256_hash
+            and entry.get("schema_hash") == self.schema_hash
+        ):
+            operation_name = entry.get("operation_name")
+        else:
+            operation_name = self._validate(name, text)
+            self._cache[name] = {
+                "sha256_hash": sha256_hash,
+                "schema_hash": self.schema_hash,
+                "operation_name": operation_name,
+            }
+            if self.registry_cache:
+                _write_json(self.registry_cache, self._cache)
+
+        document = Document(name, text, operation_name, sha256_hash)
+        self._documents[name] = document
+        return document
+
+    def __getitem__(self, name: str) -> Document:
+        return self.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(
+            filename[: -len(".graphql")]
+            for filename in os.listdir(self.queries_dir)
+            if filename.endswith(".graphql")
+        )
+
+    def load_all(self) -> Dict[str, Document]:
+        """
+        Load and validate every document, e.g. as a pre-commit check.
+        """
+        return {name: self.get(name) for name in self.names()}
+
+
+if __name__ == "__main__":
+    registry = QueryRegistry()
+    for name, document in registry.load_all().items():
+        print(f"{name}: {document.operation_name} {document.sha256_hash[:12]}")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the offline debt calculations (no server needed)
+
+The expected values are worked out by hand from ExpensesService in
+server/src/expenses/services.ts.
+
+Run with: python -m unittest discover -s client/scripts/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from club_debts import Ledger, debt_summary, optimal_settlements
+
+
+def member(username):
+    return {"type": "member", "data": {"username": username}}
+
+
+def expense(paid_by, **splits):
+    return {
+        "type": "expense",
+        "data": {
+            "paidBy": paid_by,
+            "splits": [
+                {"username": username, "amount": str(amount)}
+                for username, amount in splits.items()
+            ],
+        },
+    }
+
+
+def settlement(from_user, to_user, amount, status="PAID"):
+    return {
+        "type": "settlement",
+        "data": {"from": from_user, "to": to_user, "amount": amount, "status": status},
+    }
+
+
+def ledger(*records):
+    return Ledger.from_records(
+        [{"type": "export", "data": {"groupId": "1"}}]
+        + [member(username) for username in ("alice", "bob", "carol")]
+        + list(records)
+    )
+
+
+class DebtSummaryTest(unittest.TestCase):
+    def assertSummary(self, summary, expected):
+        """Compare (totalOwed, totalOwedTo, netAmount, {toUser: amount}) per user"""
+        self.assertEqual([entry["user"] for entry in summary], list(expected))
+        for entry in summary:
+            owed, owed_to, net, debts = expected[entry["user"]]
+            self.assertAlmostEqual(entry["totalOwed"], owed, places=2)
+            self.assertAlmostEqual(entry["totalOwedTo"], owed_to, places=2)
+            self.assertAlmostEqual(entry["netAmount"], net, places=2)
+            self.assertEqual(
+                {debt["toUser"] for debt in entry["debts"]}, set(debts), entry["user"]
+            )
+            for debt in entry["debts"]:
+                self.assertAlmostEqual(debt["amount"], debts[debt["toUser"]], places=2)
+                self.assertEqual(debt["currency"], "USD")
+
+    def test_uneven_split(self):
+        # alice pays 90 (10/30/50), bob pays 40 (20 each for alice and carol)
+        summary = debt_summary(
+            ledger(
+                expense("alice", alice=10, bob=30, carol=50),
+                expense("bob", alice=20, carol=20),
+            )
+        )
+        self.assertSummary(
+            summary,
+            {
+                "alice": (20, 80, 60, {"bob": 20}),
+                "bob": (30, 40, 10, {"alice": 30}),
+                "carol": (70, 0, -70, {"alice": 50, "bob": 20}),
+            },
+        )
+
+    def test_circular_debts_net_to_zero(self):
+        # Opposite debts are listed, not netted, but every net amount is zero
+        summary = debt_summary(
+            ledger(
+                expense("alice", bob=10),
+                expense("bob", carol=10),
+                expense("carol", alice=10),
+            )
+        )
+        self.assertSummary(
+            summary,
+            {
+                "alice": (10, 10, 0, {"carol": 10}),
+                "bob": (10, 10, 0, {"alice": 10}),
+                "carol": (10, 10, 0, {"bob": 10}),
+            },
+        )
+
+    def test_rounding_remainder(self):
+        # 100 split three ways: the remainder cent goes to carol
+        summary = debt_summary(
+            ledger(expense("alice", alice="33.33", bob="33.33", carol="33.34"))
+        )
+        self.assertSummary(
+            summary,
+            {
+                "alice": (0, 66.67, 66.67, {}),
+                "bob": (33.33, 0, -33.33, {"alice": 33.33}),
+                "carol": (33.34, 0, -33.34, {"alice": 33.34}),
+            },
+        )
+
+    def test_paid_settlements_are_subtracted_only_when_asked(self):
+        records = [
+            expense("alice", bob=30, carol=50),
+            settlement("bob", "alice", 30),
+            settlement("carol", "alice", 50, status="PENDING"),
+        ]
+        self.assertSummary(
+            debt_summary(ledger(*records)),
+            {
+                "alice": (0, 80, 80, {}),
+                "bob": (30, 0, -30, {"alice": 30}),
+                "carol": (50, 0, -50, {"alice": 50}),
+            },
+        )
+        self.assertSummary(
+            debt_summary(ledger(*records), include_settlements=True),
+            {
+                "alice": (0, 50, 50, {}),
+                "bob": (0, 0, 0, {}),
+                "carol": (50, 0, -50, {"alice": 50}),
+            },
+        )
+
+
+class OptimalSettlementsTest(unittest.TestCase):
+    def assertSettlements(self, settlements, expected):
+        self.assertEqual(
+            [(entry["from"], entry["to"]) for entry in settlements],
+            [(from_user, to_user) for from_user, to_user, _ in expected],
+        )
+        for entry, (_, _, amount) in zip(settlements, expected):
+            self.assertAlmostEqual(entry["amount"], amount, places=2)
+            self.assertEqual(entry["currency"], "USD")
+
+    def test_uneven_split(self):
+        # Largest debtor (carol, -70) pays the largest creditor (alice, 60) first
+        summary = debt_summary(
+            ledger(
+                expense("alice", alice=10, bob=30, carol=50),
+                expense("bob", alice=20, carol=20),
+            )
+        )
+        self.assertSettlements(
+            optimal_settlements(summary),
+            [("carol", "alice", 60), ("carol", "bob", 10)],
+        )
+
+    def test_circular_debts_need_no_settlements(self):
+        summary = debt_summary(
+            ledger(
+                expense("alice", bob=10),
+                expense("bob", carol=10),
+                expense("carol", alice=10),
+            )
+        )
+        self.assertEqual(optimal_settlements(summary), [])
+
+    def test_rounding_remainder(self):
+        summary = debt_summary(
+            ledger(expense("alice", alice="33.33", bob="33.33", carol="33.34"))
+        )
+        self.assertSettlements(
+            optimal_settlements(summary),
+            [("carol", "alice", 33.34), ("bob", "alice", 33.33)],
+        )
+
+    def test_remainders_within_a_cent_are_settled(self):
+        summary = [
+            {"user": "alice", "netAmount": 0.005},
+            {"user": "bob", "netAmount": -0.005},
+        ]
+        self.assertEqual(optimal_settlements(summary), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
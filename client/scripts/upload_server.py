@@ -0,0 +1,248 @@
+"""
+Local stand-in for upload endpoints, for trying out ClubAPI's upload
+methods while the backend has none.
+
+  POST /upload          multipart/form-data, as sent by ClubAPI.upload_file
+  POST /uploads         start a resumable upload (ClubAPI.upload_file_resumable)
+  GET  /uploads/<id>    offset received so far
+  PUT  /uploads/<id>    append a chunk at Content-Range: bytes <first>-<last>/<size>
+
+Finished uploads keep their id: a repeated final PUT or a GET is answered
+with the result, for clients that lost the response to the last chunk.
+
+With --fail-rate, that share of chunk uploads is cut off halfway without
+a response, the way a dropped connection looks to the client.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+CONTENT_RANGE = re.compile(r"bytes (?:(\d+)-(\d+)|\*)/(\d+)")
+
+
+class UploadStore:
+    """
+    Files kept under one directory: finished uploads by name, resumable
+    uploads as <id>.part with their metadata in <id>.json. Once finished,
+    <id>.json holds the upload's result instead.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, os.path.basename(name))
+
+    def save(self, filename: str, content: bytes) -> Dict[str, Any]:
+        with open(self._path(filename), "wb") as f:
+            f.write(content)
+        return {
+            "filename": filename,
+            "size": len(content),
+            "sha256": hashlib.sha256(content).hexdigest(),
+        }
+
+    def create(self, meta: Dict[str, Any]) -> str:
+        upload_id = uuid.uuid4().hex
+        with open(self._path(f"{upload_id}.json"), "w") as f:
+            json.dump(meta, f)
+        open(self._path(f"{upload_id}.part"), "wb").close()
+        return upload_id
+
+    def meta(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(f"{upload_id}.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def offset(self, upload_id: str) -> int:
+        return os.path.getsize(self._path(f"{upload_id}.part"))
+
+    def append(self, upload_id: str, data: bytes) -> int:
+        with open(self._path(f"{upload_id}.part"), "ab") as f:
+            f.write(data)
+        return self.offset(upload_id)
+
+    def finish(self, upload_id: str) -> Dict[str, Any]:
+        meta = self.meta(upload_id)
+        part_path = self._path(f"{upload_id}.part")
+        digest = hashlib.sha256()
+        with open(part_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        if meta.get("sha256") and meta["sha256"] != sha256:
+            raise ValueError(
+                f"sha256 mismatch: expected {meta['sha256']}, got {sha256}"
+            )
+        os.replace(part_path, self._path(meta["filename"]))
+        result = {"filename": meta["filename"], "size": meta["size"], "sha256": sha256}
+        with open(self._path(f"{upload_id}.json"), "w") as f:
+            json.dump(dict(meta, result=result), f)
+        return result
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    store: UploadStore
+    fail_rate = 0.0
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _upload_id(self) -> Optional[str]:
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "uploads" and self.store.meta(parts[1]):
+            return parts[1]
+        return None
+
+    def do_POST(self):
+        if self.path == "/upload":
+            self._multipart()
+        elif self.path == "/uploads":
+            meta = json.loads(self._read_body() or b"{}")
+            if "filename" not in meta or "size" not in meta:
+                self._send_json(400, {"error": "filename and size are required"})
+                return
+            upload_id = self.store.create(meta)
+            self._send_json(201, {"uploadId": upload_id, "offset": 0})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _send_result(self, meta: Dict[str, Any]) -> None:
+        self._send_json(
+            200, {"offset": meta["size"], "complete": True, **meta["result"]}
+        )
+
+    def do_GET(self):
+        upload_id = self._upload_id()
+        if upload_id is None:
+            self._send_json(404, {"error": "unknown upload"})
+            return
+        meta = self.store.meta(upload_id)
+        if "result" in meta:
+            self._send_result(meta)
+            return
+        self._send_json(200, {"offset": self.store.offset(upload_id)})
+
+    def do_PUT(self):
+        upload_id = self._upload_id()
+        if upload_id is None:
+            self._send_json(404, {"error": "unknown upload"})
+            return
+        match = CONTENT_RANGE.fullmatch(self.headers.get("Content-Range", ""))
+        if not match:
+            self._send_json(400, {"error": "Content-Range required"})
+            return
+        body = self._read_body()
+        with self.store.lock:
+            meta = self.store.meta(upload_id)
+            if "result" in meta:
+                self._send_result(meta)
+                return
+            offset = self.store.offset(upload_id)
+            size = meta["size"]
+            if match.group(1) is not None:
+                first = int(match.group(1))
+                if first != offset or int(match.group(2)) - first + 1 != len(body):
+                    self._send_json(409, {"offset": offset})
+                    return
+                if body and random.random() < self.fail_rate:
+                    # Keep half the chunk and hang up, like a dropped connection
+                    self.store.append(upload_id, body[: len(body) // 2])
+                    self.close_connection = True
+                    self.connection.shutdown(2)
+                    logging.info(f"{upload_id}: dropped connection at {offset}")
+                    return
+                offset = self.store.append(upload_id, body)
+            if offset < size:
+                self._send_json(200, {"offset": offset})
+                return
+            try:
+                result = self.store.finish(upload_id)
+            except ValueError as e:
+                self._send_json(422, {"error": str(e)})
+                return
+        logging.info(f"{upload_id}: completed {result['filename']}")
+        self._send_json(200, {"offset": offset, "complete": True, **result})
+
+    def _multipart(self):
+        content_type = self.headers.get("Content-Type", "")
+        if not content_type.startswith("multipart/form-data"):
+            self._send_json(400, {"error": "multipart/form-data required"})
+            return
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1")
+            + self._read_body()
+        )
+        files, fields = [], {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            filename = part.get_filename()
+            content = part.get_payload(decode=True) or b""
+            if filename:
+                files.append({"field": name, **self.store.save(filename, content)})
+            else:
+                fields[name] = content.decode("utf-8")
+        self._send_json(200, {"files": files, "fields": fields})
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in upload server")
+    parser.add_argument("--port", type=int, default=4020)
+    parser.add_argument(
+        "--dir",
+        default=os.path.join(tempfile.gettempdir(), "club_uploads"),
+        help="Where uploaded files are stored",
+    )
+    parser.add_argument(
+        "--fail-rate",
+        type=float,
+        default=0.0,
+        help="Share of chunk uploads to cut off halfway (default: 0)",
+    )
+    args = parser.parse_args()
+
+    UploadHandler.store = UploadStore(args.dir)
+    UploadHandler.fail_rate = args.fail_rate
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), UploadHandler)
+    logging.info(
+        f"Upload stand-in on http://127.0.0.1:{args.port}, storing in {args.dir}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Asyncio GraphQL client for fanning out many operations concurrently
+"""
+
+import asyncio
+import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import aiohttp
+from colorama import Fore
+from graphql_client import load_token, print_errors, request_headers
+from persisted_queries import PersistedQueryCache, is_persisted_query_not_found
+from response_cache import NormalizedCache
+
+if TYPE_CHECKING:
+    from subscriptions import SubscriptionManager
+
+# An operation is either a bare query string or a (query, variables) pair
+Operation = Union[str, Tuple[str, Optional[Dict[str, Any]]]]
+
+
+class AsyncGraphQLClient:
+    """Async counterpart of GraphQLClient built on aiohttp
+
+    Not a subclass: query/mutation are coroutines here, so it shares
+    GraphQLClient's token, header, persisted query and response cache
+    helpers instead of inheriting its synchronous methods.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:4010",
+        limit: int = 100,
+        limit_per_host: int = 0,
+        timeout: float = 30,
+        persisted_queries: bool = False,
+        persisted_query_registry: Optional[str] = None,
+        cache: bool = False,
+        cache_ttl: float = 60,
+        verbose: bool = True,
+    ):
+        self.base_url = base_url
+        self.graphql_url = f"{base_url}/graphql"
+        self.ws_url = f"{base_url.replace('http', 'ws', 1)}/graphql"
+        self.token_file = ".token"
+        self.token = load_token(self.token_file)
+        self.verbose = verbose
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+        # Same options, and the same helpers, as GraphQLClient
+        self.persisted_queries = (
+            PersistedQueryCache(registry_file=persisted_query_registry)
+            if persisted_queries or persisted_query_registry
+            else None
+        )
+        self.cache = NormalizedCache(ttl=cache_ttl) if cache else None
+
+    def _get_aio_session(self) -> aiohttp.ClientSession:
+        """Create the aiohttp session lazily, inside the running event loop"""
+        if self._aio_session is None or self._aio_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host
+            )
+            self._aio_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._aio_session
+
+    async def close(self):
+        """Close pooled HTTP connections"""
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def query(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Execute a GraphQL query"""
+        if self.cache is None:
+            return await self._send(query, variables)
+
+        document = self.cache.prepare(query)
+        result = self.cache.read(document, variables)
+        if result is None:
+            result = await self._send(document, variables)
+            self.cache.write(document, variables, result)
+        return result
+
+    async def _send(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send one operation to the server"""
+        if self.persisted_queries is not None:
+            result = await self._persisted_query(query, variables)
+        else:
+            result = await self._post({"query": query, "variables": variables or {}})
+        if self.verbose:
+            print_errors(result)
+        return result
+
+    async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a single operation, turning transport failures into errors"""
+        try:
+            async with self._get_aio_session().post(
+                self.graphql_url, headers=request_headers(self.token), json=payload
+            ) as response:
+                response.raise_for_status()
+                return await response.json()
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if self.verbose:
+                print(f"{Fore.RED}❌ Request failed: {e}")
+            return {"errors": [{"message": str(e) or type(e).__name__}]}
+
+    async def _persisted_query(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a query using the automatic persisted query protocol"""
+        cache = self.persisted_queries
+        payload = cache.build_payload(query, variables)
+        result = await self._post(payload)
+
+        if "query" not in payload and is_persisted_query_not_found(result):
+            # The server lost the query (e.g. restarted): register it again
+            cache.discard(query)
+            payload = cache.build_payload(query, variables)
+            result = await self._post(payload)
+
+        if "data" in result:
+            cache.add(query, payload["extensions"]["persistedQuery"]["sha256Hash"])
+        return result
+
+    async def mutation(
+        self, mutation: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Execute a GraphQL mutation"""
+        return await self.query(mutation, variables)
+
+    async def gather(
+        self, operations: Iterable[Operation], concurrency: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Run many operations at once, at most `concurrency` in flight
+
+        Results are returned in the same order as `operations`.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(operation: Operation) -> Dict[str, Any]:
+            query, variables = (
+                (operation, None) if isinstance(operation, str) else operation
+            )
+            async with semaphore:
+                return await self.query(query, variables)
+
+        return await asyncio.gather(*(run(operation) for operation in operations))
+
+    def subscriptions(self, **kwargs) -> "SubscriptionManager":
+        """Create a manager that multiplexes subscriptions over one websocket"""
+        from subscriptions import SubscriptionManager
+
+        return SubscriptionManager(self.ws_url, self.token, **kwargs)
+
+    async def stream(
+        self,
+        subscription: str,
+        variables: Optional[Dict[str, Any]] = None,
+        max_queue: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield subscription payloads as they arrive, without printing them"""
+        async with self.subscriptions(max_queue=max_queue) as manager:
+            async with await manager.subscribe(subscription, variables) as messages:
+                async for payload in messages:
+                    yield payload
+
+    async def subscription(
+        self,
+        subscription: str,
+        variables: Optional[Dict[str, Any]] = None,
+        callback=None,
+        duration: int = 10,
+    ):
+        """Execute a GraphQL subscription, like GraphQLClient.subscription"""
+        from subscriptions import SubscriptionError
+
+        try:
+            async with self.subscriptions() as manager:
+                print(f"{Fore.BLUE}🔌 WebSocket connected")
+                print(
+                    f"{Fore.YELLOW}📡 Listening for subscription messages for {duration} seconds..."
+                )
+
+                async def listen():
+                    async with await manager.subscribe(
+                        subscription, variables
+                    ) as messages:
+                        async for payload in messages:
+                            print(f"{Fore.GREEN}📨 Subscription message received:")
+                            print(json.dumps(payload, indent=2))
+                            if callback:
+                                callback(payload)
+
+                try:
+                    await asyncio.wait_for(listen(), timeout=duration)
+                except asyncio.TimeoutError:
+                    pass
+
+        except SubscriptionError as e:
+            print(f"{Fore.RED}❌ Subscription error: {e.errors}")
+        except Exception as e:
+            print(f"{Fore.RED}❌ Subscription failed: {e}")
+
+
+def run_gather(
+    operations: Sequence[Operation],
+    concurrency: int = 10,
+    base_url: str = "http://localhost:4010",
+) -> List[Dict[str, Any]]:
+    """Convenience wrapper to fan out operations from synchronous code"""
+
+    async def main() -> List[Dict[str, Any]]:
+        async with AsyncGraphQLClient(base_url, limit=concurrency) as client:
+            return await client.gather(operations, concurrency)
+
+    return asyncio.run(main())
@@ -0,0 +1,19 @@
+"""
+Colored console output shared by the scripts
+
+colorama.init() wraps sys.stdout and sys.stderr every time it is called, so
+scripts importing one another used to stack one ANSI-processing wrapper per
+import, each of them run on every print. init_colors() wraps them once.
+"""
+
+from colorama import init
+
+_initialized = False
+
+
+def init_colors():
+    """Initialize colorama once per process, resetting colors after each print"""
+    global _initialized
+    if not _initialized:
+        init(autoreset=True)
+        _initialized = True
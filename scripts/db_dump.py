@@ -5,16 +5,33 @@ Dumps the database using connection details from .env file
 """
 
 import argparse
+import hashlib
+import json
 import os
+import re
 import subprocess
 import sys
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from colorama import Fore, Style, init
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from colorama import Fore, Style
+from console import init_colors
+from db_restore import restore_database
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for --stream-compression zstd
+    zstandard = None
 
 # Initialize colorama for colored output
-init(autoreset=True)
+init_colors()
 
 
 def find_env_file():
@@ -87,8 +104,459 @@ def load_env_file(env_file):
     return env_vars
 
 
-def dump_database(env_vars, output_file=None, format="custom"):
-    """Dump PostgreSQL database using pg_dump"""
+def pg_dump_major_version():
+    """Return the major version of the installed pg_dump, e.g. 16"""
+    result = subprocess.run(
+        ["pg_dump", "--version"], capture_output=True, text=True, check=True
+    )
+    match = re.search(r"(\d+)(?:\.\d+)?", result.stdout)
+    return int(match.group(1)) if match else 0
+
+
+def compression_option(compress, version):
+    """Translate a --compress value into what the installed pg_dump accepts
+
+    `compress` is a gzip level ("0"-"9"), "none", or METHOD[:LEVEL] with
+    METHOD one of gzip, lz4 or zstd. lz4 and zstd need pg_dump 16 or
+    newer; older versions fall back to gzip.
+    """
+    if compress is None:
+        return None
+    if compress == "none":
+        return "none" if version >= 16 else "0"
+    if compress.isdigit():
+        return compress
+
+    method, _, level = compress.partition(":")
+    if method not in ("gzip", "lz4", "zstd"):
+        raise ValueError(f"Unknown compression '{compress}'")
+    if version >= 16:
+        return compress
+    if method != "gzip":
+        print(f"{Fore.YELLOW}⚠️  pg_dump {version} has no {method} support, using gzip")
+        level = ""
+    return level or "6"
+
+
+def directory_size(path):
+    """Total size of a file, or of all files below a directory"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+# pg_dump --verbose messages that start each phase after "catalog"
+DUMP_PHASES = [("dumping contents of table", "data")]
+
+
+def run_with_phases(cmd, env, first_phase, markers, echo=False, read_stdout=None):
+    """Run a pg_* command and time its phases from --verbose messages
+
+    stderr is read line by line instead of being captured, so memory stays
+    flat; only the last lines are kept for error reports, and with `echo`
+    each line is printed as it arrives. When `read_stdout` is given it is
+    called with the binary stdout pipe while stderr is followed in a
+    thread. Returns the per-phase timings in seconds.
+    """
+    timings = {}
+    state = {"phase": first_phase, "start": time.perf_counter()}
+    tail = deque(maxlen=20)
+
+    def follow_stderr(stderr):
+        for raw in stderr:
+            line = raw.decode(errors="replace").rstrip()
+            tail.append(line)
+            if echo:
+                print(f"{Style.DIM}{line}")
+            for marker, next_phase in markers:
+                if (
+                    marker in line
+                    and next_phase != state["phase"]
+                    and next_phase not in timings
+                ):
+                    now = time.perf_counter()
+                    timings[state["phase"]] = now - state["start"]
+                    state["phase"], state["start"] = next_phase, now
+
+    process = subprocess.Popen(
+        cmd,
+        env=env,
+        stdout=subprocess.PIPE if read_stdout else None,
+        stderr=subprocess.PIPE,
+    )
+    if read_stdout:
+        follower = threading.Thread(target=follow_stderr, args=(process.stderr,))
+        follower.start()
+        try:
+            read_stdout(process.stdout)
+        finally:
+            process.stdout.close()
+            follower.join()
+    else:
+        follow_stderr(process.stderr)
+    process.wait()
+    timings[state["phase"]] = time.perf_counter() - state["start"]
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(
+            process.returncode, cmd, stderr="\n".join(tail)
+        )
+    return timings
+
+
+def parse_size(value):
+    """Parse a size such as 512K, 64M or 2G into bytes"""
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    value = value.strip().upper().rstrip("B")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def new_compressor(compression, level):
+    """Return an object with compress()/flush() for one chunk"""
+    if compression == "gzip":
+        # wbits=31 writes a gzip header, so each chunk is a valid .gz file
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd stream compression needs: pip install zstandard")
+        return zstandard.ZstdCompressor(level=level).compressobj()
+    raise ValueError(f"Unknown stream compression '{compression}'")
+
+
+CHUNK_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+class ChunkWriter:
+    """Compress a byte stream into size-bounded chunk files with checksums
+
+    Every chunk is a complete compressed stream of its own, so chunks can
+    be checked, shipped or retried one at a time.
+    """
+
+    def __init__(self, directory, chunk_size, compression="gzip", level=6):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.level = level
+        self.chunks = []
+        self.raw_bytes = 0
+        self.raw_sha256 = hashlib.sha256()
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+        new_compressor(compression, level)  # fail early on a bad setting
+
+    def _open_chunk(self):
+        name = f"part-{len(self.chunks):05d}{CHUNK_SUFFIXES[self.compression]}"
+        self._file = open(os.path.join(self.directory, name), "wb")
+        self._compressor = new_compressor(self.compression, self.level)
+        self._chunk = {"file": name, "bytes": 0, "raw_bytes": 0}
+        self._sha256 = hashlib.sha256()
+
+    def _emit(self, data):
+        if data:
+            self._file.write(data)
+            self._sha256.update(data)
+            self._chunk["bytes"] += len(data)
+
+    def _close_chunk(self):
+        self._emit(self._compressor.flush())
+        self._file.close()
+        self._file = None
+        self._chunk["sha256"] = self._sha256.hexdigest()
+        self.chunks.append(self._chunk)
+        chunk = self._chunk
+        print(
+            f"{Fore.BLUE}📦 {chunk['file']}: {chunk['raw_bytes'] / 1024**2:.1f} MB "
+            f"→ {chunk['bytes'] / 1024**2:.1f} MB (sha256 {chunk['sha256'][:12]})"
+        )
+
+    def write(self, data):
+        if self._file is None:
+            self._open_chunk()
+        self.raw_bytes += len(data)
+        self.raw_sha256.update(data)
+        self._chunk["raw_bytes"] += len(data)
+        self._emit(self._compressor.compress(data))
+        if self._chunk["bytes"] >= self.chunk_size:
+            self._close_chunk()
+
+    def close(self):
+        if self._file is not None:
+            self._close_chunk()
+
+    def consume(self, stream, block_size=1024 * 1024):
+        for block in iter(lambda: stream.read(block_size), b""):
+            self.write(block)
+        self.close()
+
+
+def write_manifest(directory, writer, db_config, timings):
+    manifest = {
+        "version": 1,
+        "database": db_config["database"],
+        "created_at": datetime.now().isoformat(),
+        "pg_dump_format": "custom",
+        "compression": writer.compression,
+        "chunk_size": writer.chunk_size,
+        "raw_bytes": writer.raw_bytes,
+        "raw_sha256": writer.raw_sha256.hexdigest(),
+        "chunks": writer.chunks,
+        "timings": {phase: round(seconds, 3) for phase, seconds in timings.items()},
+    }
+    path = os.path.join(directory, "manifest.json")
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+TABLE_COLUMNS_SQL = """
+SELECT c.table_name, c.column_name
+FROM information_schema.columns c
+JOIN information_schema.tables t
+  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+WHERE c.table_schema = 'public' AND t.table_type = 'BASE TABLE'
+ORDER BY c.table_name, c.ordinal_position
+"""
+
+# Cumulative inserts + updates + deletes per table since the last stats reset
+MODIFICATIONS_SQL = """
+SELECT relname, n_tup_ins + n_tup_upd + n_tup_del
+FROM pg_stat_user_tables
+WHERE schemaname = 'public'
+"""
+
+
+def password_env(db_config):
+    """The environment for a client tool connecting to db_config"""
+    env = os.environ.copy()
+    env["PGPASSWORD"] = db_config["password"]
+    return env
+
+
+def run_psql(db_config, env, sql):
+    """Run a query with psql and return its rows as lists of strings"""
+    cmd = [
+        "psql",
+        f"--host={db_config['host']}",
+        f"--port={db_config['port']}",
+        f"--username={db_config['username']}",
+        f"--dbname={db_config['database']}",
+        "--no-password",
+        "--tuples-only",
+        "--no-align",
+        "--field-separator=\t",
+        "--command",
+        sql,
+    ]
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+    return [line.split("\t") for line in result.stdout.splitlines() if line]
+
+
+def collect_table_markers(db_config, env):
+    """Return per-table change markers and a hash of the table layout
+
+    A table's markers are its row count, the newest updated_at (or
+    created_at) value, and Postgres' modification counter, which also
+    catches updates and deletes on tables without timestamps.
+    """
+    columns = {}
+    for table, column in run_psql(db_config, env, TABLE_COLUMNS_SQL):
+        columns.setdefault(table, []).append(column)
+    modifications = dict(run_psql(db_config, env, MODIFICATIONS_SQL))
+
+    selects = []
+    for table, names in columns.items():
+        latest = next((c for c in ("updated_at", "created_at") if c in names), None)
+        latest_sql = f'max("{latest}")::text' if latest else "NULL"
+        selects.append(f"SELECT '{table}', count(*), {latest_sql} FROM \"{table}\"")
+
+    markers = {}
+    if selects:
+        for table, rows, latest in run_psql(
+            db_config, env, " UNION ALL ".join(selects)
+        ):
+            markers[table] = {
+                "rows": int(rows),
+                "latest": latest or None,
+                "modifications": int(modifications.get(table, 0)),
+            }
+    schema_hash = hashlib.sha256(
+        json.dumps(columns, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return markers, schema_hash
+
+
+def latest_manifest(backup_dir):
+    """Return (file name, manifest) of the newest backup in `backup_dir`"""
+    if not os.path.isdir(backup_dir):
+        return None, None
+    names = sorted(
+        name for name in os.listdir(backup_dir) if name.endswith(".manifest.json")
+    )
+    if not names:
+        return None, None
+    with open(os.path.join(backup_dir, names[-1]), "r") as f:
+        return names[-1], json.load(f)
+
+
+def incremental_backup(env_vars, backup_dir, full=False, compress=None, verbose=False):
+    """Dump only the tables that changed since the newest manifest
+
+    The first backup, a backup after a schema change, and `full=True`
+    take a complete base dump. Later runs compare per-table markers with
+    the newest manifest and dump only changed tables' data. Every manifest
+    names its parent and, per table, the dump file holding its latest data,
+    so db_restore.py can rebuild the database from the chain.
+    """
+    database_url = env_vars.get("DATABASE_URL")
+    if not database_url:
+        print(f"{Fore.RED}❌ DATABASE_URL not found in .env file")
+        return False
+
+    try:
+        db_config = parse_database_url(database_url)
+        print(f"{Fore.BLUE}📊 Database: {db_config['database']}")
+        print(f"{Fore.BLUE}🌐 Host: {db_config['host']}:{db_config['port']}")
+        print(f"{Fore.BLUE}👤 User: {db_config['username']}")
+    except ValueError as e:
+        print(f"{Fore.RED}❌ Error parsing DATABASE_URL: {e}")
+        return False
+
+    env = os.environ.copy()
+    env["PGPASSWORD"] = db_config["password"]
+    os.makedirs(backup_dir, exist_ok=True)
+    timings = {}
+
+    try:
+        start = time.perf_counter()
+        markers, schema_hash = collect_table_markers(db_config, env)
+        timings["markers"] = time.perf_counter() - start
+
+        parent_name, parent = latest_manifest(backup_dir)
+        if full or parent is None:
+            kind = "base"
+        elif parent["schema_hash"] != schema_hash:
+            print(f"{Fore.YELLOW}⚠️  Table layout changed since {parent_name}")
+            kind = "base"
+        else:
+            kind = "incremental"
+
+        if kind == "base":
+            changed = sorted(markers)
+        else:
+            changed = sorted(
+                table
+                for table, marker in markers.items()
+                if parent["markers"].get(table) != marker
+            )
+            if not changed:
+                print(f"{Fore.GREEN}✅ No tables changed since {parent_name}")
+                return True
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        dump_file = f"{timestamp}.{kind}.dump"
+        cmd = [
+            "pg_dump",
+            f"--host={db_config['host']}",
+            f"--port={db_config['port']}",
+            f"--username={db_config['username']}",
+            f"--dbname={db_config['database']}",
+            "--no-password",
+            "--verbose",
+            "--no-owner",
+            "--no-privileges",
+            "--format=custom",
+            f"--compress={compression_option(compress, pg_dump_major_version()) or 9}",
+            "--file",
+            os.path.join(backup_dir, dump_file),
+        ]
+        if kind == "incremental":
+            cmd.append("--data-only")
+            cmd.extend(f'--table=public."{table}"' for table in changed)
+
+        print(f"{Fore.YELLOW}🔄 Starting {kind} backup...")
+        print(f"{Fore.YELLOW}📋 Tables: {len(changed)}/{len(markers)} changed")
+        if kind == "incremental":
+            print(f"{Fore.YELLOW}📝 {', '.join(changed)}")
+        timings.update(run_with_phases(cmd, env, "catalog", DUMP_PHASES, verbose))
+    except subprocess.CalledProcessError as e:
+        print(f"{Fore.RED}❌ Backup failed!")
+        print(f"{Fore.RED}Error: {e}")
+        if e.stderr:
+            print(f"{Fore.RED}stderr: {e.stderr}")
+        return False
+    except FileNotFoundError:
+        print(
+            f"{Fore.RED}❌ pg_dump or psql command not found. Please install PostgreSQL client tools."
+        )
+        return False
+    except ValueError as e:
+        print(f"{Fore.RED}❌ {e}")
+        return False
+
+    tables = {table: dump_file for table in markers}
+    if kind == "incremental":
+        tables = {
+            table: dump_file if table in changed else parent["tables"][table]
+            for table in markers
+        }
+    manifest = {
+        "version": 1,
+        "kind": kind,
+        "database": db_config["database"],
+        "created_at": datetime.now().isoformat(),
+        "parent": parent_name if kind == "incremental" else None,
+        "base": dump_file if kind == "base" else parent["base"],
+        "file": dump_file,
+        "schema_hash": schema_hash,
+        "dumped": changed,
+        "markers": markers,
+        "tables": tables,
+    }
+    manifest_file = os.path.join(backup_dir, f"{timestamp}.manifest.json")
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    size = os.path.getsize(os.path.join(backup_dir, dump_file))
+    print(f"{Fore.GREEN}✅ {kind.capitalize()} backup completed successfully!")
+    print(f"{Fore.GREEN}📁 Dump: {os.path.join(backup_dir, dump_file)}")
+    print(f"{Fore.GREEN}🧾 Manifest: {manifest_file}")
+    print(f"{Fore.GREEN}📏 File size: {size / 1024:.1f} KB")
+    print_timings(timings)
+    return True
+
+
+def print_timings(timings):
+    total = sum(timings.values())
+    width = max(10, *(len(phase) for phase in timings))
+    print(f"{Fore.BLUE}⏱️  Phase timings:")
+    for phase, seconds in timings.items():
+        print(f"{Fore.BLUE}   {phase:<{width}} {seconds:8.2f}s")
+    print(f"{Fore.BLUE}   {'total':<{width}} {total:8.2f}s")
+
+
+def dump_database(
+    env_vars,
+    output_file=None,
+    format="custom",
+    jobs=1,
+    compress=None,
+    verbose=False,
+    stream=None,
+):
+    """Dump PostgreSQL database using pg_dump
+
+    With jobs > 1 the dump uses the directory format, one table per worker.
+    `stream` is a dict with chunk_size, compression and level: pg_dump then
+    writes an uncompressed custom-format archive to stdout, which is
+    compressed in-process into chunk files listed in manifest.json.
+    """
 
     # Get database URL from environment
     database_url = env_vars.get("DATABASE_URL")
@@ -107,6 +575,31 @@ def dump_database(env_vars, output_file=None, format="custom"):
         print(f"{Fore.RED}❌ Error parsing DATABASE_URL: {e}")
         return False
 
+    if stream and jobs > 1:
+        print(f"{Fore.RED}❌ --stream and --jobs cannot be combined")
+        return False
+    if stream:
+        format = "stream"
+
+    # Parallel dumps are only supported by the directory format
+    if jobs > 1 and format != "directory":
+        print(f"{Fore.YELLOW}⚠️  --jobs {jobs} requires the directory format, using it")
+        format = "directory"
+
+    timings = {}
+    start = time.perf_counter()
+    try:
+        compress = compression_option(compress, pg_dump_major_version())
+    except ValueError as e:
+        print(f"{Fore.RED}❌ {e}")
+        return False
+    except FileNotFoundError:
+        print(
+            f"{Fore.RED}❌ pg_dump command not found. Please install PostgreSQL client tools."
+        )
+        return False
+    timings["preflight"] = time.perf_counter() - start
+
     # Set output file if not provided
     if not output_file:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -130,21 +623,42 @@ def dump_database(env_vars, output_file=None, format="custom"):
 
     # Add format-specific options
     if format == "custom":
-        cmd.extend(["--format=custom", "--compress=9"])
+        cmd.extend(["--format=custom", f"--compress={compress or 9}"])
         if not output_file.endswith(".dump"):
             output_file = output_file.replace(".sql", ".dump")
     elif format == "plain":
         cmd.extend(["--format=plain"])
+        if compress:
+            cmd.append(f"--compress={compress}")
     elif format == "directory":
         cmd.extend(["--format=directory"])
+        if compress:
+            cmd.append(f"--compress={compress}")
+        if jobs > 1:
+            cmd.append(f"--jobs={jobs}")
         if not output_file.endswith("/"):
             output_file = output_file.rstrip(".sql") + "/"
+    elif format == "stream":
+        # Compression happens in-process, per chunk
+        cmd.extend(["--format=custom", "--compress=0"])
+        if not output_file.endswith(".stream"):
+            output_file = output_file.replace(".sql", "") + ".stream"
 
-    cmd.extend(["--file", output_file])
+    if format != "stream":
+        cmd.extend(["--file", output_file])
 
     print(f"{Fore.YELLOW}🔄 Starting database dump...")
     print(f"{Fore.YELLOW}📁 Output file: {output_file}")
     print(f"{Fore.YELLOW}📋 Format: {format}")
+    if jobs > 1:
+        print(f"{Fore.YELLOW}⚡ Jobs: {jobs}")
+    if compress:
+        print(f"{Fore.YELLOW}🗜️  Compression: {compress}")
+    if stream:
+        print(
+            f"{Fore.YELLOW}🗜️  Stream: {stream['compression']} level {stream['level']}, "
+            f"{stream['chunk_size'] / 1024**2:.0f} MB chunks"
+        )
 
     # Set password environment variable
     env = os.environ.copy()
@@ -152,22 +666,39 @@ def dump_database(env_vars, output_file=None, format="custom"):
 
     try:
         # Run pg_dump
-        result = subprocess.run(
-            cmd, env=env, capture_output=True, text=True, check=True
-        )
+        if stream:
+            writer = ChunkWriter(
+                output_file,
+                stream["chunk_size"],
+                stream["compression"],
+                stream["level"],
+            )
+            timings.update(
+                run_with_phases(
+                    cmd, env, "catalog", DUMP_PHASES, verbose, writer.consume
+                )
+            )
+            write_manifest(output_file, writer, db_config, timings)
+            print(
+                f"{Fore.GREEN}🧾 {len(writer.chunks)} chunks, "
+                f"{writer.raw_bytes / 1024**2:.1f} MB raw, listed in manifest.json"
+            )
+        else:
+            timings.update(run_with_phases(cmd, env, "catalog", DUMP_PHASES, verbose))
 
         print(f"{Fore.GREEN}✅ Database dump completed successfully!")
         print(f"{Fore.GREEN}📁 File saved as: {output_file}")
 
         # Show file size
         if os.path.exists(output_file):
-            size = os.path.getsize(output_file)
+            size = directory_size(output_file)
             if size > 1024 * 1024:
                 size_str = f"{size / (1024 * 1024):.1f} MB"
             else:
                 size_str = f"{size / 1024:.1f} KB"
             print(f"{Fore.GREEN}📏 File size: {size_str}")
 
+        print_timings(timings)
         return True
 
     except subprocess.CalledProcessError as e:
@@ -183,6 +714,208 @@ def dump_database(env_vars, output_file=None, format="custom"):
             f"{Fore.RED}❌ pg_dump command not found. Please install PostgreSQL client tools."
         )
         return False
+    except ValueError as e:
+        print(f"{Fore.RED}❌ {e}")
+        return False
+
+
+# One scan per table: total rows, plus a checksum over a deterministic sample
+# (rows whose text hashes to 0 modulo N), so both databases pick the same rows
+FINGERPRINT_SQL = """
+SELECT count(*),
+       count(*) FILTER (WHERE hashtext(t::text) % {sample} = 0),
+       coalesce(md5(string_agg(md5(t::text), '' ORDER BY md5(t::text))
+                FILTER (WHERE hashtext(t::text) % {sample} = 0)), '')
+FROM public."{table}" t
+"""
+
+
+def table_fingerprint(db_config, env, table, sample):
+    """Return (rows, sampled rows, sample checksum) for one table"""
+    [(rows, sampled, checksum)] = run_psql(
+        db_config, env, FINGERPRINT_SQL.format(table=table, sample=sample)
+    )
+    return int(rows), int(sampled), checksum
+
+
+def compare_databases(source, sandbox, jobs=4, sample=100):
+    """Fingerprint every table in both databases, `jobs` queries at a time"""
+    envs = {"source": password_env(source), "restored": password_env(sandbox)}
+    tables = {}
+    for name, db_config in (("source", source), ("restored", sandbox)):
+        for table, _ in run_psql(db_config, envs[name], TABLE_COLUMNS_SQL):
+            tables.setdefault(table, set()).add(name)
+
+    queries = [
+        (table, name, db_config)
+        for table, present in sorted(tables.items())
+        for name, db_config in (("source", source), ("restored", sandbox))
+        if name in present
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        fingerprints = executor.map(
+            lambda query: table_fingerprint(query[2], envs[query[1]], query[0], sample),
+            queries,
+        )
+        results = {}
+        for (table, name, _), fingerprint in zip(queries, fingerprints):
+            results.setdefault(table, {})[name] = fingerprint
+
+    report = {}
+    for table in sorted(tables):
+        source_fp = results[table].get("source")
+        restored_fp = results[table].get("restored")
+        entry = {
+            "source_rows": source_fp[0] if source_fp else None,
+            "restored_rows": restored_fp[0] if restored_fp else None,
+            "sampled_rows": restored_fp[1] if restored_fp else None,
+        }
+        if source_fp is None or restored_fp is None:
+            entry["status"] = "missing"
+        elif source_fp[0] != restored_fp[0]:
+            entry["status"] = "row_count_mismatch"
+        elif source_fp[2] != restored_fp[2]:
+            entry["status"] = "checksum_mismatch"
+        else:
+            entry["status"] = "ok"
+        report[table] = entry
+    return report
+
+
+def local_sandbox_url(source):
+    """The default sandbox server: a local PostgreSQL with the source's login"""
+    return (
+        f"postgresql://{source['username']}:{source['password']}"
+        f"@localhost:5432/postgres"
+    )
+
+
+def verify_dump(
+    env_vars,
+    dump_file,
+    jobs=4,
+    sample=100,
+    report_file=None,
+    keep=False,
+    sandbox_url=None,
+):
+    """Restore a dump into a throwaway database and compare it with the source
+
+    The sandbox is created on the server of `sandbox_url` (a maintenance
+    database URL; default SANDBOX_DATABASE_URL from .env, else a local
+    server), so the restore load stays off the source server. It is
+    restored with `jobs` parallel workers, compared table by table (row
+    counts and a checksum of a 1-in-`sample` row sample), and dropped
+    afterwards. Plain dumps are safe to verify: restore_database leaves out
+    their DROP/CREATE DATABASE and connect lines, which name the source.
+    Writes that reach the source after the dump was taken show up as
+    differences, so verify right after dumping.
+    """
+    database_url = env_vars.get("DATABASE_URL")
+    if not database_url:
+        print(f"{Fore.RED}❌ DATABASE_URL not found in .env file")
+        return False
+    if not os.path.exists(dump_file):
+        print(f"{Fore.RED}❌ Dump file not found: {dump_file}")
+        return False
+
+    try:
+        source = parse_database_url(database_url)
+    except ValueError as e:
+        print(f"{Fore.RED}❌ Error parsing DATABASE_URL: {e}")
+        return False
+
+    sandbox_url = (
+        sandbox_url or env_vars.get("SANDBOX_DATABASE_URL") or local_sandbox_url(source)
+    )
+    try:
+        maintenance = parse_database_url(sandbox_url)
+    except ValueError as e:
+        print(f"{Fore.RED}❌ Error parsing sandbox URL: {e}")
+        return False
+    if (maintenance["host"], maintenance["port"]) == (source["host"], source["port"]):
+        print(
+            f"{Fore.YELLOW}⚠️  The sandbox is on the source server "
+            f"{source['host']}:{source['port']}; the restore will load it"
+        )
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    sandbox = dict(maintenance, database=f"{source['database']}_verify_{timestamp}")
+    sandbox_url = sandbox_url.rsplit("/", 1)[0] + "/" + sandbox["database"]
+    report_file = report_file or f"{dump_file.rstrip(os.sep)}.verify.json"
+
+    env = password_env(maintenance)
+
+    timings = {}
+    try:
+        print(
+            f"{Fore.YELLOW}🧪 Creating sandbox database {sandbox['database']} "
+            f"on {maintenance['host']}:{maintenance['port']}..."
+        )
+        run_psql(maintenance, env, f'CREATE DATABASE "{sandbox["database"]}"')
+        try:
+            start = time.perf_counter()
+            restored = restore_database(
+                dict(env_vars, DATABASE_URL=sandbox_url), dump_file, jobs=jobs
+            )
+            timings["restore"] = time.perf_counter() - start
+            if not restored:
+                return False
+
+            print(f"{Fore.YELLOW}🔍 Comparing tables with {source['database']}...")
+            start = time.perf_counter()
+            tables = compare_databases(source, sandbox, jobs, sample)
+            timings["compare"] = time.perf_counter() - start
+        finally:
+            if keep:
+                print(f"{Fore.BLUE}ℹ️  Keeping sandbox database {sandbox['database']}")
+            else:
+                run_psql(
+                    maintenance, env, f'DROP DATABASE IF EXISTS "{sandbox["database"]}"'
+                )
+    except subprocess.CalledProcessError as e:
+        print(f"{Fore.RED}❌ Verification failed!")
+        print(f"{Fore.RED}Error: {e}")
+        if e.stderr:
+            print(f"{Fore.RED}stderr: {e.stderr}")
+        return False
+    except FileNotFoundError:
+        print(
+            f"{Fore.RED}❌ psql command not found. Please install PostgreSQL client tools."
+        )
+        return False
+
+    failures = {
+        table: entry for table, entry in tables.items() if entry["status"] != "ok"
+    }
+    report = {
+        "dump": dump_file,
+        "database": source["database"],
+        "sandbox": sandbox["database"],
+        "verified": datetime.now().isoformat(timespec="seconds"),
+        "sample": f"1/{sample}",
+        "ok": not failures,
+        "timings": {phase: round(seconds, 3) for phase, seconds in timings.items()},
+        "tables": tables,
+    }
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=2)
+
+    width = max([10] + [len(table) for table in tables])
+    for table, entry in tables.items():
+        color = Fore.GREEN if entry["status"] == "ok" else Fore.RED
+        rows = entry["restored_rows"] if entry["restored_rows"] is not None else "-"
+        print(f"{color}   {table:<{width}} {rows:>12} rows  {entry['status']}")
+    print_timings(timings)
+    if failures:
+        print(
+            f"{Fore.RED}❌ {len(failures)} of {len(tables)} tables differ, see {report_file}"
+        )
+        return False
+    print(
+        f"{Fore.GREEN}✅ All {len(tables)} tables match, report saved as {report_file}"
+    )
+    return True
 
 
 def main():
@@ -199,8 +932,100 @@ def main():
         default="custom",
         help="Output format (default: custom)",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Dump N tables in parallel (implies --format directory); with "
+        "verify, as verify's --jobs",
+    )
+    parser.add_argument(
+        "--compress",
+        "-Z",
+        help="Compression: 0-9, none, or gzip|lz4|zstd[:level] (lz4/zstd need pg_dump 16+)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Pipe pg_dump through in-process compression into checksummed chunks",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        default="256M",
+        help="Compressed size per chunk with --stream, e.g. 64M or 1G (default: 256M)",
+    )
+    parser.add_argument(
+        "--stream-compression",
+        choices=["gzip", "zstd"],
+        default="gzip",
+        help="Chunk compression with --stream (zstd needs the zstandard package)",
+    )
+    parser.add_argument(
+        "--level",
+        type=int,
+        default=6,
+        help="Chunk compression level with --stream (default: 6)",
+    )
+    parser.add_argument(
+        "--incremental",
+        "-i",
+        action="store_true",
+        help="Dump only tables changed since the last manifest in --backup-dir",
+    )
+    parser.add_argument(
+        "--backup-dir",
+        default="backups",
+        help="Where --incremental keeps dumps and manifests (default: backups)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="With --incremental, start a new chain with a full base backup",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Print pg_dump log lines as they arrive",
+    )
     parser.add_argument("--env-file", help="Path to .env file (default: auto-detect)")
 
+    commands = parser.add_subparsers(dest="command")
+    verify = commands.add_parser(
+        "verify",
+        help="Restore a dump into a throwaway database and compare it with the source",
+    )
+    verify.add_argument("dump_file", help="Dump file, directory or manifest to verify")
+    verify.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        # Keep a -j given before `verify`; subparser defaults would replace it
+        default=argparse.SUPPRESS,
+        help="Parallel restore jobs and comparison queries (default: 4)",
+    )
+    verify.add_argument(
+        "--sample",
+        type=int,
+        default=100,
+        help="Checksum one row in N per table; 1 checksums every row (default: 100)",
+    )
+    verify.add_argument(
+        "--report", help="JSON report path (default: <dump_file>.verify.json)"
+    )
+    verify.add_argument(
+        "--keep", action="store_true", help="Keep the sandbox database for inspection"
+    )
+    verify.add_argument(
+        "--sandbox-url",
+        help="Maintenance database URL of the server to restore into "
+        "(default: SANDBOX_DATABASE_URL, else postgres on localhost:5432 "
+        "with the source's credentials)",
+    )
+    verify.add_argument(
+        "--env-file", default=argparse.SUPPRESS, help="Path to .env file"
+    )
+
     args = parser.parse_args()
 
     print(f"{Fore.CYAN}🗄️  PostgreSQL Database Dump Tool")
@@ -221,8 +1046,42 @@ def main():
     print(f"{Fore.BLUE}📖 Loading environment variables...")
     env_vars = load_env_file(env_file)
 
+    if args.command == "verify":
+        success = verify_dump(
+            env_vars,
+            args.dump_file,
+            args.jobs or 4,
+            args.sample,
+            args.report,
+            args.keep,
+            args.sandbox_url,
+        )
+        return 0 if success else 1
+
     # Perform database dump
-    success = dump_database(env_vars, args.output, args.format)
+    if args.incremental:
+        success = incremental_backup(
+            env_vars, args.backup_dir, args.full, args.compress, args.verbose
+        )
+        return 0 if success else 1
+
+    stream = None
+    if args.stream:
+        stream = {
+            "chunk_size": parse_size(args.chunk_size),
+            "compression": args.stream_compression,
+            "level": args.level,
+        }
+
+    success = dump_database(
+        env_vars,
+        args.output,
+        args.format,
+        args.jobs or 1,
+        args.compress,
+        args.verbose,
+        stream,
+    )
 
     return 0 if success else 1
 
@@ -5,15 +5,30 @@ Restores database from dump file using connection details from .env file
 """
 
 import argparse
+import hashlib
+import io
+import json
 import os
+import re
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import deque
 from pathlib import Path
 
-from colorama import Fore, Style, init
+from colorama import Fore, Style
+from console import init_colors
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for zstd stream dumps
+    zstandard = None
 
 # Initialize colorama for colored output
-init(autoreset=True)
+init_colors()
 
 
 def find_env_file():
@@ -88,7 +103,11 @@ def load_env_file(env_file):
 
 def detect_dump_format(dump_file):
     """Detect the format of the dump file"""
-    if dump_file.endswith(".dump"):
+    if os.path.isfile(os.path.join(dump_file, "manifest.json")):
+        return "stream"
+    elif dump_file.endswith(".manifest.json"):
+        return "incremental"
+    elif dump_file.endswith(".dump"):
         return "custom"
     elif dump_file.endswith(".sql"):
         return "plain"
@@ -107,8 +126,755 @@ def detect_dump_format(dump_file):
             return "plain"
 
 
-def restore_database(env_vars, dump_file, format=None, drop_existing=False):
-    """Restore PostgreSQL database from dump file"""
+# pg_restore sections in dependency order: schema, table data, then
+# indexes, constraints and triggers
+RESTORE_SECTIONS = ["pre-data", "data", "post-data"]
+
+
+def print_timings(timings):
+    total = sum(timings.values())
+    width = max(10, *(len(phase) for phase in timings))
+    print(f"{Fore.BLUE}⏱️  Phase timings:")
+    for phase, seconds in timings.items():
+        print(f"{Fore.BLUE}   {phase:<{width}} {seconds:8.2f}s")
+    print(f"{Fore.BLUE}   {'total':<{width}} {total:8.2f}s")
+
+
+# TOC entry types restored in the post-data section; data types below
+POST_DATA_TYPES = (
+    "INDEX",
+    "CONSTRAINT",
+    "FK CONSTRAINT",
+    "TRIGGER",
+    "RULE",
+    "POLICY",
+    "INDEX ATTACH",
+    "EVENT TRIGGER",
+    "MATERIALIZED VIEW DATA",
+)
+DATA_TYPES = ("TABLE DATA", "SEQUENCE SET", "BLOBS", "LARGE OBJECT")
+
+# pg_restore --verbose, serial: creating INDEX "public.users_email_key",
+# processing data for table "public.users"
+SERIAL_ITEM = re.compile(
+    r'pg_restore: (?:creating ([A-Z][A-Z ]*?) "([^"]+)"'
+    r'|processing data for table "([^"]+)")'
+)
+# pg_restore --verbose, parallel: finished item 3405 TABLE DATA public users
+PARALLEL_ITEM = re.compile(r"pg_restore: (launching|finished) item (\d+) (.+)$")
+
+COPY_PROGRESS_SQL = (
+    "SELECT relid, tuples_processed, bytes_processed FROM pg_stat_progress_copy "
+    "WHERE datname = current_database()"
+)
+INSERTED_ROWS_SQL = (
+    "SELECT relname, n_tup_ins FROM pg_stat_user_tables WHERE schemaname = 'public'"
+)
+
+
+# Statements pg_dump --create writes for the dumped database itself. A
+# plain restore runs in the database psql is connected to, which may have
+# another name and cannot drop itself, so they are left out.
+DATABASE_STATEMENT = re.compile(
+    rb"(?:(?:DROP|CREATE|ALTER) DATABASE|COMMENT ON DATABASE|\\connect)\b"
+)
+
+
+def strip_database_statements(lines):
+    """Yield a plain dump's lines without its database-level statements
+
+    COPY data is passed through untouched.
+    """
+    in_copy = False
+    for line in lines:
+        if in_copy:
+            in_copy = not line.startswith(b"\\.")
+        elif line.startswith(b"COPY ") and line.rstrip().endswith(b"FROM stdin;"):
+            in_copy = True
+        elif DATABASE_STATEMENT.match(line):
+            continue
+        yield line
+
+
+def feed_plain_dump(dump_file, stdin):
+    """Write a plain dump to psql's stdin, then close it"""
+    try:
+        with open(dump_file, "rb") as f:
+            stdin.writelines(strip_database_statements(f))
+    except BrokenPipeError:
+        pass  # psql stopped on an error; its return code tells why
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+def toc_sections(dump_file):
+    """Count a custom or directory dump's TOC entries per section"""
+    toc = subprocess.run(
+        ["pg_restore", "--list", dump_file], capture_output=True, text=True, check=True
+    ).stdout
+    counts = {section: 0 for section in RESTORE_SECTIONS}
+    for line in toc.splitlines():
+        if not line or line.startswith(";"):
+            continue
+        # "3405; 0 16390 TABLE DATA public users postgres"
+        description = line.split(" ", 3)[-1]
+        if description.startswith(DATA_TYPES):
+            counts["data"] += 1
+        elif description.startswith(POST_DATA_TYPES):
+            counts["post-data"] += 1
+        else:
+            counts["pre-data"] += 1
+    return counts
+
+
+def psql_rows(db_config, env, sql):
+    """Run a query with psql and return its rows as lists of strings"""
+    cmd = [
+        "psql",
+        f"--host={db_config['host']}",
+        f"--port={db_config['port']}",
+        f"--username={db_config['username']}",
+        f"--dbname={db_config['database']}",
+        "--no-password",
+        "--tuples-only",
+        "--no-align",
+        "--field-separator=\t",
+        "--command",
+        sql,
+    ]
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+    return [line.split("\t") for line in result.stdout.splitlines() if line]
+
+
+def classify_item(kind, name):
+    """Group a TOC item as ("data", table), ("index", name) or ("schema", name)"""
+    name = name.replace("public.", "", 1)
+    if kind in DATA_TYPES:
+        return "data", name
+    if kind in POST_DATA_TYPES:
+        return "index", name
+    return "schema", name
+
+
+class RestoreProgress:
+    """Follow pg_restore --verbose output and draw a live progress line
+
+    Items are timed from their start/finish messages. Rows and bytes come
+    from pg_stat_progress_copy (PostgreSQL 14+), polled once per interval,
+    so throughput is measured where the data lands.
+    """
+
+    def __init__(self, db_config, env, label, total_items=None, interval=1.0):
+        self.db_config = db_config
+        self.env = env
+        self.label = label
+        self.total_items = total_items
+        self.interval = interval
+        self.done_items = 0
+        self.timings = {}  # (category, name) -> seconds
+        self.rows = 0
+        self.bytes = 0
+        self._running = {}  # item key -> (category, name, started)
+        self._copies = {}  # relid -> (tuples, bytes) high-water marks
+        self._rate = (0.0, 0.0)
+        self._stop = threading.Event()
+        self._copy_progress = True
+        self._lock = threading.Lock()
+        self._interactive = sys.stdout.isatty()
+        self._last_print = 0.0
+
+    def _start(self, key, item):
+        self._running[key] = (*item, time.perf_counter())
+
+    def _finish(self, key):
+        category, name, started = self._running.pop(key)
+        item = (category, name)
+        self.timings[item] = self.timings.get(item, 0) + time.perf_counter() - started
+        self.done_items += 1
+
+    @staticmethod
+    def _parse_description(description):
+        # "TABLE DATA public users postgres", "INDEX public users_email_key postgres"
+        for kind in DATA_TYPES + POST_DATA_TYPES:
+            if description.startswith(kind + " "):
+                parts = description[len(kind) + 1 :].split()
+                return classify_item(kind, parts[1] if len(parts) > 1 else parts[0])
+        return "schema", description
+
+    def feed(self, line):
+        with self._lock:
+            parallel = PARALLEL_ITEM.search(line)
+            if parallel:
+                event, item_id, description = parallel.groups()
+                if event == "launching":
+                    self._start(item_id, self._parse_description(description))
+                elif item_id in self._running:
+                    self._finish(item_id)
+                return
+            serial = SERIAL_ITEM.search(line)
+            if serial:
+                # Serially, each item runs until the next one starts
+                if "serial" in self._running:
+                    self._finish("serial")
+                kind, name, table = serial.groups()
+                if table:
+                    self._start("serial", classify_item("TABLE DATA", table))
+                else:
+                    self._start("serial", classify_item(kind, name))
+
+    def _poll_copy(self):
+        if not self._copy_progress:
+            return
+        try:
+            rows = psql_rows(self.db_config, self.env, COPY_PROGRESS_SQL)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            self._copy_progress = False  # older server without the view
+            return
+        for relid, tuples, size in rows:
+            seen = self._copies.get(relid, (0, 0))
+            self._copies[relid] = (max(seen[0], int(tuples)), max(seen[1], int(size)))
+
+    def _render(self, final=False):
+        rows, size = self._rate
+        done = self.done_items
+        if self.total_items:
+            fraction = min(done / self.total_items, 1.0)
+            filled = int(fraction * 24)
+            items = f"{'█' * filled}{'░' * (24 - filled)} {fraction:4.0%} {done}/{self.total_items} items"
+        else:
+            items = f"{done} items"
+        line = (
+            f"{Fore.BLUE}⏳ {self.label}: {items}  "
+            f"{rows:,.0f} rows/s  {size / 1024**2:.1f} MB/s"
+        )
+        if self._interactive:
+            print(f"\r{line}\033[K", end="\n" if final else "", flush=True)
+        elif final or time.perf_counter() - self._last_print >= 10:
+            print(line)
+            self._last_print = time.perf_counter()
+
+    def _monitor(self):
+        last_rows, last_bytes, last_time = 0, 0, time.perf_counter()
+        while not self._stop.wait(self.interval):
+            self._poll_copy()
+            now = time.perf_counter()
+            with self._lock:
+                self.rows = sum(tuples for tuples, _ in self._copies.values())
+                self.bytes = sum(size for _, size in self._copies.values())
+                elapsed = now - last_time
+                self._rate = (
+                    (self.rows - last_rows) / elapsed,
+                    (self.bytes - last_bytes) / elapsed,
+                )
+                self._render()
+            last_rows, last_bytes, last_time = self.rows, self.bytes, now
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        with self._lock:
+            for key in list(self._running):
+                self._finish(key)
+            # Final line shows the average rates of the whole run
+            elapsed = time.perf_counter() - self._started
+            self._rate = (self.rows / elapsed, self.bytes / elapsed)
+            self._render(final=True)
+
+
+def run_restore(cmd, env, progress, plain_dump=None):
+    """Run pg_restore/psql quietly, feeding its stderr to `progress`
+
+    Nothing is captured: stdout is discarded and stderr is read line by
+    line, keeping only the last errors and warnings for the error report.
+    With `plain_dump`, that file is piped into stdin by feed_plain_dump.
+    """
+    tail = deque(maxlen=20)
+    with progress:
+        process = subprocess.Popen(
+            cmd,
+            env=env,
+            stdin=subprocess.PIPE if plain_dump else None,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        if plain_dump:
+            writer = threading.Thread(
+                target=feed_plain_dump, args=(plain_dump, process.stdin), daemon=True
+            )
+            writer.start()
+        for line in io.TextIOWrapper(process.stderr, errors="replace"):
+            progress.feed(line)
+            if "error" in line.lower() or "warning" in line.lower():
+                tail.append(line.rstrip())
+        process.wait()
+        if plain_dump:
+            writer.join()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(
+            process.returncode, cmd, stderr="\n".join(tail)
+        )
+    return progress.timings
+
+
+def inserted_rows(db_config, env, before=None):
+    """Rows inserted per table according to pg_stat_user_tables"""
+    try:
+        rows = psql_rows(db_config, env, INSERTED_ROWS_SQL)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return {}
+    before = before or {}
+    return {name: int(count) - before.get(name, 0) for name, count in rows}
+
+
+def print_restore_summary(timings, rows, limit=10):
+    """Print where restore time went: slowest tables and index builds"""
+    for category, title in (("data", "Table data"), ("index", "Index builds")):
+        items = sorted(
+            (
+                (name, seconds)
+                for (kind, name), seconds in timings.items()
+                if kind == category
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        if not items:
+            continue
+        total = sum(seconds for _, seconds in items)
+        print(f"{Fore.BLUE}📊 {title}: {len(items)} items, {total:.2f}s")
+        width = max(len(name) for name, _ in items[:limit])
+        for name, seconds in items[:limit]:
+            count = f"{rows[name]:>12,} rows" if name in rows else ""
+            print(f"{Fore.BLUE}   {name:<{width}} {seconds:8.2f}s {count}")
+        if len(items) > limit:
+            print(f"{Fore.BLUE}   ... {len(items) - limit} more")
+
+
+def restore_parallel(db_config, env, dump_file, jobs):
+    """Restore a custom or directory dump with pg_restore --jobs
+
+    Each section runs as its own pg_restore so its time can be reported;
+    data loading and index builds are both spread over `jobs` connections.
+    """
+    timings = {}
+    item_timings = {}
+    totals = toc_sections(dump_file)
+    for section in RESTORE_SECTIONS:
+        print(f"{Fore.YELLOW}🔄 Restoring {section} with {jobs} jobs...")
+        cmd = [
+            "pg_restore",
+            f"--host={db_config['host']}",
+            f"--port={db_config['port']}",
+            f"--username={db_config['username']}",
+            f"--dbname={db_config['database']}",
+            "--no-password",
+            "--verbose",
+            "--no-owner",
+            "--no-privileges",
+            f"--section={section}",
+            f"--jobs={jobs}",
+            dump_file,
+        ]
+        start = time.perf_counter()
+        progress = RestoreProgress(db_config, env, section, totals[section])
+        item_timings.update(run_restore(cmd, env, progress))
+        timings[section] = time.perf_counter() - start
+    return timings, item_timings
+
+
+def new_decompressor(compression):
+    if compression == "gzip":
+        return zlib.decompressobj(31)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd stream dumps need: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Unknown stream compression '{compression}'")
+
+
+def read_chunks(directory, manifest, block_size=1024 * 1024):
+    """Yield the decompressed archive, chunk by chunk"""
+    for chunk in manifest["chunks"]:
+        decompressor = new_decompressor(manifest["compression"])
+        with open(os.path.join(directory, chunk["file"]), "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                yield decompressor.decompress(block)
+        yield decompressor.flush()
+
+
+def verify_chunks(directory, manifest, block_size=1024 * 1024):
+    """Check every chunk against its manifest checksum; returns bad file names"""
+    bad = []
+    for chunk in manifest["chunks"]:
+        path = os.path.join(directory, chunk["file"])
+        sha256 = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(block_size), b""):
+                    sha256.update(block)
+        except OSError:
+            bad.append(chunk["file"])
+            continue
+        if sha256.hexdigest() != chunk["sha256"]:
+            bad.append(chunk["file"])
+    return bad
+
+
+def restore_stream(db_config, env, directory):
+    """Verify a chunked stream dump and pipe it into pg_restore's stdin"""
+    with open(os.path.join(directory, "manifest.json"), "r") as f:
+        manifest = json.load(f)
+
+    print(f"{Fore.YELLOW}🔍 Verifying {len(manifest['chunks'])} chunks...")
+    bad = verify_chunks(directory, manifest)
+    if bad:
+        print(f"{Fore.RED}❌ Checksum mismatch or missing chunk: {', '.join(bad)}")
+        return False
+
+    cmd = [
+        "pg_restore",
+        f"--host={db_config['host']}",
+        f"--port={db_config['port']}",
+        f"--username={db_config['username']}",
+        f"--dbname={db_config['database']}",
+        "--no-password",
+        "--no-owner",
+        "--no-privileges",
+    ]
+    process = subprocess.Popen(cmd, env=env, stdin=subprocess.PIPE)
+    written = 0
+    try:
+        for data in read_chunks(directory, manifest):
+            process.stdin.write(data)
+            written += len(data)
+    except BrokenPipeError:
+        pass  # pg_restore exited early; its return code tells why
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+    process.wait()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+    print(f"{Fore.BLUE}📥 Streamed {written / 1024**2:.1f} MB into pg_restore")
+    return True
+
+
+def restore_chain(db_config, env, manifest_file, jobs=1):
+    """Rebuild the database from an incremental backup manifest
+
+    Schema comes from the chain's base dump. Each table's data is restored
+    from the dump holding its latest version, then indexes and foreign
+    keys are created, so tables can be loaded in any order.
+    """
+    backup_dir = os.path.dirname(os.path.abspath(manifest_file))
+    with open(manifest_file, "r") as f:
+        manifest = json.load(f)
+
+    files = {}
+    for table, dump in sorted(manifest["tables"].items()):
+        files.setdefault(dump, []).append(table)
+    missing = [
+        name
+        for name in [manifest["base"], *files]
+        if not os.path.exists(os.path.join(backup_dir, name))
+    ]
+    if missing:
+        print(f"{Fore.RED}❌ Missing dumps in chain: {', '.join(missing)}")
+        return False
+
+    base_cmd = [
+        "pg_restore",
+        f"--host={db_config['host']}",
+        f"--port={db_config['port']}",
+        f"--username={db_config['username']}",
+        f"--dbname={db_config['database']}",
+        "--no-password",
+        "--verbose",
+        "--no-owner",
+        "--no-privileges",
+    ]
+    if jobs > 1:
+        base_cmd.append(f"--jobs={jobs}")
+    base_file = os.path.join(backup_dir, manifest["base"])
+
+    timings = {}
+    steps = [("pre-data", ["--section=pre-data", base_file])]
+    for dump, tables in files.items():
+        selection = [f"--table={table}" for table in tables]
+        steps.append(
+            (dump, ["--section=data", *selection, os.path.join(backup_dir, dump)])
+        )
+    steps.append(("post-data", ["--section=post-data", base_file]))
+
+    item_timings = {}
+    before = inserted_rows(db_config, env)
+    for name, args in steps:
+        label = f"data from {name}" if name.endswith(".dump") else name
+        print(f"{Fore.YELLOW}🔄 Restoring {label}...")
+        start = time.perf_counter()
+        progress = RestoreProgress(db_config, env, name)
+        item_timings.update(run_restore(base_cmd + args, env, progress))
+        timings[name] = time.perf_counter() - start
+    print_timings(timings)
+    print_restore_summary(item_timings, inserted_rows(db_config, env, before))
+    return True
+
+
+# Tables holding one group's rows, parents before children:
+# (table, column pointing at the parent, parent table)
+GROUP_TABLES = [
+    ("groups", "id", None),
+    ("group_settings", "group_id", "groups"),
+    ("memberships", "group_id", "groups"),
+    ("blocked_users", "group_id", "groups"),
+    ("events", "group_id", "groups"),
+    ("rsvps", "event_id", "events"),
+    ("messages", "group_id", "groups"),
+    ("expenses", "group_id", "groups"),
+    ("expense_splits", "expense_id", "expenses"),
+    ("settlements", "group_id", "groups"),
+    ("team_league_teams", "group_id", "groups"),
+]
+
+# Tables outside the group that its rows reference, restored with it and
+# merged before the group's rows: table -> (referencing table, its column)
+GROUP_REFERENCES = {
+    "team_leagues": ("team_league_teams", "team_league_id"),
+}
+
+# Unique keys besides id; rows in the database holding the same key under
+# another id are replaced by the dump's
+NATURAL_KEYS = {
+    "group_settings": [("group_id",)],
+    "memberships": [("group_id", "member_id"), ("user_id", "group_id")],
+    "blocked_users": [("user_id", "group_id")],
+    "rsvps": [("event_id", "user_id")],
+    "expense_splits": [("expense_id", "user_id")],
+}
+
+COPY_HEADER = re.compile(r"^COPY public\.(\"?)(\w+)\1 \((.*)\) FROM stdin;$")
+
+
+def table_data_list(dump_file, tables):
+    """Build a pg_restore --use-list file selecting only `tables`' data
+
+    Entries are written in the order of `tables`, which is the order
+    pg_restore emits them in.
+    """
+    toc = subprocess.run(
+        ["pg_restore", "--list", dump_file], capture_output=True, text=True, check=True
+    ).stdout
+    entries = {}
+    for line in toc.splitlines():
+        parts = line.split()
+        # "3405; 0 16390 TABLE DATA public memberships postgres"
+        if len(parts) >= 7 and parts[3:5] == ["TABLE", "DATA"] and parts[5] == "public":
+            entries[parts[6].strip('"')] = line
+    missing = [table for table in tables if table not in entries]
+    selected = [entries[table] for table in tables if table in entries]
+    return "\n".join(selected) + "\n", missing
+
+
+def merge_sql(table, columns, temp):
+    """SQL merging a loaded temporary table into `table`
+
+    Rows are upserted on id; rows holding one of the table's natural keys
+    under another id are deleted first, since the upsert would fail on them.
+    """
+    statements = []
+    for key in NATURAL_KEYS.get(table, []):
+        match = " AND ".join(f'target."{column}" = source."{column}"' for column in key)
+        statements.append(
+            f'DELETE FROM public."{table}" AS target USING {temp} AS source '
+            f"WHERE {match} AND target.id <> source.id;\n"
+        )
+    updates = ", ".join(
+        f"{column} = EXCLUDED.{column}"
+        for column in columns.split(", ")
+        if column.strip('"') != "id"
+    )
+    statements.append(
+        f'INSERT INTO public."{table}" ({columns}) '
+        f"SELECT {columns} FROM {temp} "
+        f"ON CONFLICT (id) DO {'UPDATE SET ' + updates if updates else 'NOTHING'};\n"
+    )
+    return "".join(statements)
+
+
+def filter_copy_stream(lines, group_id, out, counts):
+    """Rewrite pg_restore's SQL output into upserts of the selected rows
+
+    Each COPY block is loaded into a temporary table; once all are loaded,
+    they are merged with merge_sql, tables in GROUP_REFERENCES first, so
+    rows still in the database are refreshed instead of failing on
+    duplicates. With `group_id`, only rows belonging to that group
+    (directly or through their parent) and the rows they reference in
+    GROUP_REFERENCES are kept.
+    """
+    parents = {table: (column, parent) for table, column, parent in GROUP_TABLES}
+    kept_ids = {}
+    referenced = {}
+    merges = []
+    table = None
+    for line in lines:
+        if table is None:
+            header = COPY_HEADER.match(line.rstrip("\n"))
+            if not header:
+                if line.startswith("SET ") or line.startswith("SELECT pg_catalog"):
+                    out.write(line)
+                continue
+            table, columns = header.group(2), header.group(3)
+            names = [name.strip().strip('"') for name in columns.split(",")]
+            id_index = names.index("id") if "id" in names else None
+            key_index = match_ids = None
+            references = []
+            if group_id is not None:
+                if table in GROUP_REFERENCES:
+                    key_index = id_index
+                    match_ids = referenced.get(table, set())
+                else:
+                    column, parent = parents[table]
+                    key_index = names.index(column)
+                    match_ids = (
+                        {group_id} if parent is None else kept_ids.get(parent, set())
+                    )
+                kept_ids[table] = set()
+                # Values pointing into tables that are streamed later
+                references = [
+                    (target, names.index(column))
+                    for target, (source, column) in GROUP_REFERENCES.items()
+                    if source == table
+                ]
+            counts[table] = 0
+            temp = f'"restore_{table}"'
+            out.write(
+                f'CREATE TEMP TABLE {temp} (LIKE public."{table}" INCLUDING DEFAULTS) '
+                "ON COMMIT DROP;\n"
+                f"COPY {temp} ({columns}) FROM stdin;\n"
+            )
+            continue
+
+        if line.startswith("\\."):
+            out.write("\\.\n")
+            merges.append((table, merge_sql(table, columns, temp)))
+            table = None
+            continue
+
+        if key_index is not None:
+            fields = line.rstrip("\n").split("\t")
+            if fields[key_index] not in match_ids:
+                continue
+            if id_index is not None:
+                kept_ids[table].add(fields[id_index])
+            for target, index in references:
+                referenced.setdefault(target, set()).add(fields[index])
+        counts[table] += 1
+        out.write(line)
+
+    merges.sort(key=lambda merge: merge[0] not in GROUP_REFERENCES)
+    for _, sql in merges:
+        out.write(sql)
+
+
+def selective_restore(db_config, env, dump_file, tables=None, group_id=None):
+    """Restore only some tables, or only one group's rows, from a dump
+
+    Only the selected TABLE DATA entries are read from the dump's table of
+    contents, and their COPY data is streamed through psql in a single
+    transaction.
+    """
+    if group_id is not None:
+        tables = [table for table, _, _ in GROUP_TABLES] + list(GROUP_REFERENCES)
+    list_text, missing = table_data_list(dump_file, tables)
+    if missing:
+        if group_id is None:
+            print(f"{Fore.RED}❌ Tables not in dump: {', '.join(missing)}")
+            return False
+        print(f"{Fore.YELLOW}⚠️  Not in dump, skipped: {', '.join(missing)}")
+
+    connection = [
+        f"--host={db_config['host']}",
+        f"--port={db_config['port']}",
+        f"--username={db_config['username']}",
+        f"--dbname={db_config['database']}",
+        "--no-password",
+    ]
+    with tempfile.NamedTemporaryFile("w", suffix=".list", delete=False) as f:
+        f.write(list_text)
+        list_file = f.name
+
+    counts = {}
+    start = time.perf_counter()
+    try:
+        extract = subprocess.Popen(
+            ["pg_restore", f"--use-list={list_file}", "--file=-", dump_file],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        load = subprocess.Popen(
+            [
+                "psql",
+                *connection,
+                "--quiet",
+                "--single-transaction",
+                "--set=ON_ERROR_STOP=1",
+                "--file=-",
+            ],
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            text=True,
+        )
+        try:
+            filter_copy_stream(extract.stdout, group_id, load.stdin, counts)
+        except BrokenPipeError:
+            pass  # psql stopped on an error; its return code tells why
+        finally:
+            extract.stdout.close()
+            try:
+                load.stdin.close()
+            except BrokenPipeError:
+                pass
+        extract.wait()
+        load.wait()
+    finally:
+        os.unlink(list_file)
+
+    for process in (extract, load):
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+
+    print(f"{Fore.BLUE}📋 Rows restored in {time.perf_counter() - start:.2f}s:")
+    for table, count in counts.items():
+        print(f"{Fore.BLUE}   {table:<20} {count:>8}")
+    return True
+
+
+def restore_database(
+    env_vars,
+    dump_file,
+    format=None,
+    drop_existing=False,
+    jobs=1,
+    tables=None,
+    group_id=None,
+):
+    """Restore PostgreSQL database from dump file
+
+    With `tables` or `group_id`, only those tables or that group's rows are
+    restored, merged into the existing data.
+    """
 
     # Get database URL from environment
     database_url = env_vars.get("DATABASE_URL")
@@ -140,11 +906,34 @@ def restore_database(env_vars, dump_file, format=None, drop_existing=False):
     print(f"{Fore.YELLOW}🔄 Starting database restore...")
     print(f"{Fore.YELLOW}📁 Dump file: {dump_file}")
     print(f"{Fore.YELLOW}📋 Format: {format}")
+    if jobs > 1 and format == "plain":
+        print(
+            f"{Fore.YELLOW}⚠️  Plain SQL dumps cannot be restored in parallel, ignoring --jobs"
+        )
+        jobs = 1
 
     # Set password environment variable
     env = os.environ.copy()
     env["PGPASSWORD"] = db_config["password"]
 
+    if tables or group_id:
+        if format not in ("custom", "directory"):
+            print(f"{Fore.RED}❌ Selective restore needs a custom or directory dump")
+            return False
+        try:
+            if not selective_restore(db_config, env, dump_file, tables, group_id):
+                return False
+        except subprocess.CalledProcessError as e:
+            print(f"{Fore.RED}❌ Selective restore failed: {e}")
+            return False
+        except FileNotFoundError:
+            print(
+                f"{Fore.RED}❌ pg_restore or psql command not found. Please install PostgreSQL client tools."
+            )
+            return False
+        print(f"{Fore.GREEN}✅ Selective restore completed successfully!")
+        return True
+
     try:
         if drop_existing:
             print(f"{Fore.YELLOW}🗑️  Dropping all existing tables...")
@@ -196,6 +985,30 @@ def restore_database(env_vars, dump_file, format=None, drop_existing=False):
             else:
                 print(f"{Fore.BLUE}ℹ️  No existing tables found")
 
+        if format == "incremental":
+            if not restore_chain(db_config, env, dump_file, jobs):
+                return False
+            print(f"{Fore.GREEN}✅ Database restore completed successfully!")
+            return True
+
+        if format == "stream":
+            if jobs > 1:
+                print(
+                    f"{Fore.YELLOW}⚠️  Stream dumps are restored from stdin, ignoring --jobs"
+                )
+            if not restore_stream(db_config, env, dump_file):
+                return False
+            print(f"{Fore.GREEN}✅ Database restore completed successfully!")
+            return True
+
+        before = inserted_rows(db_config, env)
+        if jobs > 1 and format in ("custom", "directory"):
+            timings, item_timings = restore_parallel(db_config, env, dump_file, jobs)
+            print(f"{Fore.GREEN}✅ Database restore completed successfully!")
+            print_timings(timings)
+            print_restore_summary(item_timings, inserted_rows(db_config, env, before))
+            return True
+
         # Build restore command based on format
         if format == "custom":
             cmd = [
@@ -205,7 +1018,7 @@ def restore_database(env_vars, dump_file, format=None, drop_existing=False):
                 f"--username={db_config['username']}",
                 f"--dbname={db_config['database']}",
                 "--no-password",
-                "--echo-all",  # Show all commands being executed
+                "--verbose",  # Item messages, parsed by RestoreProgress
                 "--no-owner",  # Don't set ownership
                 "--no-privileges",  # Don't restore privileges
                 dump_file,
@@ -218,9 +1031,9 @@ def restore_database(env_vars, dump_file, format=None, drop_existing=False):
                 f"--username={db_config['username']}",
                 f"--dbname={db_config['database']}",
                 "--no-password",
-                "--echo-all",  # Show all commands being executed
-                "--file",
-                dump_file,
+                "--quiet",  # No command tags on stdout
+                "--set=ON_ERROR_STOP=1",
+                "--file=-",  # fed by feed_plain_dump
             ]
         elif format == "directory":
             cmd = [
@@ -230,7 +1043,7 @@ def restore_database(env_vars, dump_file, format=None, drop_existing=False):
                 f"--username={db_config['username']}",
                 f"--dbname={db_config['database']}",
                 "--no-password",
-                "--echo-all",  # Show all commands being executed
+                "--verbose",
                 "--no-owner",
                 "--no-privileges",
                 dump_file,
@@ -239,17 +1052,19 @@ def restore_database(env_vars, dump_file, format=None, drop_existing=False):
             print(f"{Fore.RED}❌ Unsupported format: {format}")
             return False
 
-        # Run restore command
-        result = subprocess.run(
-            cmd, env=env, capture_output=True, text=True, check=True
+        # Run restore command, streaming its log into the progress line
+        total_items = None
+        if format != "plain":
+            total_items = sum(toc_sections(dump_file).values())
+        start = time.perf_counter()
+        progress = RestoreProgress(db_config, env, "restore", total_items)
+        item_timings = run_restore(
+            cmd, env, progress, dump_file if format == "plain" else None
         )
 
         print(f"{Fore.GREEN}✅ Database restore completed successfully!")
-
-        # Show restore output if verbose
-        if result.stdout:
-            print(f"{Fore.BLUE}📋 Restore output:")
-            print(result.stdout)
+        print(f"{Fore.GREEN}⏱️  Total time: {time.perf_counter() - start:.2f}s")
+        print_restore_summary(item_timings, inserted_rows(db_config, env, before))
 
         return True
 
@@ -266,6 +1081,9 @@ def restore_database(env_vars, dump_file, format=None, drop_existing=False):
             f"{Fore.RED}❌ pg_restore or psql command not found. Please install PostgreSQL client tools."
         )
         return False
+    except ValueError as e:
+        print(f"{Fore.RED}❌ {e}")
+        return False
 
 
 def main():
@@ -276,7 +1094,7 @@ def main():
     parser.add_argument(
         "--format",
         "-f",
-        choices=["custom", "plain", "directory"],
+        choices=["custom", "plain", "directory", "stream", "incremental"],
         help="Dump file format (auto-detected if not specified)",
     )
     parser.add_argument(
@@ -285,9 +1103,29 @@ def main():
         action="store_true",
         help="Drop existing database before restore",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Restore with N parallel jobs (custom and directory formats)",
+    )
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument(
+        "--table",
+        "-t",
+        action="append",
+        help="Restore only this table's rows (repeatable)",
+    )
+    selection.add_argument(
+        "--group-id",
+        help="Restore only the rows of this group (memberships, events, messages, expenses, ...)",
+    )
     parser.add_argument("--env-file", help="Path to .env file (default: auto-detect)")
 
     args = parser.parse_args()
+    if args.drop_existing and (args.table or args.group_id):
+        parser.error("--drop-existing cannot be combined with --table or --group-id")
 
     print(f"{Fore.CYAN}🗄️  PostgreSQL Database Restore Tool")
     print(f"{Fore.CYAN}{'='*50}")
@@ -309,7 +1147,13 @@ def main():
 
     # Perform database restore
     success = restore_database(
-        env_vars, args.dump_file, args.format, args.drop_existing
+        env_vars,
+        args.dump_file,
+        args.format,
+        args.drop_existing,
+        args.jobs,
+        args.table,
+        args.group_id,
     )
 
     return 0 if success else 1
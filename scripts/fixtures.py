@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Per-script fixture data for the test scripts
+
+Scripts that need a group create their own instead of picking one of the
+user's groups, so run_all_tests.py --jobs can run them side by side without
+one script leaving, deleting or filling a group another is using.
+"""
+
+import uuid
+
+from colorama import Fore
+
+CREATE_GROUP_MUTATION = """
+mutation CreateGroup($input: CreateGroupInput!) {
+    createGroup(input: $input) {
+        id
+        name
+        description
+    }
+}
+"""
+
+DELETE_GROUP_MUTATION = """
+mutation DeleteGroup($id: ID!) {
+    deleteGroup(id: $id)
+}
+"""
+
+
+def create_test_group(client, purpose):
+    """Create a group for one script's tests; returns it, or None on errors"""
+    variables = {
+        "input": {
+            "name": f"Test Group for {purpose} {uuid.uuid4().hex[:8]}",
+            "description": f"A test group for {purpose.lower()}",
+            "isPublic": True,
+        }
+    }
+    result = client.mutation(CREATE_GROUP_MUTATION, variables)
+    client.print_result(result, "Create Test Group")
+    group = (
+        result.get("data", {}).get("createGroup") if "errors" not in result else None
+    )
+    if not group:
+        print(f"{Fore.RED}❌ Cannot create test group")
+        return None
+    print(f"{Fore.GREEN}✅ Using group: {group['name']} (ID: {group['id']})")
+    return group
+
+
+def delete_test_group(client, group_id):
+    """Delete a group made by create_test_group, with everything in it"""
+    result = client.mutation(DELETE_GROUP_MUTATION, {"id": group_id})
+    client.print_result(result, "Delete Test Group")
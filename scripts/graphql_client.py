@@ -3,33 +3,188 @@
 Base GraphQL client for testing the clubs application
 """
 
-import asyncio
 import json
 import os
-from typing import Any, Dict, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import requests
-import websockets
-from colorama import Fore, Style, init
+from colorama import Fore, Style
+from console import init_colors
+from http_session import create_session, post_idempotent
+from pagination import MAX_PAGE_SIZE, PAGE_QUERIES
+from persisted_queries import PersistedQueryCache, is_persisted_query_not_found
+from response_cache import NormalizedCache
+
+if TYPE_CHECKING:
+    from subscriptions import SubscriptionManager
 
 # Initialize colorama for colored output
-init(autoreset=True)
+init_colors()
+
+
+def load_token(token_file: str = ".token") -> Optional[str]:
+    """Load the JWT token saved by login.py"""
+    if os.path.exists(token_file):
+        with open(token_file, "r") as f:
+            return f.read().strip()
+    return None
+
+
+def request_headers(token: Optional[str]) -> Dict[str, str]:
+    """Headers for a GraphQL POST, authenticated when there is a token"""
+    headers = {
+        "Content-Type": "application/json",
+    }
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def print_errors(result: Dict[str, Any]):
+    """Print the GraphQL errors contained in a result"""
+    if "errors" in result:
+        print(f"{Fore.RED}❌ GraphQL Errors:")
+        for error in result["errors"]:
+            print(f"  {error.get('message', 'Unknown error')}")
+
+
+class QueryBatch:
+    """Collects operations and sends them as one JSON-array request
+
+    `add` returns a Future that resolves once the batch is flushed, either
+    explicitly or automatically when `max_size` operations are queued.
+    """
+
+    def __init__(self, client: "GraphQLClient", max_size: int = 50):
+        self.client = client
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[Dict[str, Any], Future]] = []
+
+    def add(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Future:
+        """Queue an operation and return a Future for its result"""
+        future: Future = Future()
+        with self._lock:
+            self._pending.append(
+                ({"query": query, "variables": variables or {}}, future)
+            )
+            full = len(self._pending) >= self.max_size
+        if full:
+            self.flush()
+        return future
+
+    def flush(self):
+        """Send all queued operations and resolve their futures"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        results = self.client._execute_batch([payload for payload, _ in pending])
+        for (_, future), result in zip(pending, results):
+            future.set_result(result)
+
+    def cancel(self):
+        """Drop queued operations without sending them"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for _, future in pending:
+            future.cancel()
+
+
+class _WindowedBatch(QueryBatch):
+    """QueryBatch that flushes itself `interval` seconds after the first add"""
+
+    def __init__(self, client: "GraphQLClient", interval: float, max_size: int = 50):
+        super().__init__(client, max_size)
+        self.interval = interval
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Future:
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return super().add(query, variables)
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        super().flush()
 
 
 class GraphQLClient:
-    def __init__(self, base_url: str = "http://localhost:4010"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:4010",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        batch_window: Optional[float] = None,
+        batch_max_size: int = 50,
+        persisted_queries: bool = False,
+        persisted_query_registry: Optional[str] = None,
+        cache: bool = False,
+        cache_ttl: float = 60,
+        verbose: bool = True,
+    ):
         self.base_url = base_url
         self.graphql_url = f"{base_url}/graphql"
-        self.ws_url = f"ws://localhost:4010/graphql"
+        self.ws_url = f"{base_url.replace('http', 'ws', 1)}/graphql"
         self.token_file = ".token"
         self.token = self._load_token()
+        # Print GraphQL and request errors as they happen (off for load tests)
+        self.verbose = verbose
+        self.session = create_session(
+            pool_connections, pool_maxsize, max_retries, backoff_factor
+        )
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.batch_max_size = batch_max_size
+        # When set, concurrent query() calls within the window share one request
+        self._window_batch = (
+            _WindowedBatch(self, batch_window, batch_max_size) if batch_window else None
+        )
+        # Automatic persisted queries: send sha256 hashes instead of query text
+        self.persisted_queries = (
+            PersistedQueryCache(registry_file=persisted_query_registry)
+            if persisted_queries or persisted_query_registry
+            else None
+        )
+        # Opt-in normalized response cache, keyed by __typename:id
+        self.cache = NormalizedCache(ttl=cache_ttl) if cache else None
+
+    def close(self):
+        """Close pooled HTTP connections"""
+        if self._window_batch is not None:
+            self._window_batch.flush()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _load_token(self) -> Optional[str]:
         """Load JWT token from .token file"""
-        if os.path.exists(self.token_file):
-            with open(self.token_file, "r") as f:
-                return f.read().strip()
-        return None
+        return load_token(self.token_file)
 
     def _save_token(self, token: str):
         """Save JWT token to .token file"""
@@ -40,37 +195,174 @@ class GraphQLClient:
 
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for GraphQL requests"""
-        headers = {
-            "Content-Type": "application/json",
-        }
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        return headers
+        return request_headers(self.token)
+
+    def _report_errors(self, result: Dict[str, Any]):
+        """Print GraphQL errors contained in a result"""
+        if self.verbose:
+            print_errors(result)
 
     def query(
-        self, query: str, variables: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        retry: bool = False,
+    ) -> Dict[str, Any]:
+        """Execute a GraphQL query
+
+        With `retry`, timeouts and gateway errors are retried too; only pass
+        it for operations that are safe to repeat, not mutations.
+        """
+        if self.cache is None:
+            return self._send(query, variables, retry)
+
+        document = self.cache.prepare(query)
+        result = self.cache.read(document, variables)
+        if result is None:
+            result = self._send(document, variables, retry)
+            self.cache.write(document, variables, result)
+        return result
+
+    def _send(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        retry: bool = False,
     ) -> Dict[str, Any]:
-        """Execute a GraphQL query"""
-        payload = {"query": query, "variables": variables or {}}
+        """Send one operation to the server, batched if a window is set"""
+        if self._window_batch is not None:
+            return self._window_batch.add(query, variables).result()
 
+        if self.persisted_queries is not None:
+            result = self._persisted_query(query, variables, retry)
+        else:
+            result = self._post({"query": query, "variables": variables or {}}, retry)
+        self._report_errors(result)
+        return result
+
+    def _post(self, payload: Dict[str, Any], retry: bool = False) -> Dict[str, Any]:
+        """POST a single operation, turning transport failures into errors"""
+        request = dict(headers=self._get_headers(), json=payload, timeout=30)
         try:
-            response = requests.post(
-                self.graphql_url, headers=self._get_headers(), json=payload, timeout=30
-            )
+            if retry:
+                response = post_idempotent(
+                    self.session,
+                    self.graphql_url,
+                    self.max_retries,
+                    self.backoff_factor,
+                    **request,
+                )
+            else:
+                response = self.session.post(self.graphql_url, **request)
             response.raise_for_status()
-            result = response.json()
+            return response.json()
+
+        except requests.exceptions.RequestException as e:
+            if self.verbose:
+                print(f"{Fore.RED}❌ Request failed: {e}")
+            return {"errors": [{"message": str(e)}]}
+
+    def _persisted_query(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        retry: bool = False,
+    ) -> Dict[str, Any]:
+        """Send a query using the automatic persisted query protocol"""
+        cache = self.persisted_queries
+        payload = cache.build_payload(query, variables)
+        result = self._post(payload, retry)
 
-            if "errors" in result:
-                print(f"{Fore.RED}❌ GraphQL Errors:")
-                for error in result["errors"]:
-                    print(f"  {error.get('message', 'Unknown error')}")
-                return result
+        if "query" not in payload and is_persisted_query_not_found(result):
+            # The server lost the query (e.g. restarted): register it again
+            cache.discard(query)
+            payload = cache.build_payload(query, variables)
+            result = self._post(payload, retry)
 
-            return result
+        if "data" in result:
+            cache.add(query, payload["extensions"]["persistedQuery"]["sha256Hash"])
+        return result
 
+    def _post_batch(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several operations in one request and split the responses"""
+        try:
+            response = self.session.post(
+                self.graphql_url, headers=self._get_headers(), json=payloads, timeout=30
+            )
+            response.raise_for_status()
+            results = response.json()
         except requests.exceptions.RequestException as e:
-            print(f"{Fore.RED}❌ Request failed: {e}")
-            return {"errors": [{"message": str(e)}]}
+            if self.verbose:
+                print(f"{Fore.RED}❌ Batch request failed: {e}")
+            results = {"errors": [{"message": str(e)}]}
+
+        if not isinstance(results, list) or len(results) != len(payloads):
+            # Batching disabled on the server, or the whole request failed
+            if isinstance(results, dict) and "errors" in results:
+                error = results
+            else:
+                error = {"errors": [{"message": "Malformed batch response"}]}
+            results = [error] * len(payloads)
+        return results
+
+    def _execute_batch(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run a batch, using persisted queries for each operation if enabled"""
+        cache = self.persisted_queries
+        if cache is None:
+            results = self._post_batch(payloads)
+        else:
+            operations = [(p["query"], p["variables"]) for p in payloads]
+            payloads = [cache.build_payload(q, v) for q, v in operations]
+            results = self._post_batch(payloads)
+
+            # Re-send, with full text, any hashes the server did not recognise
+            missing = [
+                i
+                for i, result in enumerate(results)
+                if "query" not in payloads[i] and is_persisted_query_not_found(result)
+            ]
+            for i in missing:
+                cache.discard(operations[i][0])
+                payloads[i] = cache.build_payload(*operations[i])
+            if missing:
+                retried = self._post_batch([payloads[i] for i in missing])
+                for i, result in zip(missing, retried):
+                    results[i] = result
+
+            for (query, _), payload, result in zip(operations, payloads, results):
+                if "data" in result:
+                    sha256_hash = payload["extensions"]["persistedQuery"]["sha256Hash"]
+                    cache.add(query, sha256_hash)
+
+        for result in results:
+            self._report_errors(result)
+        return results
+
+    @contextmanager
+    def batch(self, max_size: Optional[int] = None) -> Iterator[QueryBatch]:
+        """Collect operations added in the block and send them together on exit
+
+        with client.batch() as batch:
+            futures = [batch.add(query, {"groupId": gid}) for gid in group_ids]
+        results = [future.result() for future in futures]
+        """
+        query_batch = QueryBatch(self, max_size or self.batch_max_size)
+        try:
+            yield query_batch
+        except BaseException:
+            query_batch.cancel()
+            raise
+        query_batch.flush()
+
+    def query_batch(
+        self, operations: Sequence[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Execute (query, variables) pairs in as few requests as possible"""
+        with self.batch() as query_batch:
+            futures = [
+                query_batch.add(query, variables) for query, variables in operations
+            ]
+        return [future.result() for future in futures]
 
     def mutation(
         self, mutation: str, variables: Optional[Dict[str, Any]] = None
@@ -78,6 +370,123 @@ class GraphQLClient:
         """Execute a GraphQL mutation"""
         return self.query(mutation, variables)
 
+    def iter_pages(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]],
+        field: str,
+        page_size: int = 100,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the items of a paginated list field
+
+        Each next page is requested with the last item's id as `after`;
+        with `prefetch` it is fetched while the caller handles the current
+        page. Pages are fetched with `retry`, so `query` must not be a
+        mutation. `page_size` is capped at MAX_PAGE_SIZE. GraphQL errors
+        raise RuntimeError, including the server's error for an `after`
+        item deleted while iterating.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        variables = dict(variables or {}, limit=page_size)
+
+        def fetch(after: Optional[str]) -> List[Dict[str, Any]]:
+            result = self.query(query, dict(variables, after=after), retry=True)
+            if result.get("errors"):
+                raise RuntimeError(
+                    "; ".join(error.get("message", "") for error in result["errors"])
+                )
+            return result["data"][field]
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = fetch(None)
+            while page:
+                last_page = len(page) < page_size
+                next_page = None
+                if executor and not last_page:
+                    next_page = executor.submit(fetch, page[-1]["id"])
+                yield from page
+                if last_page:
+                    break
+                page = next_page.result() if next_page else fetch(page[-1]["id"])
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_list(
+        self,
+        field: str,
+        variables: Dict[str, Any],
+        page_size: int,
+        query: Optional[str] = None,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        return self.iter_pages(
+            query or PAGE_QUERIES[field], variables, field, page_size, prefetch
+        )
+
+    def iter_groups(self, page_size: int = 100, **kwargs) -> Iterator[Dict[str, Any]]:
+        """All groups, oldest first"""
+        return self._iter_list("groups", {}, page_size, **kwargs)
+
+    def iter_events(
+        self, group_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """A group's events, soonest first"""
+        return self._iter_list("events", {"groupId": group_id}, page_size, **kwargs)
+
+    def iter_messages(
+        self, group_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """A group's messages, newest first"""
+        return self._iter_list("messages", {"groupId": group_id}, page_size, **kwargs)
+
+    def iter_group_expenses(
+        self, group_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """A group's expenses, newest first"""
+        return self._iter_list(
+            "groupExpenses", {"groupId": group_id}, page_size, **kwargs
+        )
+
+    def iter_user_expenses(
+        self, user_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """Expenses paid by a user, newest first"""
+        return self._iter_list("userExpenses", {"userId": user_id}, page_size, **kwargs)
+
+    def iter_group_settlements(
+        self, group_id: str, page_size: int = 100, **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """A group's settlements, newest first"""
+        return self._iter_list(
+            "groupSettlements", {"groupId": group_id}, page_size, **kwargs
+        )
+
+    def subscriptions(self, **kwargs) -> "SubscriptionManager":
+        """Create a manager that multiplexes subscriptions over one websocket"""
+        # asyncio and websockets load only once subscriptions are used
+        from subscriptions import SubscriptionManager
+
+        return SubscriptionManager(self.ws_url, self.token, **kwargs)
+
+    async def stream(
+        self,
+        subscription: str,
+        variables: Optional[Dict[str, Any]] = None,
+        max_queue: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield subscription payloads as they arrive, without printing them
+
+        At most `max_queue` payloads are buffered; beyond that the socket
+        is not read until the caller catches up.
+        """
+        async with self.subscriptions(max_queue=max_queue) as manager:
+            async with await manager.subscribe(subscription, variables) as messages:
+                async for payload in messages:
+                    yield payload
+
     async def subscription(
         self,
         subscription: str,
@@ -86,49 +495,34 @@ class GraphQLClient:
         duration: int = 10,
     ):
         """Execute a GraphQL subscription"""
-        payload = {"query": subscription, "variables": variables or {}}
+        import asyncio
 
-        try:
-            async with websockets.connect(self.ws_url) as websocket:
-                # Send connection init
-                await websocket.send(
-                    json.dumps({"type": "connection_init", "payload": {}})
-                )
+        from subscriptions import SubscriptionError
 
-                # Wait for connection ack
-                response = await websocket.recv()
+        try:
+            async with self.subscriptions() as manager:
                 print(f"{Fore.BLUE}🔌 WebSocket connected")
-
-                # Send subscription
-                await websocket.send(
-                    json.dumps({"id": "1", "type": "start", "payload": payload})
-                )
-
                 print(
                     f"{Fore.YELLOW}📡 Listening for subscription messages for {duration} seconds..."
                 )
 
-                # Listen for messages
-                start_time = asyncio.get_event_loop().time()
-                while (asyncio.get_event_loop().time() - start_time) < duration:
-                    try:
-                        message = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                        data = json.loads(message)
-
-                        if data.get("type") == "data":
+                async def listen():
+                    async with await manager.subscribe(
+                        subscription, variables
+                    ) as messages:
+                        async for payload in messages:
                             print(f"{Fore.GREEN}📨 Subscription message received:")
-                            print(json.dumps(data.get("payload", {}), indent=2))
+                            print(json.dumps(payload, indent=2))
                             if callback:
-                                callback(data.get("payload", {}))
-                        elif data.get("type") == "error":
-                            print(f"{Fore.RED}❌ Subscription error: {data}")
-
-                    except asyncio.TimeoutError:
-                        continue
+                                callback(payload)
 
-                # Close subscription
-                await websocket.send(json.dumps({"id": "1", "type": "stop"}))
+                try:
+                    await asyncio.wait_for(listen(), timeout=duration)
+                except asyncio.TimeoutError:
+                    pass
 
+        except SubscriptionError as e:
+            print(f"{Fore.RED}❌ Subscription error: {e.errors}")
         except Exception as e:
             print(f"{Fore.RED}❌ Subscription failed: {e}")
 
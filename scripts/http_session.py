@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP sessions shared by the Python clients (graphql_client.py here
+and client/scripts/club_api.py)
+"""
+
+import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Gateway errors: the request did not reach the application
+RETRY_STATUSES = (502, 503, 504)
+
+
+def create_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    max_retries: int = 3,
+    backoff_factor: float = 0.3,
+) -> requests.Session:
+    """Create a requests session with a keep-alive connection pool and retries
+
+    Failed connections are retried for every method, since nothing was sent.
+    Read errors and gateway errors are retried only for idempotent methods:
+    a POST may be a login, mutation or upload the server already applied.
+    Use post_idempotent for POSTs that are safe to repeat.
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post_idempotent(
+    session: requests.Session,
+    url: str,
+    max_retries: int = 3,
+    backoff_factor: float = 0.3,
+    **kwargs: Any,
+) -> requests.Response:
+    """POST a request that is safe to repeat, such as a GraphQL query
+
+    Retries dropped connections, timeouts and gateway errors with the same
+    exponential backoff the session uses for GET. `kwargs` go to session.post
+    and must not include a streamed body, which cannot be sent twice.
+    """
+    for attempt in range(max_retries):
+        try:
+            response = session.post(url, **kwargs)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            response.close()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            pass
+        time.sleep(backoff_factor * 2**attempt)
+    return session.post(url, **kwargs)
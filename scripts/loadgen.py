@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Load generator for the clubs GraphQL API
+
+Replays a weighted mix of operations either at a fixed request rate (open
+loop, --rps) or with a fixed number of concurrent workers (closed loop,
+--concurrency), ramping up linearly over --ramp-up seconds, and reports
+latency percentiles, error rate and throughput per operation.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from colorama import Fore, Style
+from console import init_colors
+from graphql_client import GraphQLClient
+from stats import percentile
+
+# Initialize colorama for colored output
+init_colors()
+
+
+class Operation(NamedTuple):
+    query: str
+    requires: str  # context key the operation needs: group, event or league
+    variables: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "messages": Operation(
+        """
+        query Messages($groupId: ID!) {
+            messages(groupId: $groupId, limit: 50) {
+                id
+                content
+                createdAt
+                user {
+                    id
+                    username
+                }
+            }
+        }
+        """,
+        "group",
+        lambda ctx: {"groupId": ctx["group"]},
+    ),
+    "sendMessage": Operation(
+        """
+        mutation SendMessage($input: SendMessageInput!) {
+            sendMessage(input: $input) {
+                id
+            }
+        }
+        """,
+        "group",
+        lambda ctx: {
+            "input": {
+                "groupId": ctx["group"],
+                "content": f"loadgen message {random.randint(0, 10**9)}",
+            }
+        },
+    ),
+    "groupDebtSummary": Operation(
+        """
+        query GroupDebtSummary($groupId: ID!) {
+            groupDebtSummary(groupId: $groupId) {
+                user {
+                    id
+                }
+                totalOwed
+                totalOwedTo
+                netAmount
+            }
+        }
+        """,
+        "group",
+        lambda ctx: {"groupId": ctx["group"]},
+    ),
+    "tennisLeagueStandings": Operation(
+        """
+        query TennisLeagueStandings($id: ID!) {
+            tennisLeagueStandings(id: $id) {
+                teamId
+                teamName
+                matchesPlayed
+                wins
+                losses
+                points
+            }
+        }
+        """,
+        "league",
+        lambda ctx: {"id": ctx["league"]},
+    ),
+    "createRSVP": Operation(
+        """
+        mutation CreateRSVP($input: CreateRSVPInput!) {
+            createRSVP(input: $input) {
+                id
+                status
+            }
+        }
+        """,
+        "event",
+        lambda ctx: {
+            "input": {
+                "eventId": ctx["event"],
+                "status": random.choice(["AVAILABLE", "MAYBE", "NOT_AVAILABLE"]),
+            }
+        },
+    ),
+}
+
+DEFAULT_MIX = "messages=40,sendMessage=10,groupDebtSummary=20,tennisLeagueStandings=20,createRSVP=10"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse "name=weight,..." into a weight per operation"""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation '{name}' (choose from {', '.join(OPERATIONS)})"
+            )
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def discover_context(client: GraphQLClient, args) -> Dict[str, Any]:
+    """Fill in group/event/league ids not given on the command line"""
+    ctx = {"group": args.group_id, "event": args.event_id, "league": args.league_id}
+
+    if not ctx["group"]:
+        groups = client.query("query { myGroups { id name } }").get("data") or {}
+        if groups.get("myGroups"):
+            ctx["group"] = groups["myGroups"][0]["id"]
+    if not ctx["event"] and ctx["group"]:
+        events = (
+            client.query(
+                "query Events($groupId: ID!) { events(groupId: $groupId) { id } }",
+                {"groupId": ctx["group"]},
+            ).get("data")
+            or {}
+        )
+        if events.get("events"):
+            ctx["event"] = events["events"][0]["id"]
+    if not ctx["league"]:
+        leagues = client.query("query { userTennisLeagues { id } }").get("data") or {}
+        if leagues.get("userTennisLeagues"):
+            ctx["league"] = leagues["userTennisLeagues"][0]["id"]
+    return ctx
+
+
+class Stats:
+    """Thread-safe latency and error recorder, one bucket per operation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, name: str, latency: float, ok: bool):
+        with self._lock:
+            self.latencies.setdefault(name, []).append(latency)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        """Per-operation count, error rate, throughput and percentiles (ms)"""
+        with self._lock:
+            buckets = dict(self.latencies)
+            buckets["TOTAL"] = [x for values in self.latencies.values() for x in values]
+            errors = dict(self.errors)
+            errors["TOTAL"] = sum(self.errors.values())
+
+        summary = {}
+        for name, latencies in buckets.items():
+            if not latencies:
+                continue
+            latencies = sorted(latencies)
+            summary[name] = {
+                "count": len(latencies),
+                "errors": errors.get(name, 0),
+                "error_rate": errors.get(name, 0) / len(latencies),
+                "throughput": len(latencies) / elapsed if elapsed else 0.0,
+                "p50": percentile(latencies, 50) * 1000,
+                "p95": percentile(latencies, 95) * 1000,
+                "p99": percentile(latencies, 99) * 1000,
+                "max": latencies[-1] * 1000,
+            }
+        return summary
+
+
+class LoadGenerator:
+    def __init__(
+        self,
+        client: GraphQLClient,
+        weights: Dict[str, float],
+        ctx: Dict[str, Any],
+        duration: float,
+        ramp_up: float = 0,
+    ):
+        self.client = client
+        self.names = list(weights)
+        self.weights = [weights[name] for name in self.names]
+        self.ctx = ctx
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.stats = Stats()
+
+    def execute(self, name: str, scheduled: Optional[float] = None):
+        """Run one operation and record its latency
+
+        In open-loop mode latency is measured from the scheduled send time,
+        so queueing inside the generator counts against the server.
+        """
+        operation = OPERATIONS[name]
+        start = scheduled if scheduled is not None else time.perf_counter()
+        result = self.client.query(operation.query, operation.variables(self.ctx))
+        self.stats.record(name, time.perf_counter() - start, "errors" not in result)
+
+    def pick(self) -> str:
+        return random.choices(self.names, self.weights)[0]
+
+    def run_rps(self, rps: float, max_workers: int) -> float:
+        """Open loop: issue requests at `rps`, ramping up from zero"""
+        start = time.perf_counter()
+        end = start + self.duration
+        next_send = start
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                now = time.perf_counter()
+                if now >= end:
+                    break
+                if now < next_send:
+                    time.sleep(min(next_send - now, end - now))
+                    continue
+                executor.submit(self.execute, self.pick(), next_send)
+                elapsed = next_send - start
+                ramp = min(1.0, elapsed / self.ramp_up) if self.ramp_up else 1.0
+                # Never drop below 1 req/s while ramping so the loop keeps moving
+                next_send += 1.0 / max(rps * ramp, 1.0)
+        return time.perf_counter() - start
+
+    def run_concurrency(self, concurrency: int) -> float:
+        """Closed loop: `concurrency` workers, started evenly over the ramp-up"""
+        start = time.perf_counter()
+        end = start + self.duration
+
+        def worker(index: int):
+            time.sleep(self.ramp_up * index / concurrency)
+            while time.perf_counter() < end:
+                self.execute(self.pick())
+
+        threads = [
+            threading.Thread(target=worker, args=(i,), daemon=True)
+            for i in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+
+def print_summary(summary: Dict[str, Dict[str, float]], elapsed: float):
+    print(f"\n{Fore.CYAN}📊 Load test results ({elapsed:.1f}s)")
+    print(f"{Fore.CYAN}{'='*96}")
+    header = f"{'operation':<24}{'count':>8}{'errors':>8}{'err%':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(f"{Style.BRIGHT}{header}")
+    for name, row in summary.items():
+        color = Fore.RED if row["errors"] else Fore.GREEN
+        print(
+            f"{color}{name:<24}{row['count']:>8}{row['errors']:>8}"
+            f"{row['error_rate'] * 100:>6.1f}%{row['throughput']:>9.1f}"
+            f"{row['p50']:>10.1f}{row['p95']:>10.1f}{row['p99']:>10.1f}{row['max']:>10.1f}"
+        )
+    print(f"{Fore.CYAN}{'='*96}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the GraphQL API")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--rps", type=float, help="Target requests per second")
+    mode.add_argument("--concurrency", "-c", type=int, help="Concurrent workers")
+    parser.add_argument(
+        "--duration", "-d", type=float, default=60, help="Seconds to run (default: 60)"
+    )
+    parser.add_argument(
+        "--ramp-up", type=float, default=0, help="Seconds to reach full load"
+    )
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"Weighted operations, name=weight,... (default: {DEFAULT_MIX})",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=200,
+        help="Thread cap for in-flight requests in --rps mode (default: 200)",
+    )
+    parser.add_argument("--base-url", default="http://localhost:4010")
+    parser.add_argument(
+        "--group-id", help="Group to target (default: first of myGroups)"
+    )
+    parser.add_argument(
+        "--event-id", help="Event for createRSVP (default: first in group)"
+    )
+    parser.add_argument("--league-id", help="League for standings (default: first)")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}🏋️  Clubs GraphQL Load Generator")
+    print(f"{Fore.CYAN}{'='*50}")
+
+    try:
+        weights = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"{Fore.RED}❌ {e}")
+        return 1
+
+    pool_size = args.concurrency or args.max_workers
+    # No retries: a retried request would hide failures and skew latencies
+    client = GraphQLClient(
+        args.base_url,
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=0,
+        verbose=False,
+    )
+    if not client.token:
+        print(f"{Fore.RED}❌ Not authenticated. Please run login first.")
+        return 1
+
+    ctx = discover_context(client, args)
+    for name in list(weights):
+        if not ctx.get(OPERATIONS[name].requires):
+            print(
+                f"{Fore.YELLOW}⚠️  Skipping {name}: no {OPERATIONS[name].requires} id available"
+            )
+            del weights[name]
+    if not weights:
+        print(f"{Fore.RED}❌ No runnable operations in the mix")
+        return 1
+
+    print(f"{Fore.BLUE}🎯 Mix: {', '.join(f'{k}={v:g}' for k, v in weights.items())}")
+    if args.rps:
+        print(f"{Fore.BLUE}🚦 Target: {args.rps:g} req/s for {args.duration:g}s")
+    else:
+        print(
+            f"{Fore.BLUE}🚦 Target: {args.concurrency} workers for {args.duration:g}s"
+        )
+    if args.ramp_up:
+        print(f"{Fore.BLUE}📈 Ramp-up: {args.ramp_up:g}s")
+
+    generator = LoadGenerator(client, weights, ctx, args.duration, args.ramp_up)
+    started = time.perf_counter()
+    try:
+        if args.rps:
+            elapsed = generator.run_rps(args.rps, args.max_workers)
+        else:
+            elapsed = generator.run_concurrency(args.concurrency)
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}⚠️  Interrupted, reporting partial results")
+        elapsed = time.perf_counter() - started
+    finally:
+        client.close()
+
+    summary = generator.stats.summary(elapsed)
+    print_summary(summary, elapsed)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {"elapsed": elapsed, "context": ctx, "operations": summary}, f, indent=2
+            )
+        print(f"{Fore.BLUE}📝 Results written to {args.json}")
+
+    total = summary.get("TOTAL")
+    return 0 if total and total["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
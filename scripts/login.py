@@ -165,9 +165,9 @@ def logout():
         print(f"{Fore.YELLOW}ℹ️  No token found to remove")
 
 
-def check_auth():
+def check_auth(client=None):
     """Check if user is authenticated"""
-    client = GraphQLClient()
+    client = client or GraphQLClient()
 
     if not client.token:
         print(f"{Fore.RED}❌ Not authenticated. Please run login first.")
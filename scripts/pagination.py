@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Cursor pagination shared by the Python clients (graphql_client.py here and
+client/scripts/club_api.py), mirroring server/src/utils/pagination.ts
+"""
+
+# Largest page the server returns (MAX_PAGE_SIZE in server/src/utils/pagination.ts)
+MAX_PAGE_SIZE = 500
+
+# Default documents for the list iterators (iter_messages etc.); each takes
+# $limit and $after, and callers needing other fields pass their own `query`
+PAGE_QUERIES = {
+    "groups": """
+        query GroupsPage($limit: Int, $after: ID) {
+            groups(limit: $limit, after: $after) { id name description isPublic createdAt }
+        }
+    """,
+    "events": """
+        query EventsPage($groupId: ID!, $limit: Int, $after: ID) {
+            events(groupId: $groupId, limit: $limit, after: $after) {
+                id date description createdBy { id username }
+            }
+        }
+    """,
+    "messages": """
+        query MessagesPage($groupId: ID!, $limit: Int, $after: ID) {
+            messages(groupId: $groupId, limit: $limit, after: $after) {
+                id content createdAt user { id username }
+            }
+        }
+    """,
+    "groupExpenses": """
+        query GroupExpensesPage($groupId: ID!, $limit: Int, $after: ID) {
+            groupExpenses(groupId: $groupId, limit: $limit, after: $after) {
+                id description amount currency category date paidBy { id username }
+            }
+        }
+    """,
+    "userExpenses": """
+        query UserExpensesPage($userId: ID!, $limit: Int, $after: ID) {
+            userExpenses(userId: $userId, limit: $limit, after: $after) {
+                id description amount currency category date group { id name }
+            }
+        }
+    """,
+    "groupSettlements": """
+        query GroupSettlementsPage($groupId: ID!, $limit: Int, $after: ID) {
+            groupSettlements(groupId: $groupId, limit: $limit, after: $after) {
+                id amount currency status createdAt
+                fromUser { id username }
+                toUser { id username }
+            }
+        }
+    """,
+}
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Automatic persisted query (APQ) support for the GraphQL clients
+
+Apollo Server keeps a cache of query documents keyed by their sha256 hash.
+Once the server has seen a query, clients can send only the hash instead of
+the full text. This module remembers which queries the server already knows.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+PERSISTED_QUERY_VERSION = 1
+
+
+def query_hash(query: str) -> str:
+    """sha256 hex digest of a query document, as APQ expects"""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def is_persisted_query_not_found(result: Dict[str, Any]) -> bool:
+    """Check whether the server rejected a hash it does not know"""
+    for error in result.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code")
+        if (
+            error.get("message") == "PersistedQueryNotFound"
+            or code == "PERSISTED_QUERY_NOT_FOUND"
+        ):
+            return True
+    return False
+
+
+class PersistedQueryCache:
+    """LRU of queries known to be registered on the server
+
+    Maps query text to its hash so hot queries are neither re-hashed nor
+    re-sent. With `registry_file` set, known hashes are also kept on disk
+    and shared between script runs. Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = 256, registry_file: Optional[str] = None):
+        self.maxsize = maxsize
+        self.registry_file = registry_file
+        self._queries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_registry()
+
+    def _load_registry(self):
+        """Load hash -> query entries saved by earlier runs"""
+        if not self.registry_file or not os.path.exists(self.registry_file):
+            return
+        try:
+            with open(self.registry_file, "r") as f:
+                registry = json.load(f)
+        except (OSError, ValueError):
+            return
+        for sha256_hash, query in list(registry.items())[-self.maxsize :]:
+            self._queries[query] = sha256_hash
+
+    def _save_registry(self):
+        """Write known hashes to the registry file"""
+        if not self.registry_file:
+            return
+        registry = {sha256_hash: query for query, sha256_hash in self._queries.items()}
+        tmp_file = f"{self.registry_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(registry, f)
+        os.replace(tmp_file, self.registry_file)
+
+    def get(self, query: str) -> Optional[str]:
+        """Return the hash of a registered query, or None"""
+        with self._lock:
+            sha256_hash = self._queries.get(query)
+            if sha256_hash is not None:
+                self._queries.move_to_end(query)
+            return sha256_hash
+
+    def add(self, query: str, sha256_hash: Optional[str] = None):
+        """Record that the server now knows this query"""
+        with self._lock:
+            if query in self._queries:
+                self._queries.move_to_end(query)
+                return
+            self._queries[query] = sha256_hash or query_hash(query)
+            while len(self._queries) > self.maxsize:
+                self._queries.popitem(last=False)
+            self._save_registry()
+
+    def discard(self, query: str):
+        """Forget a query, e.g. after the server evicted it"""
+        with self._lock:
+            if self._queries.pop(query, None) is not None:
+                self._save_registry()
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def build_payload(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        known_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Hash-only payload for known queries, hash plus text otherwise
+
+        `known_hash` is the query's precomputed hash, if the caller has one.
+        """
+        sha256_hash = self.get(query)
+        payload: Dict[str, Any] = {"variables": variables or {}}
+        if sha256_hash is None:
+            sha256_hash = known_hash or query_hash(query)
+            payload["query"] = query
+        payload["extensions"] = {
+            "persistedQuery": {
+                "version": PERSISTED_QUERY_VERSION,
+                "sha256Hash": sha256_hash,
+            }
+        }
+        return payload
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Client-side normalized response cache for GraphQLClient
+
+Objects carrying `__typename` and `id` are stored once under
+`__typename:id`, and cached query results hold references to them, so an
+entity updated by one response is seen by every cached query that uses it.
+Fields are stored under their name and arguments, e.g.
+`messages({"limit": 2})`, so the same field read with other arguments is a
+separate entry. Mutations write their results into the store and evict
+cached queries whose root fields they can change.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Query root fields each mutation can change. Entities returned by a
+# mutation are updated in place; this map covers list membership and
+# derived data (debts, standings) that the returned entity cannot fix up.
+GROUP_FIELDS = {"groups", "group", "myGroups", "publicGroups"}
+EVENT_FIELDS = {"events", "event", "userPendingEvents"}
+EXPENSE_FIELDS = {
+    "groupExpenses",
+    "expense",
+    "userExpenses",
+    "groupDebtSummary",
+    "userDebtSummary",
+    "optimalSettlements",
+}
+SETTLEMENT_FIELDS = {
+    "groupSettlements",
+    "userSettlements",
+    "groupDebtSummary",
+    "userDebtSummary",
+    "optimalSettlements",
+}
+TENNIS_FIELDS = {
+    "tennisLeagues",
+    "tennisLeague",
+    "tennisLeagueStandings",
+    "userTennisLeagues",
+    "teamMatch",
+    "lineup",
+}
+
+MUTATION_INVALIDATES: Dict[str, Set[str]] = {
+    "createGroup": GROUP_FIELDS,
+    "updateGroup": GROUP_FIELDS,
+    "joinGroup": GROUP_FIELDS,
+    "leaveGroup": GROUP_FIELDS,
+    "deleteGroup": GROUP_FIELDS,
+    "addMember": GROUP_FIELDS,
+    "addMemberByUsername": GROUP_FIELDS,
+    "addMemberByEmail": GROUP_FIELDS,
+    "removeMember": GROUP_FIELDS,
+    "makeAdmin": GROUP_FIELDS,
+    "removeAdmin": GROUP_FIELDS,
+    "blockUser": GROUP_FIELDS,
+    "unblockUser": GROUP_FIELDS,
+    "createEvent": EVENT_FIELDS | {"group"},
+    "updateEvent": EVENT_FIELDS,
+    "deleteEvent": EVENT_FIELDS | {"group"},
+    "createRSVP": EVENT_FIELDS,
+    "updateRSVP": EVENT_FIELDS,
+    "deleteRSVP": EVENT_FIELDS,
+    "sendMessage": {"messages"},
+    "updateProfile": {"me", "user", "userSearch"},
+    "changePassword": set(),
+    "createExpense": EXPENSE_FIELDS,
+    "updateExpense": EXPENSE_FIELDS,
+    "deleteExpense": EXPENSE_FIELDS,
+    "createSettlement": SETTLEMENT_FIELDS,
+    "updateSettlement": SETTLEMENT_FIELDS,
+    "markSettlementPaid": SETTLEMENT_FIELDS,
+    "deleteSettlement": SETTLEMENT_FIELDS,
+    "generateOptimalSettlements": SETTLEMENT_FIELDS,
+    "bulkCreateSettlements": SETTLEMENT_FIELDS,
+    "updateGroupSettings": {"groupSettings"},
+}
+for _name in (
+    "createTennisLeague",
+    "updateTennisLeague",
+    "deleteTennisLeague",
+    "createTennisTeam",
+    "updateTennisTeam",
+    "deleteTennisTeam",
+    "createTeamMatch",
+    "updateTeamMatch",
+    "deleteTeamMatch",
+    "createIndividualSinglesMatch",
+    "updateIndividualSinglesMatch",
+    "deleteIndividualSinglesMatch",
+    "createIndividualDoublesMatch",
+    "updateIndividualDoublesMatch",
+    "deleteIndividualDoublesMatch",
+    "updatePointSystem",
+    "createTeamLeaguePointSystem",
+    "updateTeamLeaguePointSystem",
+    "deleteTeamLeaguePointSystem",
+    "createOrUpdateLineup",
+    "publishLineup",
+):
+    MUTATION_INVALIDATES[_name] = TENNIS_FIELDS
+
+
+def add_typename(query: str) -> str:
+    """Add `__typename` to every selection set so objects can be normalized
+
+    Operation root selection sets, and braces inside arguments (input
+    object literals), strings and comments are left alone.
+    """
+    out = []
+    depth = 0
+    braces = 0
+    definition_start = 0
+    i = 0
+    while i < len(query):
+        char = query[i]
+        if query.startswith('"""', i):
+            end = query.find('"""', i + 3)
+            end = len(query) if end == -1 else end + 3
+            out.append(query[i:end])
+            i = end
+            continue
+        if char == '"':
+            end = i + 1
+            while end < len(query) and query[end] != '"':
+                end += 2 if query[end] == "\\" else 1
+            out.append(query[i : end + 1])
+            i = end + 1
+            continue
+        if char == "#":
+            end = query.find("\n", i)
+            end = len(query) if end == -1 else end
+            out.append(query[i:end])
+            i = end
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        out.append(char)
+        if char == "{" and depth == 0:
+            definition = query[definition_start:i].strip()
+            if braces > 0 or definition.startswith("fragment"):
+                out.append(" __typename")
+            braces += 1
+        elif char == "}" and depth == 0:
+            braces -= 1
+            if braces == 0:
+                definition_start = i + 1
+        i += 1
+    return "".join(out)
+
+
+@lru_cache(maxsize=512)
+def parse_operation(query: str) -> Tuple[Any, Dict[str, Any]]:
+    """Parse a document into its operation and fragments by name
+
+    The operation is None when the document does not parse or has no
+    operation. graphql-core loads on first use, keeping client startup fast.
+    """
+    from graphql import (
+        FragmentDefinitionNode,
+        GraphQLSyntaxError,
+        OperationDefinitionNode,
+        parse,
+    )
+
+    try:
+        document = parse(query, no_location=True)
+    except GraphQLSyntaxError:
+        return None, {}
+    operations = [
+        definition
+        for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+    ]
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    return (operations[0] if operations else None), fragments
+
+
+def is_mutation(query: str) -> bool:
+    """Check whether a document's operation is a mutation"""
+    from graphql import OperationType
+
+    operation, _ = parse_operation(query)
+    return operation is not None and operation.operation == OperationType.MUTATION
+
+
+def _included(node, variables: Dict[str, Any]) -> bool:
+    """Apply @skip(if:) and @include(if:) to a selection"""
+    from graphql.utilities import value_from_ast_untyped
+
+    for directive in node.directives or ():
+        name = directive.name.value
+        if name not in ("skip", "include"):
+            continue
+        condition = next(
+            (
+                value_from_ast_untyped(argument.value, variables)
+                for argument in directive.arguments
+                if argument.name.value == "if"
+            ),
+            None,
+        )
+        if bool(condition) == (name == "skip"):
+            return False
+    return True
+
+
+def collect_fields(
+    selection_set, fragments: Dict[str, Any], variables: Dict[str, Any]
+) -> List[Tuple[Any, Optional[str]]]:
+    """Flatten a selection set's fields, each with the fragment type it is under"""
+    from graphql import FieldNode, FragmentSpreadNode
+
+    fields = []
+    for selection in selection_set.selections:
+        if not _included(selection, variables):
+            continue
+        if isinstance(selection, FieldNode):
+            fields.append((selection, None))
+            continue
+        if isinstance(selection, FragmentSpreadNode):
+            selection = fragments.get(selection.name.value)
+            if selection is None:
+                continue
+        condition = (
+            selection.type_condition.name.value if selection.type_condition else None
+        )
+        fields.extend(
+            (field, field_condition or condition)
+            for field, field_condition in collect_fields(
+                selection.selection_set, fragments, variables
+            )
+        )
+    return fields
+
+
+def field_key(field, variables: Dict[str, Any]) -> str:
+    """Storage key of a field: its name, plus its arguments when it has any"""
+    from graphql.utilities import value_from_ast_untyped
+
+    if not field.arguments:
+        return field.name.value
+    arguments = {
+        argument.name.value: value_from_ast_untyped(argument.value, variables)
+        for argument in field.arguments
+    }
+    return f"{field.name.value}({json.dumps(arguments, sort_keys=True, default=str)})"
+
+
+def _response_key(field) -> str:
+    return field.alias.value if field.alias else field.name.value
+
+
+def _merge(old: Any, new: Any) -> Any:
+    """Merge objects that are not entity references; anything else is replaced"""
+    if (
+        isinstance(old, dict)
+        and isinstance(new, dict)
+        and "__ref" not in old
+        and "__ref" not in new
+    ):
+        merged = dict(old)
+        for key, value in new.items():
+            merged[key] = _merge(old[key], value) if key in old else value
+        return merged
+    return new
+
+
+class NormalizedCache:
+    """TTL + LRU cache of normalized GraphQL responses"""
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        max_entities: int = 10000,
+        max_queries: int = 1000,
+    ):
+        self.ttl = ttl
+        self.max_entities = max_entities
+        self.max_queries = max_queries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        # "Type:id" -> (fields, expires_at)
+        self._entities: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        # (query, variables) -> (normalized data, root fields, expires_at)
+        self._queries: "OrderedDict[Tuple[str, str], Tuple[Any, Set[str], float]]" = (
+            OrderedDict()
+        )
+        self._documents: Dict[str, str] = {}
+
+    @staticmethod
+    def _query_key(query: str, variables: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        return query, json.dumps(variables or {}, sort_keys=True, default=str)
+
+    def prepare(self, query: str) -> str:
+        """Return the document with `__typename` added, memoized per query"""
+        document = self._documents.get(query)
+        if document is None:
+            document = self._documents[query] = add_typename(query)
+        return document
+
+    def _normalize(
+        self,
+        value: Any,
+        selection_set,
+        fragments: Dict[str, Any],
+        variables: Dict[str, Any],
+        expires_at: float,
+    ) -> Any:
+        """Replace identifiable objects with references into the entity store
+
+        Fields are stored under their storage keys (name and arguments)
+        rather than their response keys (alias or name).
+        """
+        if isinstance(value, list):
+            return [
+                self._normalize(item, selection_set, fragments, variables, expires_at)
+                for item in value
+            ]
+        if not isinstance(value, dict) or selection_set is None:
+            return value
+
+        fields: Dict[str, Any] = {}
+        for field, _ in collect_fields(selection_set, fragments, variables):
+            response_key = _response_key(field)
+            if response_key not in value:
+                continue
+            key = field_key(field, variables)
+            item = self._normalize(
+                value[response_key],
+                field.selection_set,
+                fragments,
+                variables,
+                expires_at,
+            )
+            fields[key] = _merge(fields[key], item) if key in fields else item
+        if "__typename" not in value or value.get("id") is None:
+            return fields
+
+        entity_key = f"{value['__typename']}:{value['id']}"
+        entity = self._entities.pop(entity_key, None)
+        if entity is not None:
+            fields = _merge(entity[0], fields)
+        self._entities[entity_key] = (fields, expires_at)
+        while len(self._entities) > self.max_entities:
+            self._entities.popitem(last=False)
+        return {"__ref": entity_key}
+
+    def _resolve(
+        self,
+        value: Any,
+        selection_set,
+        fragments: Dict[str, Any],
+        variables: Dict[str, Any],
+        now: float,
+    ) -> Any:
+        """Inverse of _normalize; raises KeyError for missing or stale data"""
+        if isinstance(value, list):
+            return [
+                self._resolve(item, selection_set, fragments, variables, now)
+                for item in value
+            ]
+        if not isinstance(value, dict) or selection_set is None:
+            return value
+        if "__ref" in value:
+            fields, expires_at = self._entities[value["__ref"]]
+            if expires_at < now:
+                del self._entities[value["__ref"]]
+                raise KeyError(value["__ref"])
+            self._entities.move_to_end(value["__ref"])
+            value = fields
+
+        result: Dict[str, Any] = {}
+        for field, condition in collect_fields(selection_set, fragments, variables):
+            key = field_key(field, variables)
+            if key not in value:
+                # Fields of a fragment on another type are absent, not missing
+                if condition is not None and condition != value.get("__typename"):
+                    continue
+                raise KeyError(key)
+            response_key = _response_key(field)
+            item = self._resolve(
+                value[key], field.selection_set, fragments, variables, now
+            )
+            result[response_key] = (
+                _merge(result[response_key], item) if response_key in result else item
+            )
+        return result
+
+    @staticmethod
+    def _root_fields(operation, fragments, variables) -> Set[str]:
+        return {
+            field.name.value
+            for field, _ in collect_fields(
+                operation.selection_set, fragments, variables
+            )
+        }
+
+    def read(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return a cached result for a prepared query, or None"""
+        from graphql import OperationType
+
+        operation, fragments = parse_operation(query)
+        if operation is None or operation.operation != OperationType.QUERY:
+            return None  # only queries are served from the cache
+        key = self._query_key(query, variables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._queries.get(key)
+            if entry is not None and entry[2] >= now:
+                try:
+                    data = self._resolve(
+                        entry[0],
+                        operation.selection_set,
+                        fragments,
+                        variables or {},
+                        now,
+                    )
+                except KeyError:
+                    data = None
+                if data is not None:
+                    self._queries.move_to_end(key)
+                    self.hits += 1
+                    return {"data": data}
+            self._queries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def write(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]],
+        result: Dict[str, Any],
+    ):
+        """Store a query result, or apply a mutation result and invalidate"""
+        from graphql import OperationType
+
+        data = result.get("data")
+        operation, fragments = parse_operation(query)
+        if not isinstance(data, dict) or operation is None:
+            return
+        variables = variables or {}
+        root_fields = self._root_fields(operation, fragments, variables)
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            normalized = self._normalize(
+                data, operation.selection_set, fragments, variables, expires_at
+            )
+            if operation.operation == OperationType.MUTATION:
+                for field in root_fields:
+                    if field != "__typename":
+                        self.invalidate(MUTATION_INVALIDATES.get(field))
+                return
+            if "errors" in result or operation.operation != OperationType.QUERY:
+                return
+            self._queries[self._query_key(query, variables)] = (
+                normalized,
+                root_fields,
+                expires_at,
+            )
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+
+    def invalidate(self, fields: Optional[Iterable[str]] = None):
+        """Evict cached queries using any of `fields`; None evicts all queries"""
+        with self._lock:
+            if fields is None:
+                self._queries.clear()
+                return
+            fields = set(fields)
+            for key in [k for k, entry in self._queries.items() if entry[1] & fields]:
+                del self._queries[key]
+
+    def evict(self, entity_key: str):
+        """Drop one entity, e.g. "Event:123"; queries using it will refetch"""
+        with self._lock:
+            self._entities.pop(entity_key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
+            self._queries.clear()
@@ -3,75 +3,249 @@
 Master script to run all GraphQL test scripts
 """
 
+import argparse
+import importlib
+import json
 import os
 import subprocess
 import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from colorama import Fore, Style, init
+from colorama import Fore, Style
+from console import init_colors
+from graphql_client import GraphQLClient
+from login import check_auth
 
 # Initialize colorama for colored output
-init(autoreset=True)
+init_colors()
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LOG_DIR = os.path.join(SCRIPT_DIR, "..", "logs", "tests")
 
-def run_script(script_name, description):
-    """Run a Python script and return success status"""
-    print(f"\n{Fore.CYAN}{'='*60}")
-    print(f"{Fore.CYAN}🚀 Running: {description}")
-    print(f"{Fore.CYAN}{'='*60}")
+# Test scripts in the order they run sequentially
+TEST_SCRIPTS = [
+    ("test_users.py", "User Operations"),
+    ("test_groups.py", "Group Operations"),
+    ("test_events.py", "Event Operations"),
+    ("test_messages.py", "Message Operations"),
+    ("test_tennis.py", "Tennis League Operations"),
+]
+
+
+def run_script(script_name, description, log_file=None):
+    """Run a Python script and return (success, wall time in seconds)
 
-    script_path = os.path.join(os.path.dirname(__file__), script_name)
+    Output goes straight to the terminal, or to `log_file` when given.
+    """
+    if log_file is None:
+        print(f"\n{Fore.CYAN}{'='*60}")
+        print(f"{Fore.CYAN}🚀 Running: {description}")
+        print(f"{Fore.CYAN}{'='*60}")
+
+    script_path = os.path.join(SCRIPT_DIR, script_name)
+    start = time.perf_counter()
 
     try:
-        result = subprocess.run(
-            [sys.executable, script_path], capture_output=False, text=True
-        )
+        if log_file is None:
+            result = subprocess.run(
+                [sys.executable, script_path], capture_output=False, text=True
+            )
+        else:
+            with open(log_file, "w") as log:
+                result = subprocess.run(
+                    [sys.executable, script_path],
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                )
+        duration = time.perf_counter() - start
+
         if result.returncode == 0:
-            print(f"{Fore.GREEN}✅ {description} completed successfully")
-            return True
+            print(
+                f"{Fore.GREEN}✅ {description} completed successfully ({duration:.2f}s)"
+            )
+            return True, duration
         else:
             print(
                 f"{Fore.RED}❌ {description} failed with return code {result.returncode}"
             )
-            return False
+            return False, duration
     except Exception as e:
         print(f"{Fore.RED}❌ {description} failed with exception: {e}")
-        return False
+        return False, time.perf_counter() - start
+
+
+def run_in_process(script_name, description, client):
+    """Import a test script and call its test function with a shared client
+
+    The function has the same name as the script, e.g. test_users.test_users.
+    Returns (success, wall time in seconds).
+    """
+    print(f"\n{Fore.CYAN}{'='*60}")
+    print(f"{Fore.CYAN}🚀 Running (in-process): {description}")
+    print(f"{Fore.CYAN}{'='*60}")
+
+    module_name = script_name[: -len(".py")]
+    start = time.perf_counter()
+
+    try:
+        test_function = getattr(importlib.import_module(module_name), module_name)
+        success = bool(test_function(client))
+    except SystemExit as e:
+        success = e.code in (None, 0)
+    except Exception as e:
+        print(f"{Fore.RED}❌ {description} failed with exception: {e}")
+        return False, time.perf_counter() - start
+    duration = time.perf_counter() - start
+
+    if success:
+        print(f"{Fore.GREEN}✅ {description} completed successfully ({duration:.2f}s)")
+    else:
+        print(f"{Fore.RED}❌ {description} failed")
+    return success, duration
+
 
+def run_parallel(test_scripts, jobs, log_dir):
+    """Run test scripts concurrently, each logging to its own file
+
+    Scripts create their own fixture groups (see fixtures.py), so they do
+    not depend on each other's data.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    print(f"{Fore.BLUE}⚡ Running {len(test_scripts)} scripts with {jobs} jobs")
+    print(f"{Fore.BLUE}📁 Logs: {os.path.abspath(log_dir)}")
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(
+                run_script,
+                script_name,
+                description,
+                os.path.join(log_dir, script_name.replace(".py", ".log")),
+            )
+            for script_name, description in test_scripts
+        ]
+        # Keep the results in suite order regardless of completion order
+        return [future.result() for future in futures]
+
+
+def write_json_report(path, results, total_time):
+    """Write per-script results and timings as JSON"""
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "total_time": round(total_time, 3),
+        "passed": sum(1 for result in results if result["success"]),
+        "failed": sum(1 for result in results if not result["success"]),
+        "scripts": results,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"{Fore.BLUE}📝 JSON report written to {path}")
+
+
+def write_junit_report(path, results, total_time):
+    """Write per-script results as a JUnit XML test suite"""
+    suite = ET.Element(
+        "testsuite",
+        name="graphql-smoke-tests",
+        tests=str(len(results)),
+        failures=str(sum(1 for result in results if not result["success"])),
+        time=f"{total_time:.3f}",
+        timestamp=datetime.now().isoformat(),
+    )
+    for result in results:
+        case = ET.SubElement(
+            suite,
+            "testcase",
+            classname=result["script"].replace(".py", ""),
+            name=result["description"],
+            time=f"{result['duration']:.3f}",
+        )
+        if not result["success"]:
+            failure = ET.SubElement(case, "failure", message="Script failed")
+            if result.get("log_file"):
+                failure.text = f"See {result['log_file']}"
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+    print(f"{Fore.BLUE}📝 JUnit report written to {path}")
+
+
+def main(argv=None):
+    """Run all test scripts, sequentially or in parallel"""
+    parser = argparse.ArgumentParser(description="Run all GraphQL test scripts")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of scripts to run at once (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--log-dir",
+        default=DEFAULT_LOG_DIR,
+        help="Directory for per-script logs in parallel mode (default: logs/tests)",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Import and run the tests in this process with one shared client",
+    )
+    parser.add_argument("--json-report", help="Write a JSON report to this file")
+    parser.add_argument("--junit-report", help="Write a JUnit XML report to this file")
+    args = parser.parse_args(argv)
+    if args.in_process and args.jobs > 1:
+        parser.error("--in-process runs tests sequentially; drop --jobs")
 
-def main():
-    """Run all test scripts in sequence"""
     print(f"{Fore.CYAN}🎯 Clubs Application - Complete GraphQL Test Suite")
     print(f"{Fore.CYAN}{'='*60}")
 
     # Check if user is authenticated first
     print(f"{Fore.BLUE}🔐 Checking authentication...")
-    auth_result = subprocess.run(
-        [sys.executable, "login.py", "check"], capture_output=True, text=True
-    )
-
-    if auth_result.returncode != 0:
+    # In-process runs reuse this client, its token and its connection pool
+    client = GraphQLClient() if args.in_process else None
+    if not check_auth(client):
         print(f"{Fore.RED}❌ Not authenticated. Please run login first:")
         print(f"{Fore.YELLOW}   python login.py")
         return False
 
     print(f"{Fore.GREEN}✅ Authentication verified")
 
-    # Define test scripts in order
-    test_scripts = [
-        ("test_users.py", "User Operations"),
-        ("test_groups.py", "Group Operations"),
-        ("test_events.py", "Event Operations"),
-        ("test_messages.py", "Message Operations"),
-        ("test_tennis.py", "Tennis League Operations"),
-    ]
-
     # Run all tests
+    suite_start = time.perf_counter()
+    if args.in_process:
+        outcomes = [
+            run_in_process(script_name, description, client)
+            for script_name, description in TEST_SCRIPTS
+        ]
+        client.close()
+    elif args.jobs > 1:
+        outcomes = run_parallel(TEST_SCRIPTS, args.jobs, args.log_dir)
+    else:
+        outcomes = [
+            run_script(script_name, description)
+            for script_name, description in TEST_SCRIPTS
+        ]
+    total_time = time.perf_counter() - suite_start
+
     results = []
-    for script_name, description in test_scripts:
-        success = run_script(script_name, description)
-        results.append((description, success))
+    for (script_name, description), (success, duration) in zip(TEST_SCRIPTS, outcomes):
+        results.append(
+            {
+                "script": script_name,
+                "description": description,
+                "success": success,
+                "duration": round(duration, 3),
+                "log_file": (
+                    os.path.join(args.log_dir, script_name.replace(".py", ".log"))
+                    if args.jobs > 1
+                    else None
+                ),
+            }
+        )
 
     # Summary
     print(f"\n{Fore.CYAN}{'='*60}")
@@ -81,18 +255,28 @@ def main():
     passed = 0
     failed = 0
 
-    for description, success in results:
-        if success:
-            print(f"{Fore.GREEN}✅ {description}: PASSED")
+    for result in results:
+        if result["success"]:
+            print(
+                f"{Fore.GREEN}✅ {result['description']}: PASSED ({result['duration']:.2f}s)"
+            )
             passed += 1
         else:
-            print(f"{Fore.RED}❌ {description}: FAILED")
+            print(
+                f"{Fore.RED}❌ {result['description']}: FAILED ({result['duration']:.2f}s)"
+            )
             failed += 1
 
     print(f"\n{Fore.CYAN}📈 Final Results:")
     print(f"{Fore.GREEN}   Passed: {passed}")
     print(f"{Fore.RED}   Failed: {failed}")
     print(f"{Fore.CYAN}   Total: {len(results)}")
+    print(f"{Fore.CYAN}   Wall time: {total_time:.2f}s")
+
+    if args.json_report:
+        write_json_report(args.json_report, results, total_time)
+    if args.junit_report:
+        write_junit_report(args.junit_report, results, total_time)
 
     if failed == 0:
         print(
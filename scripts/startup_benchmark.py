@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the scripts
+
+Imports each entry-point module in a fresh interpreter with
+`python -X importtime`, takes the best cumulative import time of several
+runs (the least disturbed by other load, as timeit does), and checks it
+against a budget. Modules that must stay lazy (asyncio and websockets
+load only once subscriptions are used) are checked too. Exits non-zero when a budget is exceeded or a lazy module is imported.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from colorama import Fore, Style
+from console import init_colors
+
+# Initialize colorama for colored output
+init_colors()
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time budget per module, in milliseconds
+# (about 1.5x a quiet run, leaving room for noisy CI machines)
+BUDGETS_MS = {
+    "graphql_client": 200,
+    "login": 200,
+    "run_all_tests": 220,
+    "loadgen": 220,
+    "db_dump": 100,
+    "db_restore": 80,
+    "persisted_queries": 25,
+    "response_cache": 25,
+}
+
+# Modules that one-shot use must not pull in
+LAZY_MODULES = ("asyncio", "websockets", "aiohttp")
+
+
+class ImportLine(NamedTuple):
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> List[ImportLine]:
+    """Parse `-X importtime` lines: "import time: self | cumulative | name" """
+    lines = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        stripped = name.lstrip(" ")
+        lines.append(
+            ImportLine(
+                stripped,
+                (len(name) - len(stripped) - 1) // 2,
+                int(self_us),
+                int(cumulative_us),
+            )
+        )
+    return lines
+
+
+def measure(module: str, runs: int) -> Tuple[float, List[ImportLine]]:
+    """Best cumulative import time of `module` in ms, and the last run's lines"""
+    timings = []
+    lines: List[ImportLine] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=SCRIPTS_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+        lines = parse_importtime(result.stderr)
+        top = [line for line in lines if line.name == module and line.depth == 0]
+        timings.append(top[-1].cumulative_us / 1000)
+    return min(timings), lines
+
+
+def run_benchmark(modules: Dict[str, float], runs: int, top: int) -> Dict[str, Dict]:
+    report = {}
+    for module, budget in modules.items():
+        best_ms, lines = measure(module, runs)
+        imported = {line.name for line in lines}
+        lazy_violations = []
+        if module in BUDGETS_MS:  # entry points; ad-hoc modules may need asyncio
+            lazy_violations = [name for name in LAZY_MODULES if name in imported]
+        slowest = sorted(lines, key=lambda line: line.self_us, reverse=True)[:top]
+        report[module] = {
+            "best_ms": round(best_ms, 1),
+            "budget_ms": budget,
+            "over_budget": best_ms > budget,
+            "lazy_violations": lazy_violations,
+            "slowest": [(line.name, round(line.self_us / 1000, 1)) for line in slowest],
+        }
+    return report
+
+
+def print_report(report: Dict[str, Dict], verbose: bool):
+    width = max(len(module) for module in report)
+    for module, entry in report.items():
+        ok = not entry["over_budget"] and not entry["lazy_violations"]
+        color = Fore.GREEN if ok else Fore.RED
+        status = "✅" if ok else "❌"
+        print(
+            f"{color}{status} {module:<{width}} {entry['best_ms']:7.1f} ms "
+            f"(budget {entry['budget_ms']} ms)"
+        )
+        if entry["lazy_violations"]:
+            print(
+                f"{Fore.RED}   imports {', '.join(entry['lazy_violations'])} at startup"
+            )
+        if verbose or not ok:
+            for name, self_ms in entry["slowest"]:
+                print(f"{Style.DIM}   {self_ms:7.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check script import times against a budget"
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        help="Modules to check (default: all with a budget)",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Runs per module (default: 5)"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="Budget in ms for every checked module, overriding the defaults",
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="Slowest imports listed (default: 5)"
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="List slowest imports always"
+    )
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    args = parser.parse_args()
+
+    unknown = [module for module in args.modules if module not in BUDGETS_MS]
+    if unknown and args.budget is None:
+        parser.error(f"no budget for {', '.join(unknown)}; pass --budget")
+    modules = {
+        module: args.budget if args.budget is not None else BUDGETS_MS[module]
+        for module in (args.modules or BUDGETS_MS)
+    }
+
+    try:
+        report = run_benchmark(modules, args.runs, args.top)
+    except RuntimeError as e:
+        print(f"{Fore.RED}❌ {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{Fore.CYAN}⏱️  Script startup (best of {args.runs} runs)")
+        print(f"{Fore.CYAN}{'='*50}")
+        print_report(report, args.verbose)
+
+    failed = [
+        module
+        for module, entry in report.items()
+        if entry["over_budget"] or entry["lazy_violations"]
+    ]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Latency statistics shared by the load and stress generators
+"""
+
+from typing import List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(0, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
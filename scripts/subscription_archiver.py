@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Archive subscription streams to a durable sink
+
+Subscribes to messageAdded for each group and rsvpUpdated for each event
+over one multiplexed websocket, and writes the events in batches to a
+JSONL file or SQLite database instead of printing them. A bounded queue
+sits between the subscriptions and the writer: when the sink falls
+behind, the subscriptions stop reading and the server buffers, rather
+than the archiver growing without limit. Ctrl-C (or SIGTERM) stops the
+subscriptions and writes out everything still queued before exiting.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import queue
+import signal
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from colorama import Fore
+from console import init_colors
+from graphql_client import GraphQLClient
+from subscriptions import Subscription, SubscriptionError
+
+# Initialize colorama for colored output
+init_colors()
+
+MESSAGE_ADDED = """
+subscription MessageAdded($groupId: ID!) {
+    messageAdded(groupId: $groupId) {
+        id
+        content
+        createdAt
+        group { id }
+        user { id username }
+    }
+}
+"""
+
+RSVP_UPDATED = """
+subscription RSVPUpdated($eventId: ID!) {
+    rsvpUpdated(eventId: $eventId) {
+        id
+        status
+        note
+        createdAt
+        event { id }
+        user { id username }
+    }
+}
+"""
+
+Event = Dict[str, Any]
+
+
+class JSONLSink:
+    """Append events to a file, one JSON document per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "a")
+
+    def write(self, events: List[Event]):
+        self.file.write(
+            "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        )
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SQLiteSink:
+    """Insert events into a SQLite table, one transaction per batch"""
+
+    def __init__(self, path: str, table: str = "events"):
+        self.path = path
+        self.table = table
+        # Batches are written from a worker thread
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "id INTEGER PRIMARY KEY, channel TEXT, key TEXT, "
+            "received_at REAL, payload TEXT)"
+        )
+        self.connection.commit()
+
+    def write(self, events: List[Event]):
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO {self.table} (channel, key, received_at, payload) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        event["channel"],
+                        event["key"],
+                        event["received_at"],
+                        json.dumps(event["payload"]),
+                    )
+                    for event in events
+                ],
+            )
+
+    def close(self):
+        self.connection.close()
+
+
+class QueueSink:
+    """Hand batches to a local queue.Queue for another thread to process
+
+    With a bounded queue, a slow consumer thread slows the archiver down
+    instead of letting batches pile up.
+    """
+
+    def __init__(self, batches: Optional[queue.Queue] = None, maxsize: int = 100):
+        self.batches = batches if batches is not None else queue.Queue(maxsize)
+
+    def write(self, events: List[Event]):
+        self.batches.put(events)
+
+    def close(self):
+        self.batches.put(None)
+
+
+def open_sink(spec: str):
+    """Open a sink from "jsonl:<path>" or "sqlite:<path>" """
+    kind, _, path = spec.partition(":")
+    if kind == "jsonl" and path:
+        return JSONLSink(path)
+    if kind == "sqlite" and path:
+        return SQLiteSink(path)
+    raise ValueError(f"Unknown sink '{spec}' (use jsonl:<path> or sqlite:<path>)")
+
+
+async def pump(
+    subscription: Subscription, channel: str, key: str, events: asyncio.Queue
+):
+    """Move payloads from one subscription into the shared bounded queue"""
+    async for payload in subscription:
+        await events.put(
+            {
+                "channel": channel,
+                "key": key,
+                "received_at": time.time(),
+                "payload": payload,
+            }
+        )
+
+
+async def consume(
+    events: asyncio.Queue,
+    sink,
+    batch_size: int = 500,
+    flush_interval: float = 1.0,
+    stats: Optional[Dict[str, int]] = None,
+) -> int:
+    """Write events from the queue to the sink in batches until None arrives
+
+    A batch is written when it reaches `batch_size` events or when
+    `flush_interval` seconds have passed since its first event. Sink
+    writes run in a worker thread so the event loop keeps reading.
+    """
+    loop = asyncio.get_running_loop()
+    stats = stats if stats is not None else {}
+    stats.setdefault("written", 0)
+    stats.setdefault("batches", 0)
+    finished = False
+    while not finished:
+        event = await events.get()
+        if event is None:
+            break
+        batch = [event]
+        deadline = loop.time() + flush_interval
+        while len(batch) < batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                event = await asyncio.wait_for(events.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if event is None:
+                finished = True
+                break
+            batch.append(event)
+        await loop.run_in_executor(None, sink.write, batch)
+        stats["written"] += len(batch)
+        stats["batches"] += 1
+    return stats["written"]
+
+
+async def report_progress(
+    stats: Dict[str, int], events: asyncio.Queue, interval: float
+):
+    """Print one throughput line per interval instead of one per event"""
+    last = 0
+    while True:
+        await asyncio.sleep(interval)
+        written = stats.get("written", 0)
+        print(
+            f"{Fore.BLUE}📦 {written} events archived "
+            f"({(written - last) / interval:.0f}/s, {events.qsize()} queued)"
+        )
+        last = written
+
+
+async def drain(events: asyncio.Queue, writer: asyncio.Future):
+    """Tell the writer to finish and wait until the queue is written out"""
+    end = asyncio.ensure_future(events.put(None))
+    # A writer that failed stops reading, so do not wait on a full queue
+    await asyncio.wait({end, writer}, return_when=asyncio.FIRST_COMPLETED)
+    end.cancel()
+    await writer
+
+
+async def archive(args) -> Dict[str, int]:
+    client = GraphQLClient(args.base_url, verbose=False)
+    if not client.token:
+        raise RuntimeError("Not authenticated. Please run login first.")
+
+    # Stop cleanly on Ctrl-C/SIGTERM instead of having asyncio.run cancel
+    # archive() with events still queued
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    handled = []
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+            handled.append(sig)
+        except (NotImplementedError, RuntimeError):
+            pass  # no loop signal handlers on this platform
+
+    def restore_signals():
+        # A second Ctrl-C while draining interrupts as usual
+        while handled:
+            loop.remove_signal_handler(handled.pop())
+
+    sink = open_sink(args.sink)
+    events: asyncio.Queue = asyncio.Queue(args.max_queue)
+    stats: Dict[str, int] = {}
+    try:
+        async with client.subscriptions(max_queue=args.max_queue) as manager:
+            pumps = []
+            for group_id in args.group_id:
+                subscription = await manager.subscribe(
+                    MESSAGE_ADDED, {"groupId": group_id}
+                )
+                pumps.append(pump(subscription, "messageAdded", group_id, events))
+            for event_id in args.event_id:
+                subscription = await manager.subscribe(
+                    RSVP_UPDATED, {"eventId": event_id}
+                )
+                pumps.append(pump(subscription, "rsvpUpdated", event_id, events))
+            print(
+                f"{Fore.GREEN}✅ {len(pumps)} subscriptions on one connection, "
+                f"writing to {args.sink}"
+            )
+
+            writer = asyncio.ensure_future(
+                consume(events, sink, args.batch_size, args.flush_interval, stats)
+            )
+            progress = asyncio.ensure_future(
+                report_progress(stats, events, args.report_interval)
+            )
+            pumping = asyncio.ensure_future(asyncio.gather(*pumps))
+            stopping = asyncio.ensure_future(stop.wait())
+            try:
+                await asyncio.wait(
+                    {pumping, stopping},
+                    timeout=args.duration or None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                restore_signals()
+                if stop.is_set():
+                    print(f"\n{Fore.YELLOW}⚠️  Stopping, writing queued events...")
+            finally:
+                failed = pumping.done()
+                progress.cancel()
+                stopping.cancel()
+                pumping.cancel()
+                stats["reconnects"] = manager.reconnects
+                # Written out even when a pump failed; its error is raised below
+                await drain(events, writer)
+            await asyncio.wait({pumping})
+            error = pumping.exception()
+            if failed and error:
+                raise error
+    finally:
+        restore_signals()
+        sink.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive subscription streams")
+    parser.add_argument(
+        "--group-id",
+        action="append",
+        default=[],
+        help="Archive messageAdded for this group (repeatable)",
+    )
+    parser.add_argument(
+        "--event-id",
+        action="append",
+        default=[],
+        help="Archive rsvpUpdated for this event (repeatable)",
+    )
+    parser.add_argument(
+        "--sink",
+        default="jsonl:subscriptions.jsonl",
+        help="jsonl:<path> or sqlite:<path> (default: jsonl:subscriptions.jsonl)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Events per write (default: 500)"
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=1.0,
+        help="Max seconds an event waits for its batch (default: 1)",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=10000,
+        help="Events buffered before reading pauses (default: 10000)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0,
+        help="Seconds to run; 0 runs until interrupted (default: 0)",
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=10,
+        help="Seconds between progress lines (default: 10)",
+    )
+    parser.add_argument("--base-url", default="http://localhost:4010")
+    args = parser.parse_args()
+
+    if not args.group_id and not args.event_id:
+        parser.error("give at least one --group-id or --event-id")
+
+    print(f"{Fore.CYAN}🗄️  Clubs Subscription Archiver")
+    print(f"{Fore.CYAN}{'='*50}")
+
+    try:
+        stats = asyncio.run(archive(args))
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}⚠️  Interrupted")
+        return 0
+    except (ValueError, RuntimeError, ConnectionError, SubscriptionError) as e:
+        print(f"{Fore.RED}❌ {e}")
+        return 1
+
+    print(
+        f"{Fore.GREEN}✅ Archived {stats.get('written', 0)} events in "
+        f"{stats.get('batches', 0)} batches ({stats.get('reconnects', 0)} reconnects)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Subscription fan-out stress tester
+
+Opens many concurrent GraphQL subscriptions (messageAdded, eventCreated or
+rsvpUpdated) from one asyncio loop, publishes uniquely tagged mutations
+while they listen, and reports end-to-end delivery latency plus lost and
+duplicated events per subscriber.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+import uuid
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import websockets
+from async_graphql_client import AsyncGraphQLClient
+from colorama import Fore
+from console import init_colors
+from stats import percentile
+
+# Initialize colorama for colored output
+init_colors()
+
+PROTOCOL = "graphql-transport-ws"
+
+
+class Channel(NamedTuple):
+    subscription: str
+    mutation: str
+    requires: str  # group or event
+    tag_of: Callable[[Dict[str, Any]], Optional[str]]
+    mutation_variables: Callable[[Dict[str, Any], str], Dict[str, Any]]
+
+
+CHANNELS: Dict[str, Channel] = {
+    "messageAdded": Channel(
+        "subscription MessageAdded($groupId: ID!) { messageAdded(groupId: $groupId) { id content } }",
+        "mutation SendMessage($input: SendMessageInput!) { sendMessage(input: $input) { id } }",
+        "group",
+        lambda data: data["messageAdded"]["content"],
+        lambda ctx, tag: {"input": {"groupId": ctx["group"], "content": tag}},
+    ),
+    "eventCreated": Channel(
+        "subscription EventCreated($groupId: ID!) { eventCreated(groupId: $groupId) { id description } }",
+        "mutation CreateEvent($input: CreateEventInput!) { createEvent(input: $input) { id } }",
+        "group",
+        lambda data: data["eventCreated"]["description"],
+        lambda ctx, tag: {
+            "input": {
+                "groupId": ctx["group"],
+                "date": "2030-01-01T18:00:00Z",
+                "description": tag,
+            }
+        },
+    ),
+    "rsvpUpdated": Channel(
+        "subscription RSVPUpdated($eventId: ID!) { rsvpUpdated(eventId: $eventId) { id note } }",
+        "mutation CreateRSVP($input: CreateRSVPInput!) { createRSVP(input: $input) { id } }",
+        "event",
+        lambda data: data["rsvpUpdated"]["note"],
+        lambda ctx, tag: {
+            "input": {"eventId": ctx["event"], "status": "AVAILABLE", "note": tag}
+        },
+    ),
+}
+
+
+def raise_fd_limit(wanted: int):
+    """Raise the open-file soft limit so thousands of sockets fit"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < wanted:
+        new_soft = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+        if new_soft < wanted:
+            print(
+                f"{Fore.YELLOW}⚠️  Open-file limit is {new_soft}; some connections may fail"
+            )
+
+
+class Subscriber:
+    """One websocket with one subscription, recording tagged deliveries"""
+
+    def __init__(self, index: int, run_id: str):
+        self.index = index
+        self.run_id = run_id
+        self.received: Dict[int, int] = {}  # sequence number -> times delivered
+        self.latencies: List[float] = []
+        self.ready = False
+        self.error: Optional[str] = None
+
+    async def run(
+        self,
+        ws_url: str,
+        channel: Channel,
+        variables: Dict[str, Any],
+        token: Optional[str],
+        sent_at: Dict[int, float],
+        connect_slots: asyncio.Semaphore,
+        ready: asyncio.Event,
+        stop: asyncio.Event,
+    ):
+        websocket = None
+        try:
+            async with connect_slots:
+                websocket = await websockets.connect(
+                    ws_url, subprotocols=[PROTOCOL], open_timeout=30
+                )
+                init_payload = {"Authorization": f"Bearer {token}"} if token else {}
+                await websocket.send(
+                    json.dumps({"type": "connection_init", "payload": init_payload})
+                )
+                ack = json.loads(await asyncio.wait_for(websocket.recv(), 30))
+                if ack.get("type") != "connection_ack":
+                    raise RuntimeError(f"unexpected handshake reply: {ack}")
+                await websocket.send(
+                    json.dumps(
+                        {
+                            "id": "1",
+                            "type": "subscribe",
+                            "payload": {
+                                "query": channel.subscription,
+                                "variables": variables,
+                            },
+                        }
+                    )
+                )
+            self.ready = True
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+            if websocket is not None:
+                await websocket.close()
+            return
+        finally:
+            ready.set()
+
+        prefix = f"stress:{self.run_id}:"
+        stop_task = asyncio.ensure_future(stop.wait())
+        try:
+            while not stop.is_set():
+                recv_task = asyncio.ensure_future(websocket.recv())
+                done, _ = await asyncio.wait(
+                    {recv_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if recv_task not in done:
+                    recv_task.cancel()
+                    break
+                message = json.loads(recv_task.result())
+                received_at = time.perf_counter()
+
+                if message.get("type") == "ping":
+                    await websocket.send(json.dumps({"type": "pong"}))
+                elif message.get("type") == "next":
+                    tag = channel.tag_of(message["payload"].get("data") or {})
+                    if tag and tag.startswith(prefix):
+                        seq = int(tag[len(prefix) :])
+                        self.received[seq] = self.received.get(seq, 0) + 1
+                        if self.received[seq] == 1 and seq in sent_at:
+                            self.latencies.append(received_at - sent_at[seq])
+                elif message.get("type") in ("error", "complete"):
+                    self.error = f"subscription {message.get('type')}: {message}"
+                    break
+        except websockets.ConnectionClosed as e:
+            self.error = f"connection closed: {e}"
+        finally:
+            stop_task.cancel()
+            await websocket.close()
+
+
+async def publish(
+    client: AsyncGraphQLClient,
+    channel: Channel,
+    ctx: Dict[str, Any],
+    run_id: str,
+    count: int,
+    rate: float,
+    sent_at: Dict[int, float],
+) -> int:
+    """Send `count` tagged mutations at `rate` per second; returns failures"""
+    failures = 0
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    for seq in range(count):
+        delay = start + seq * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tag = f"stress:{run_id}:{seq}"
+        sent_at[seq] = time.perf_counter()
+        result = await client.mutation(
+            channel.mutation, channel.mutation_variables(ctx, tag)
+        )
+        if "errors" in result:
+            failures += 1
+            del sent_at[seq]
+    return failures
+
+
+async def run_stress(args) -> Dict[str, Any]:
+    channel = CHANNELS[args.channel]
+    client = AsyncGraphQLClient(args.base_url, verbose=False)
+    if not client.token:
+        raise RuntimeError("Not authenticated. Please run login first.")
+    ws_url = args.base_url.replace("http", "ws", 1) + "/graphql"
+
+    ctx = {"group": args.group_id, "event": args.event_id}
+    if not ctx[channel.requires]:
+        raise RuntimeError(f"--{channel.requires}-id is required for {args.channel}")
+    variables = (
+        {"groupId": ctx["group"]}
+        if channel.requires == "group"
+        else {"eventId": ctx["event"]}
+    )
+
+    run_id = uuid.uuid4().hex[:8]
+    sent_at: Dict[int, float] = {}
+    connect_slots = asyncio.Semaphore(args.connect_concurrency)
+    stop = asyncio.Event()
+    subscribers = [Subscriber(i, run_id) for i in range(args.subscribers)]
+    ready_events = [asyncio.Event() for _ in subscribers]
+
+    print(f"{Fore.BLUE}🔌 Opening {args.subscribers} {args.channel} subscriptions...")
+    connect_start = time.perf_counter()
+    tasks = [
+        asyncio.ensure_future(
+            subscriber.run(
+                ws_url,
+                channel,
+                variables,
+                client.token,
+                sent_at,
+                connect_slots,
+                ready,
+                stop,
+            )
+        )
+        for subscriber, ready in zip(subscribers, ready_events)
+    ]
+    await asyncio.gather(*(ready.wait() for ready in ready_events))
+    connect_time = time.perf_counter() - connect_start
+    active = [subscriber for subscriber in subscribers if subscriber.ready]
+    print(
+        f"{Fore.GREEN}✅ {len(active)}/{len(subscribers)} subscribed in {connect_time:.1f}s"
+    )
+
+    # Let the server finish registering subscriptions before publishing
+    await asyncio.sleep(args.settle)
+
+    print(f"{Fore.BLUE}📤 Publishing {args.count} mutations at {args.rate:g}/s...")
+    async with client:
+        publish_failures = await publish(
+            client, channel, ctx, run_id, args.count, args.rate, sent_at
+        )
+    await asyncio.sleep(args.grace)
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    published = set(sent_at)
+    latencies = sorted(x for subscriber in active for x in subscriber.latencies)
+    lost = sum(
+        1
+        for subscriber in active
+        for seq in published
+        if seq not in subscriber.received
+    )
+    duplicates = sum(
+        count - 1
+        for subscriber in active
+        for count in subscriber.received.values()
+        if count > 1
+    )
+    errors = [subscriber.error for subscriber in subscribers if subscriber.error]
+
+    return {
+        "channel": args.channel,
+        "subscribers": len(subscribers),
+        "connected": len(active),
+        "connect_time": connect_time,
+        "published": len(published),
+        "publish_failures": publish_failures,
+        "expected_deliveries": len(published) * len(active),
+        "delivered": len(latencies),
+        "lost": lost,
+        "duplicates": duplicates,
+        "latency_ms": (
+            {
+                "p50": percentile(latencies, 50) * 1000,
+                "p95": percentile(latencies, 95) * 1000,
+                "p99": percentile(latencies, 99) * 1000,
+                "max": latencies[-1] * 1000,
+            }
+            if latencies
+            else {}
+        ),
+        "errors": errors[:20],
+        "error_count": len(errors),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n{Fore.CYAN}📊 Subscription fan-out results")
+    print(f"{Fore.CYAN}{'='*50}")
+    print(
+        f"   Subscribers: {report['connected']}/{report['subscribers']} connected "
+        f"({report['connect_time']:.1f}s)"
+    )
+    print(f"   Published: {report['published']} ({report['publish_failures']} failed)")
+    print(
+        f"   Deliveries: {report['delivered']}/{report['expected_deliveries']} expected"
+    )
+    color = Fore.RED if report["lost"] or report["duplicates"] else Fore.GREEN
+    print(f"{color}   Lost: {report['lost']}  Duplicated: {report['duplicates']}")
+    if report["latency_ms"]:
+        latency = report["latency_ms"]
+        print(
+            f"   Latency ms: p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  "
+            f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}"
+        )
+    if report["error_count"]:
+        print(f"{Fore.YELLOW}⚠️  {report['error_count']} subscriber errors, e.g.:")
+        for error in report["errors"][:5]:
+            print(f"{Fore.YELLOW}   {error}")
+    print(f"{Fore.CYAN}{'='*50}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test subscription fan-out")
+    parser.add_argument(
+        "--channel",
+        choices=list(CHANNELS),
+        default="messageAdded",
+        help="Subscription to open (default: messageAdded)",
+    )
+    parser.add_argument(
+        "--subscribers", "-n", type=int, default=1000, help="Concurrent subscriptions"
+    )
+    parser.add_argument(
+        "--count", type=int, default=50, help="Mutations to publish (default: 50)"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=5, help="Mutations per second (default: 5)"
+    )
+    parser.add_argument(
+        "--connect-concurrency",
+        type=int,
+        default=100,
+        help="Handshakes in flight at once (default: 100)",
+    )
+    parser.add_argument(
+        "--settle", type=float, default=1, help="Pause before publishing (seconds)"
+    )
+    parser.add_argument(
+        "--grace", type=float, default=5, help="Wait for late deliveries (seconds)"
+    )
+    parser.add_argument("--base-url", default="http://localhost:4010")
+    parser.add_argument("--group-id", help="Group for messageAdded/eventCreated")
+    parser.add_argument("--event-id", help="Event for rsvpUpdated")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}📡 Clubs Subscription Stress Tester")
+    print(f"{Fore.CYAN}{'='*50}")
+
+    raise_fd_limit(args.subscribers + 256)
+    try:
+        report = asyncio.run(run_stress(args))
+    except RuntimeError as e:
+        print(f"{Fore.RED}❌ {e}")
+        return 1
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"{Fore.BLUE}📝 Report written to {args.json}")
+
+    return 0 if report["lost"] == 0 and report["duplicates"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Multiplexed GraphQL subscriptions over one graphql-transport-ws connection
+
+SubscriptionManager keeps a single websocket open, runs any number of
+subscriptions over it under their own ids, answers and sends keep-alive
+pings, and reconnects with backoff, resubscribing everything that was
+active when the connection dropped.
+
+Each subscription buffers at most `max_queue` payloads. When a consumer
+falls behind, the manager stops reading the socket until it catches up,
+so the server and TCP flow control absorb the burst instead of client
+memory. All subscriptions on the connection pause together.
+
+    async with SubscriptionManager(ws_url, token) as manager:
+        async with await manager.subscribe(query, variables) as messages:
+            async for payload in messages:
+                print(payload["data"])
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, Optional
+
+import websockets
+
+PROTOCOL = "graphql-transport-ws"
+
+# Queue marker for the end of a subscription
+_COMPLETE = object()
+
+
+class SubscriptionError(Exception):
+    """The server rejected or failed a subscription"""
+
+    def __init__(self, errors: Any):
+        super().__init__(errors)
+        self.errors = errors
+
+
+class Subscription:
+    """One active subscription; iterate it for `next` payloads"""
+
+    def __init__(
+        self,
+        manager: "SubscriptionManager",
+        id: str,
+        query: str,
+        variables: Optional[Dict[str, Any]],
+        max_queue: int = 0,
+    ):
+        self.manager = manager
+        self.id = id
+        self.query = query
+        self.variables = variables or {}
+        self.queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self.done = False
+        self.error: Optional[SubscriptionError] = None  # set if the manager died
+
+    @property
+    def message(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": "subscribe",
+            "payload": {"query": self.query, "variables": self.variables},
+        }
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self.done:
+            raise StopAsyncIteration
+        if self.error is not None and self.queue.empty():
+            self.done = True
+            raise self.error
+        item = await self.queue.get()
+        if item is _COMPLETE:
+            self.done = True
+            raise StopAsyncIteration
+        if isinstance(item, SubscriptionError):
+            self.done = True
+            raise item
+        return item
+
+    async def unsubscribe(self):
+        """Stop the subscription on the server and end iteration"""
+        if not self.done:
+            self.done = True
+            await self.manager._unsubscribe(self)
+            # Drop what is buffered, releasing the reader if it waits on us,
+            # and wake up a consumer blocked on an empty queue
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_COMPLETE)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.unsubscribe()
+
+
+class SubscriptionManager:
+    """Run many subscriptions over one persistent, self-healing websocket"""
+
+    def __init__(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        ping_interval: float = 20,
+        ping_timeout: float = 10,
+        ack_timeout: float = 10,
+        reconnect_delay: float = 1,
+        max_reconnect_delay: float = 30,
+        max_queue: int = 1000,
+    ):
+        self.url = url
+        self.token = token
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.ack_timeout = ack_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_queue = max_queue
+        self.reconnects = 0
+        self._ids = itertools.count(1)
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._websocket = None
+        self._connected = asyncio.Event()
+        self._pong = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._closing = False
+        self._blocked = False  # reader waiting for a slow consumer
+        self._error: Optional[SubscriptionError] = None
+
+    async def connect(self):
+        """Open the connection; returns once the server has acknowledged it"""
+        if self._runner is None:
+            self._closing = False
+            self._error = None
+            self._runner = asyncio.ensure_future(self._run())
+        connected = asyncio.ensure_future(self._connected.wait())
+        await asyncio.wait(
+            {connected, self._runner}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if not connected.done():
+            connected.cancel()
+            self._runner.result()  # re-raise why the first connection failed
+
+    async def close(self):
+        """Complete every subscription and close the connection"""
+        self._closing = True
+        for subscription in list(self._subscriptions.values()):
+            await subscription.unsubscribe()
+        if self._websocket is not None:
+            await self._websocket.close()
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def subscribe(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        max_queue: Optional[int] = None,
+    ) -> Subscription:
+        """Start a subscription on the shared connection"""
+        if self._error is not None:
+            raise self._error
+        subscription = Subscription(
+            self,
+            str(next(self._ids)),
+            query,
+            variables,
+            self.max_queue if max_queue is None else max_queue,
+        )
+        self._subscriptions[subscription.id] = subscription
+        if self._connected.is_set():
+            await self._send(subscription.message)
+        # Otherwise it is sent when the connection is (re)established
+        return subscription
+
+    async def _unsubscribe(self, subscription: Subscription):
+        if self._subscriptions.pop(subscription.id, None) and self._connected.is_set():
+            try:
+                await self._send({"id": subscription.id, "type": "complete"})
+            except websockets.ConnectionClosed:
+                pass
+
+    async def _send(self, message: Dict[str, Any]):
+        await self._websocket.send(json.dumps(message))
+
+    async def _handshake(self):
+        websocket = await websockets.connect(self.url, subprotocols=[PROTOCOL])
+        try:
+            payload = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+            await websocket.send(
+                json.dumps({"type": "connection_init", "payload": payload})
+            )
+            ack = json.loads(await asyncio.wait_for(websocket.recv(), self.ack_timeout))
+            if ack.get("type") != "connection_ack":
+                raise ConnectionError(f"Unexpected handshake reply: {ack}")
+        except BaseException:
+            await websocket.close()
+            raise
+        return websocket
+
+    async def _run(self):
+        """Serve the connection; if that stops, fail every subscription
+
+        Without this a consumer would wait forever on a queue nothing feeds.
+        """
+        try:
+            await self._serve()
+        except BaseException as e:
+            self._fail(e)
+            raise
+        self._fail(None)
+
+    def _fail(self, cause: Optional[BaseException]):
+        if self._closing and not self._subscriptions:
+            return  # closed normally
+        if isinstance(cause, asyncio.CancelledError):
+            reason = "the subscription manager was cancelled"
+        elif cause is not None:
+            reason = f"the subscription manager failed: {cause!r}"
+        else:
+            reason = "the subscription manager stopped"
+        self._error = SubscriptionError([{"message": f"{self.url}: {reason}"}])
+        self._error.__cause__ = cause
+        subscriptions = list(self._subscriptions.values())
+        self._subscriptions.clear()
+        for subscription in subscriptions:
+            subscription.error = self._error
+            if not subscription.queue.full():
+                # Wake a consumer blocked on an empty queue; a full one is
+                # drained first and then finds `error`
+                subscription.queue.put_nowait(self._error)
+
+    async def _serve(self):
+        """Connect, dispatch messages, and reconnect until closed"""
+        delay = self.reconnect_delay
+        first = True
+        while not self._closing:
+            try:
+                self._websocket = await self._handshake()
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+                if first:
+                    raise ConnectionError(f"Cannot connect to {self.url}: {e}") from e
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            if not first:
+                self.reconnects += 1
+            first = False
+            delay = self.reconnect_delay
+            self._connected.set()
+            pinger = asyncio.ensure_future(self._keepalive())
+            try:
+                for subscription in list(self._subscriptions.values()):
+                    await self._send(subscription.message)
+                async for raw in self._websocket:
+                    await self._dispatch(json.loads(raw))
+            except websockets.ConnectionClosed:
+                pass
+            finally:
+                self._connected.clear()
+                pinger.cancel()
+                await self._websocket.close()
+            if not self._closing:
+                await asyncio.sleep(delay)
+
+    async def _dispatch(self, message: Dict[str, Any]):
+        kind = message.get("type")
+        if kind == "ping":
+            asyncio.ensure_future(self._send({"type": "pong"}))
+            return
+        if kind == "pong":
+            self._pong.set()
+            return
+
+        subscription = self._subscriptions.get(message.get("id"))
+        if subscription is None:
+            return
+        if kind == "next":
+            item = message.get("payload", {})
+        elif kind == "error":
+            del self._subscriptions[subscription.id]
+            item = SubscriptionError(message.get("payload"))
+        elif kind == "complete":
+            del self._subscriptions[subscription.id]
+            item = _COMPLETE
+        else:
+            return
+        if subscription.queue.full():
+            # Backpressure: stop reading the socket until the consumer catches up
+            self._blocked = True
+            try:
+                await subscription.queue.put(item)
+            finally:
+                self._blocked = False
+        else:
+            subscription.queue.put_nowait(item)
+
+    async def _keepalive(self):
+        """Ping the server; drop the connection if it stops answering"""
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            if self._blocked:
+                continue  # pongs are not read while the reader is paused
+            self._pong.clear()
+            await self._send({"type": "ping"})
+            try:
+                await asyncio.wait_for(self._pong.wait(), self.ping_timeout)
+            except asyncio.TimeoutError:
+                await self._websocket.close()
+                return
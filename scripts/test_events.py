@@ -9,12 +9,13 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from colorama import Fore, Style
+from fixtures import create_test_group, delete_test_group
 from graphql_client import GraphQLClient
 
 
-def test_events():
+def test_events(client=None):
     """Test all Event-related GraphQL operations"""
-    client = GraphQLClient()
+    client = client or GraphQLClient()
 
     print(f"{Fore.CYAN}🎯 Testing Event GraphQL Operations")
     print(f"{Fore.CYAN}{'='*50}")
@@ -24,59 +25,18 @@ def test_events():
         print(f"{Fore.RED}❌ Not authenticated. Please run login first.")
         return False
 
-    # First, get user's groups to use for testing
-    print(f"{Fore.BLUE}📋 Getting user's groups...")
-    my_groups_query = """
-    query GetMyGroups {
-        myGroups {
-            id
-            name
-            description
-        }
-    }
-    """
-
-    groups_result = client.query(my_groups_query)
-    client.print_result(groups_result, "Get My Groups")
-
-    if "errors" in groups_result:
-        print(f"{Fore.RED}❌ Cannot proceed without groups")
+    # A group of its own, so parallel runs never share one
+    group = create_test_group(client, "Events")
+    if group is None:
         return False
+    try:
+        return _test_events_in_group(client, group["id"])
+    finally:
+        delete_test_group(client, group["id"])
 
-    groups = groups_result.get("data", {}).get("myGroups", [])
-    if not groups:
-        print(f"{Fore.YELLOW}⚠️  No groups found. Creating a test group...")
-
-        # Create a test group
-        create_group_mutation = """
-        mutation CreateGroup($input: CreateGroupInput!) {
-            createGroup(input: $input) {
-                id
-                name
-                description
-            }
-        }
-        """
-
-        group_variables = {
-            "input": {
-                "name": "Test Group for Events",
-                "description": "A test group for event operations",
-                "isPublic": True,
-            }
-        }
-
-        group_result = client.mutation(create_group_mutation, group_variables)
-        client.print_result(group_result, "Create Test Group")
-
-        if "errors" in group_result:
-            print(f"{Fore.RED}❌ Cannot create test group")
-            return False
-
-        groups = [group_result.get("data", {}).get("createGroup", {})]
 
-    group_id = groups[0]["id"]
-    print(f"{Fore.GREEN}✅ Using group: {groups[0]['name']} (ID: {group_id})")
+def _test_events_in_group(client, group_id):
+    """Run the event tests in the script's own group"""
 
     # Test 1: Create Event
     print(f"\n{Fore.YELLOW}1️⃣ Testing Create Event...")
@@ -258,4 +218,5 @@ def test_events():
 
 
 if __name__ == "__main__":
-    test_events()
+    success = test_events()
+    sys.exit(0 if success else 1)
@@ -8,22 +8,119 @@ import os
 import sys
 from datetime import datetime
 
-import requests
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from graphql_client import GraphQLClient
+
+GROUP_EXPENSES_QUERY = """
+    query GetGroupExpenses($groupId: ID!) {
+        groupExpenses(groupId: $groupId, limit: 10) {
+            id
+            description
+            amount
+            currency
+            category
+            date
+            splitType
+            paidBy {
+                id
+                username
+                firstName
+                lastName
+            }
+            splits {
+                id
+                amount
+                percentage
+                shares
+                user {
+                    id
+                    username
+                    firstName
+                    lastName
+                }
+            }
+        }
+    }
+"""
 
-# Add the parent directory to the path to import the graphql client
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scripts.graphql_client import GraphQLClient
+GROUP_DEBT_SUMMARY_QUERY = """
+    query GetGroupDebtSummary($groupId: ID!) {
+        groupDebtSummary(groupId: $groupId) {
+            user {
+                id
+                username
+                firstName
+                lastName
+            }
+            totalOwed
+            totalOwedTo
+            netAmount
+            debts {
+                toUser {
+                    id
+                    username
+                    firstName
+                    lastName
+                }
+                amount
+                currency
+            }
+        }
+    }
+"""
+
+
+GROUP_SETTLEMENTS_QUERY = """
+    query GetGroupSettlements($groupId: ID!) {
+        groupSettlements(groupId: $groupId) {
+            id
+            amount
+            currency
+            status
+            paymentMethod
+            notes
+            paidAt
+            fromUser {
+                id
+                username
+                firstName
+                lastName
+            }
+            toUser {
+                id
+                username
+                firstName
+                lastName
+            }
+        }
+    }
+"""
+
+
+GROUP_SETTINGS_QUERY = """
+    query GetGroupSettings($groupId: ID!) {
+        groupSettings(groupId: $groupId) {
+            id
+            defaultCurrency
+            allowExpenses
+            expenseLimit
+            requireApproval
+            autoSettle
+        }
+    }
+"""
 
 
 def test_expenses_module():
     """Test the expenses module functionality"""
 
-    # Initialize the GraphQL client
-    client = GraphQLClient()
+    # Initialize the GraphQL client; the large expense queries are sent by hash
+    client = GraphQLClient(persisted_queries=True)
 
     # Check if we have a token
-    if not client.load_token():
+    if not client.token:
         print("❌ No authentication token found. Please run login.py first.")
         return False
 
@@ -65,43 +162,23 @@ def test_expenses_module():
         print(f"❌ Error getting groups: {e}")
         return False
 
+    # Tests 2-5 only read group data, so fetch it in a single batched request
+    group_variables = {"groupId": test_group["id"]}
+    expenses_result, debt_result, settlements_result, settings_result = (
+        client.query_batch(
+            [
+                (GROUP_EXPENSES_QUERY, group_variables),
+                (GROUP_DEBT_SUMMARY_QUERY, group_variables),
+                (GROUP_SETTLEMENTS_QUERY, group_variables),
+                (GROUP_SETTINGS_QUERY, group_variables),
+            ]
+        )
+    )
+
     # Test 2: Get group expenses (should be empty initially)
     print("\n💰 Testing: Get group expenses")
     try:
-        expenses_query = """
-        query GetGroupExpenses($groupId: ID!) {
-            groupExpenses(groupId: $groupId, limit: 10) {
-                id
-                description
-                amount
-                currency
-                category
-                date
-                splitType
-                paidBy {
-                    id
-                    username
-                    firstName
-                    lastName
-                }
-                splits {
-                    id
-                    amount
-                    percentage
-                    shares
-                    user {
-                        id
-                        username
-                        firstName
-                        lastName
-                    }
-                }
-            }
-        }
-        """
-
-        result = client.query(expenses_query, {"groupId": test_group["id"]})
-        expenses = result.get("data", {}).get("groupExpenses", [])
+        expenses = expenses_result.get("data", {}).get("groupExpenses", [])
         print(f"✅ Found {len(expenses)} expenses in group")
 
     except Exception as e:
@@ -111,34 +188,7 @@ def test_expenses_module():
     # Test 3: Get debt summary
     print("\n📊 Testing: Get debt summary")
     try:
-        debt_query = """
-        query GetGroupDebtSummary($groupId: ID!) {
-            groupDebtSummary(groupId: $groupId) {
-                user {
-                    id
-                    username
-                    firstName
-                    lastName
-                }
-                totalOwed
-                totalOwedTo
-                netAmount
-                debts {
-                    toUser {
-                        id
-                        username
-                        firstName
-                        lastName
-                    }
-                    amount
-                    currency
-                }
-            }
-        }
-        """
-
-        result = client.query(debt_query, {"groupId": test_group["id"]})
-        debt_summary = result.get("data", {}).get("groupDebtSummary", [])
+        debt_summary = debt_result.get("data", {}).get("groupDebtSummary", [])
         print(f"✅ Found debt summary for {len(debt_summary)} members")
 
         # Show debt summary
@@ -155,34 +205,7 @@ def test_expenses_module():
     # Test 4: Get group settlements
     print("\n💸 Testing: Get group settlements")
     try:
-        settlements_query = """
-        query GetGroupSettlements($groupId: ID!) {
-            groupSettlements(groupId: $groupId) {
-                id
-                amount
-                currency
-                status
-                paymentMethod
-                notes
-                paidAt
-                fromUser {
-                    id
-                    username
-                    firstName
-                    lastName
-                }
-                toUser {
-                    id
-                    username
-                    firstName
-                    lastName
-                }
-            }
-        }
-        """
-
-        result = client.query(settlements_query, {"groupId": test_group["id"]})
-        settlements = result.get("data", {}).get("groupSettlements", [])
+        settlements = settlements_result.get("data", {}).get("groupSettlements", [])
         print(f"✅ Found {len(settlements)} settlements in group")
 
     except Exception as e:
@@ -192,21 +215,7 @@ def test_expenses_module():
     # Test 5: Get group settings
     print("\n⚙️ Testing: Get group settings")
     try:
-        settings_query = """
-        query GetGroupSettings($groupId: ID!) {
-            groupSettings(groupId: $groupId) {
-                id
-                defaultCurrency
-                allowExpenses
-                expenseLimit
-                requireApproval
-                autoSettle
-            }
-        }
-        """
-
-        result = client.query(settings_query, {"groupId": test_group["id"]})
-        settings = result.get("data", {}).get("groupSettings")
+        settings = settings_result.get("data", {}).get("groupSettings")
 
         if settings:
             print(f"✅ Group settings found:")
@@ -284,7 +293,7 @@ def test_expenses_module():
                 ],
             }
 
-            result = client.mutate(create_expense_mutation, {"input": expense_input})
+            result = client.mutation(create_expense_mutation, {"input": expense_input})
             expense = result.get("data", {}).get("createExpense")
 
             if expense:
@@ -12,9 +12,9 @@ from colorama import Fore, Style
 from graphql_client import GraphQLClient
 
 
-def test_groups():
+def test_groups(client=None):
     """Test all Group-related GraphQL operations"""
-    client = GraphQLClient()
+    client = client or GraphQLClient()
 
     print(f"{Fore.CYAN}👥 Testing Group GraphQL Operations")
     print(f"{Fore.CYAN}{'='*50}")
@@ -287,4 +287,5 @@ def test_groups():
 
 
 if __name__ == "__main__":
-    test_groups()
+    success = test_groups()
+    sys.exit(0 if success else 1)
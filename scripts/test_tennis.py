@@ -12,9 +12,9 @@ from colorama import Fore, Style
 from graphql_client import GraphQLClient
 
 
-def test_tennis():
+def test_tennis(client=None):
     """Test all Tennis League GraphQL operations"""
-    client = GraphQLClient()
+    client = client or GraphQLClient()
 
     print(f"{Fore.CYAN}🎾 Testing Tennis League GraphQL Operations")
     print(f"{Fore.CYAN}{'='*50}")
@@ -170,4 +170,5 @@ def test_tennis():
 
 
 if __name__ == "__main__":
-    test_tennis()
+    success = test_tennis()
+    sys.exit(0 if success else 1)
@@ -12,9 +12,9 @@ from colorama import Fore, Style
 from graphql_client import GraphQLClient
 
 
-def test_users():
+def test_users(client=None):
     """Test all User-related GraphQL operations"""
-    client = GraphQLClient()
+    client = client or GraphQLClient()
 
     print(f"{Fore.CYAN}👤 Testing User GraphQL Operations")
     print(f"{Fore.CYAN}{'='*50}")
@@ -162,4 +162,5 @@ def test_users():
 
 
 if __name__ == "__main__":
-    test_users()
+    success = test_users()
+    sys.exit(0 if success else 1)
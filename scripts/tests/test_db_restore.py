@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for restoring plain SQL dumps written by db_dump.py --format plain
+
+The filter tests need no server. PlainDumpRoundTripTest dumps and restores
+a scratch database and only runs when TEST_DATABASE_URL points at one
+(its contents are replaced) and the PostgreSQL client tools are installed.
+
+Run with: python -m unittest discover -s scripts/tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_restore import strip_database_statements
+
+# The head of a pg_dump --clean --if-exists --create --format=plain dump
+PLAIN_DUMP = b"""--
+-- PostgreSQL database dump
+--
+
+SET statement_timeout = 0;
+SET client_encoding = 'UTF8';
+SELECT pg_catalog.set_config('search_path', '', false);
+
+DROP DATABASE IF EXISTS clubs;
+--
+-- Name: clubs; Type: DATABASE; Schema: -; Owner: -
+--
+
+CREATE DATABASE clubs WITH TEMPLATE = template0 ENCODING = 'UTF8' LOCALE = 'C';
+
+
+\\connect clubs
+
+SET statement_timeout = 0;
+ALTER DATABASE clubs SET search_path TO public;
+COMMENT ON DATABASE clubs IS 'Clubs';
+DROP TABLE IF EXISTS public.notes;
+CREATE TABLE public.notes (id text NOT NULL, body text);
+
+COPY public.notes (id, body) FROM stdin;
+1\tDROP DATABASE clubs;
+2\t\\\\connect clubs
+\\.
+
+"""
+
+
+def statements(dump):
+    return [line.decode() for line in strip_database_statements(dump.splitlines(True))]
+
+
+class StripDatabaseStatementsTest(unittest.TestCase):
+    def test_database_level_statements_are_dropped(self):
+        kept = "".join(statements(PLAIN_DUMP))
+        self.assertNotIn("DROP DATABASE IF EXISTS", kept)
+        self.assertNotIn("CREATE DATABASE", kept)
+        self.assertNotIn("ALTER DATABASE", kept)
+        self.assertNotIn("COMMENT ON DATABASE", kept)
+        self.assertFalse(
+            [line for line in statements(PLAIN_DUMP) if line.startswith("\\connect")]
+        )
+
+    def test_schema_and_session_settings_are_kept(self):
+        kept = statements(PLAIN_DUMP)
+        self.assertEqual(kept.count("SET statement_timeout = 0;\n"), 2)
+        self.assertIn("DROP TABLE IF EXISTS public.notes;\n", kept)
+        self.assertIn(
+            "CREATE TABLE public.notes (id text NOT NULL, body text);\n", kept
+        )
+
+    def test_copy_data_is_passed_through(self):
+        kept = statements(PLAIN_DUMP)
+        start = kept.index("COPY public.notes (id, body) FROM stdin;\n")
+        self.assertEqual(
+            kept[start + 1 : start + 4],
+            ["1\tDROP DATABASE clubs;\n", "2\t\\\\connect clubs\n", "\\.\n"],
+        )
+
+
+@unittest.skipUnless(
+    os.environ.get("TEST_DATABASE_URL") and shutil.which("pg_dump"),
+    "needs TEST_DATABASE_URL and the PostgreSQL client tools",
+)
+class PlainDumpRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        from db_dump import parse_database_url, run_psql
+
+        self.env_vars = {"DATABASE_URL": os.environ["TEST_DATABASE_URL"]}
+        self.db_config = parse_database_url(self.env_vars["DATABASE_URL"])
+        self.env = dict(os.environ, PGPASSWORD=self.db_config["password"])
+        self.psql = lambda sql: run_psql(self.db_config, self.env, sql)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.psql("DROP TABLE IF EXISTS public.restore_test")
+        shutil.rmtree(self.directory)
+
+    def test_restore_into_the_connected_database(self):
+        from db_dump import dump_database
+        from db_restore import restore_database
+
+        self.psql(
+            "DROP TABLE IF EXISTS public.restore_test; "
+            "CREATE TABLE public.restore_test (id int PRIMARY KEY, body text); "
+            "INSERT INTO public.restore_test VALUES (1, 'one'), (2, 'two')"
+        )
+        dump_file = os.path.join(self.directory, "plain.sql")
+        self.assertTrue(dump_database(self.env_vars, dump_file, format="plain"))
+        self.psql("DELETE FROM public.restore_test WHERE id = 2")
+
+        self.assertTrue(restore_database(self.env_vars, dump_file))
+        rows = self.psql("SELECT id, body FROM public.restore_test ORDER BY id")
+        self.assertEqual(rows, [["1", "one"], ["2", "two"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
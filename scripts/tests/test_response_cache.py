@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the normalized response cache (no server needed)
+
+Run with: python -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_cache import NormalizedCache, is_mutation
+
+GROUP_MESSAGES = """
+query GroupMessages($limit: Int) {
+    group(id: "1") { id name messages(limit: $limit) { id content } }
+}
+"""
+
+
+def message(id):
+    return {"__typename": "Message", "id": id, "content": f"message {id}"}
+
+
+def group_result(count):
+    return {
+        "data": {
+            "group": {
+                "__typename": "Group",
+                "id": "1",
+                "name": "Tennis",
+                "messages": [message(str(i)) for i in range(count)],
+            }
+        }
+    }
+
+
+class FieldArgumentsTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = NormalizedCache()
+        self.query = self.cache.prepare(GROUP_MESSAGES)
+
+    def test_same_field_with_other_arguments_is_kept_apart(self):
+        self.cache.write(self.query, {"limit": 2}, group_result(2))
+        self.cache.write(self.query, {"limit": 5}, group_result(5))
+
+        two = self.cache.read(self.query, {"limit": 2})
+        five = self.cache.read(self.query, {"limit": 5})
+        self.assertEqual(len(two["data"]["group"]["messages"]), 2)
+        self.assertEqual(len(five["data"]["group"]["messages"]), 5)
+
+    def test_inline_arguments_and_aliases(self):
+        query = self.cache.prepare("""
+            query {
+                group(id: "1") {
+                    id
+                    recent: messages(limit: 1) { id }
+                    messages(limit: 3) { id }
+                }
+            }
+            """)
+        self.cache.write(
+            query,
+            None,
+            {
+                "data": {
+                    "group": {
+                        "__typename": "Group",
+                        "id": "1",
+                        "recent": [{"__typename": "Message", "id": "0"}],
+                        "messages": [
+                            {"__typename": "Message", "id": str(i)} for i in range(3)
+                        ],
+                    }
+                }
+            },
+        )
+        group = self.cache.read(query)["data"]["group"]
+        self.assertEqual([m["id"] for m in group["recent"]], ["0"])
+        self.assertEqual([m["id"] for m in group["messages"]], ["0", "1", "2"])
+
+    def test_other_arguments_miss_instead_of_returning_stale_data(self):
+        self.cache.write(self.query, {"limit": 2}, group_result(2))
+        self.assertIsNone(self.cache.read(self.query, {"limit": 5}))
+
+    def test_nested_objects_without_id_are_merged(self):
+        first = self.cache.prepare('query { group(id: "1") { id stats { members } } }')
+        second = self.cache.prepare('query { group(id: "1") { id stats { events } } }')
+        self.cache.write(
+            first,
+            None,
+            {
+                "data": {
+                    "group": {
+                        "__typename": "Group",
+                        "id": "1",
+                        "stats": {"__typename": "Stats", "members": 4},
+                    }
+                }
+            },
+        )
+        self.cache.write(
+            second,
+            None,
+            {
+                "data": {
+                    "group": {
+                        "__typename": "Group",
+                        "id": "1",
+                        "stats": {"__typename": "Stats", "events": 7},
+                    }
+                }
+            },
+        )
+        self.assertEqual(self.cache.read(first)["data"]["group"]["stats"]["members"], 4)
+        self.assertEqual(self.cache.read(second)["data"]["group"]["stats"]["events"], 7)
+
+
+class MutationDetectionTest(unittest.TestCase):
+    FRAGMENT_FIRST = """
+    fragment GroupFields on Group { id name }
+    mutation CreateGroup($input: CreateGroupInput!) {
+        createGroup(input: $input) { ...GroupFields }
+    }
+    """
+
+    def test_operation_type_is_read_from_the_document(self):
+        self.assertTrue(is_mutation(self.FRAGMENT_FIRST))
+        self.assertTrue(is_mutation("# comment\nmutation { logout }"))
+        self.assertTrue(is_mutation("mutation{logout}"))
+        self.assertFalse(is_mutation('query { mutationLog(id: "1") { id } }'))
+        self.assertFalse(is_mutation("{ me { id } }"))
+
+    def test_mutation_after_fragment_is_never_served_from_cache(self):
+        cache = NormalizedCache()
+        query = cache.prepare(self.FRAGMENT_FIRST)
+        variables = {"input": {"name": "Tennis"}}
+        result = {
+            "data": {
+                "createGroup": {"__typename": "Group", "id": "9", "name": "Tennis"}
+            }
+        }
+        cache.write(query, variables, result)
+        self.assertIsNone(cache.read(query, variables))
+
+    def test_mutation_evicts_queries_using_its_fields(self):
+        cache = NormalizedCache()
+        groups = cache.prepare("query { myGroups { id name } }")
+        cache.write(
+            groups,
+            None,
+            {"data": {"myGroups": [{"__typename": "Group", "id": "1", "name": "A"}]}},
+        )
+        self.assertIsNotNone(cache.read(groups))
+
+        create = cache.prepare(self.FRAGMENT_FIRST)
+        cache.write(
+            create,
+            {"input": {"name": "B"}},
+            {"data": {"createGroup": {"__typename": "Group", "id": "2", "name": "B"}}},
+        )
+        self.assertIsNone(cache.read(groups))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,14 @@
+-- CreateIndex
+CREATE INDEX "events_group_id_date_idx" ON "events"("group_id", "date");
+
+-- CreateIndex
+CREATE INDEX "messages_group_id_created_at_idx" ON "messages"("group_id", "created_at");
+
+-- CreateIndex
+CREATE INDEX "expenses_group_id_date_idx" ON "expenses"("group_id", "date");
+
+-- CreateIndex
+CREATE INDEX "expenses_paid_by_date_idx" ON "expenses"("paid_by", "date");
+
+-- CreateIndex
+CREATE INDEX "settlements_group_id_created_at_idx" ON "settlements"("group_id", "created_at");
@@ -1,4 +1,5 @@
 import { GraphQLError } from 'graphql';
+import { PageArgs, checkCursor, pageArgs } from '../utils/pagination';
 import { ExpensesService } from './services';
 
 const expensesService = new ExpensesService();
@@ -18,7 +19,7 @@ function requireAuth(context: Context) {
 export const expensesResolvers = {
   Query: {
     // Expense queries
-    groupExpenses: async (_: any, { groupId, limit }: { groupId: string; limit?: number }, context: Context) => {
+    groupExpenses: async (_: any, { groupId, ...page }: { groupId: string } & PageArgs, context: Context) => {
       const user = requireAuth(context);
 
       // Check if user is member of the group
@@ -35,7 +36,7 @@ export const expensesResolvers = {
         throw new GraphQLError('Not authorized to view expenses for this group', { extensions: { code: 'FORBIDDEN' } });
       }
 
-      return expensesService.getGroupExpenses(groupId, limit);
+      return expensesService.getGroupExpenses(groupId, page);
     },
 
     expense: async (_: any, { id }: { id: string }, context: Context) => {
@@ -63,7 +64,7 @@ export const expensesResolvers = {
       return expense;
     },
 
-    userExpenses: async (_: any, { userId }: { userId: string }, context: Context) => {
+    userExpenses: async (_: any, { userId, ...page }: { userId: string } & PageArgs, context: Context) => {
       const currentUser = requireAuth(context);
 
       // Users can only view their own expenses or if they're admin
@@ -73,7 +74,7 @@ export const expensesResolvers = {
         }
       }
 
-      return context.prisma.expense.findMany({
+      const expenses = await context.prisma.expense.findMany({
         where: { paidBy: userId },
         include: {
           splits: {
@@ -98,12 +99,14 @@ export const expensesResolvers = {
           },
           group: true,
         },
-        orderBy: { date: 'desc' },
+        orderBy: [{ date: 'desc' }, { id: 'desc' }],
+        ...pageArgs(page),
       });
+      return checkCursor(expenses, page, (id: string) => context.prisma.expense.findUnique({ where: { id } }));
     },
 
     // Settlement queries
-    groupSettlements: async (_: any, { groupId }: { groupId: string }, context: Context) => {
+    groupSettlements: async (_: any, { groupId, ...page }: { groupId: string } & PageArgs, context: Context) => {
       const user = requireAuth(context);
 
       // Check if user is member of the group
@@ -120,7 +123,7 @@ export const expensesResolvers = {
         throw new GraphQLError('Not authorized to view settlements for this group', { extensions: { code: 'FORBIDDEN' } });
       }
 
-      return expensesService.getGroupSettlements(groupId);
+      return expensesService.getGroupSettlements(groupId, page);
     },
 
     userSettlements: async (_: any, { userId }: { userId: string }, context: Context) => {
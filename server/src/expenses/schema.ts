@@ -166,12 +166,12 @@ export const expensesTypeDefs = gql`
 
   extend type Query {
     # Expense queries
-    groupExpenses(groupId: ID!, limit: Int = 50): [Expense!]!
+    groupExpenses(groupId: ID!, limit: Int = 50, after: ID): [Expense!]!
     expense(id: ID!): Expense
-    userExpenses(userId: ID!): [Expense!]!
+    userExpenses(userId: ID!, limit: Int, after: ID): [Expense!]!
 
     # Settlement queries
-    groupSettlements(groupId: ID!): [Settlement!]!
+    groupSettlements(groupId: ID!, limit: Int, after: ID): [Settlement!]!
     userSettlements(userId: ID!): [Settlement!]!
 
     # Debt queries
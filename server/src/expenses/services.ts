@@ -1,5 +1,6 @@
 import { PaymentMethod, PrismaClient, SettlementStatus, SplitType } from '@prisma/client';
 import { Decimal } from '@prisma/client/runtime/library';
+import { PageArgs, checkCursor, pageArgs } from '../utils/pagination';
 
 const prisma = new PrismaClient();
 
@@ -143,8 +144,8 @@ export class ExpensesService {
   /**
    * Get expenses for a group
    */
-  async getGroupExpenses(groupId: string, limit: number = 50) {
-    return prisma.expense.findMany({
+  async getGroupExpenses(groupId: string, { limit = 50, after }: PageArgs = {}) {
+    const expenses = await prisma.expense.findMany({
       where: { groupId },
       include: {
         splits: {
@@ -169,9 +170,10 @@ export class ExpensesService {
         },
         group: true,
       },
-      orderBy: { date: 'desc' },
-      take: limit,
+      orderBy: [{ date: 'desc' }, { id: 'desc' }],
+      ...pageArgs({ limit, after }),
     });
+    return checkCursor(expenses, { after }, id => prisma.expense.findUnique({ where: { id } }));
   }
 
   /**
@@ -664,8 +666,8 @@ export class ExpensesService {
   /**
    * Get group settlements
    */
-  async getGroupSettlements(groupId: string) {
-    return prisma.settlement.findMany({
+  async getGroupSettlements(groupId: string, page: PageArgs = {}) {
+    const settlements = await prisma.settlement.findMany({
       where: { groupId },
       include: {
         fromUser: {
@@ -686,8 +688,10 @@ export class ExpensesService {
         },
         group: true,
       },
-      orderBy: { createdAt: 'desc' },
+      orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
+      ...pageArgs(page),
     });
+    return checkCursor(settlements, page, id => prisma.settlement.findUnique({ where: { id } }));
   }
 
   /**
@@ -22,6 +22,7 @@ import { config, corsConfig, securityConfig } from './config';
 import { redisClient } from './config/redis';
 import {
   authRateLimiter,
+  graphqlBatchLimit,
   passwordResetRateLimiter,
   rateLimiter,
   requestSizeLimit,
@@ -117,6 +118,9 @@ async function startServer() {
   // Create Apollo Server
   const apolloServer = new ApolloServer({
     schema,
+    // Lets scripts send several operations as one JSON-array request, of at
+    // most MAX_GRAPHQL_BATCH_SIZE operations (see graphqlBatchLimit)
+    allowBatchedHttpRequests: true,
     plugins: [
       ApolloServerPluginDrainHttpServer({ httpServer }),
       {
@@ -135,7 +139,7 @@ async function startServer() {
   await apolloServer.start();
 
   // Apply Apollo middleware (GraphQL endpoint)
-  app.use('/graphql', expressMiddleware(apolloServer, {
+  app.use('/graphql', graphqlBatchLimit, expressMiddleware(apolloServer, {
     context: async ({ req }: { req: Request }) => {
       // Get user from JWT token
       let user = null;
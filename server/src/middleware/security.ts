@@ -330,3 +330,24 @@ export const requestSizeLimit = (req: Request, res: Response, next: NextFunction
 
   next();
 };
+
+// Batched GraphQL requests: the whole array counts as one request for the
+// rate limiter, so cap how many operations it may carry
+export const MAX_GRAPHQL_BATCH_SIZE = 50;
+
+export const graphqlBatchLimit = (req: Request, res: Response, next: NextFunction) => {
+  if (Array.isArray(req.body) && req.body.length > MAX_GRAPHQL_BATCH_SIZE) {
+    logSecurityEvent('GraphQL batch size limit exceeded', {
+      ip: req.ip,
+      userAgent: req.get('user-agent'),
+      url: req.originalUrl,
+      operations: req.body.length,
+    });
+    return res.status(413).json({
+      error: 'Batch too large',
+      message: `Batched requests may contain at most ${MAX_GRAPHQL_BATCH_SIZE} operations`,
+    });
+  }
+
+  next();
+};
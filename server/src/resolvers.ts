@@ -5,6 +5,7 @@ import { withFilter } from 'graphql-subscriptions';
 import { generateToken } from './auth/jwt';
 import { expensesResolvers } from './expenses';
 import { pubsub } from './pubsub';
+import { PageArgs, checkCursor, pageArgs } from './utils/pagination';
 
 const EVENTS = {
   MESSAGE_ADDED: 'MESSAGE_ADDED',
@@ -964,8 +965,12 @@ export const resolvers = {
     },
 
     // Group queries
-    groups: async (_: any, __: any, context: Context) => {
-      return await context.prisma.group.findMany();
+    groups: async (_: any, page: PageArgs, context: Context) => {
+      const groups = await context.prisma.group.findMany({
+        orderBy: [{ createdAt: 'asc' }, { id: 'asc' }],
+        ...pageArgs(page),
+      });
+      return checkCursor(groups, page, id => context.prisma.group.findUnique({ where: { id } }));
     },
 
     group: async (_: any, { id }: { id: string }, context: Context) => {
@@ -997,9 +1002,9 @@ export const resolvers = {
     },
 
     // Event queries
-    events: async (_: any, { groupId }: { groupId: string }, context: Context) => {
+    events: async (_: any, { groupId, ...page }: { groupId: string } & PageArgs, context: Context) => {
       await requireGroupMember(context, groupId);
-      return await context.prisma.event.findMany({
+      const events = await context.prisma.event.findMany({
         where: { groupId },
         include: {
           createdBy: true,
@@ -1009,7 +1014,10 @@ export const resolvers = {
             }
           }
         },
+        orderBy: [{ date: 'asc' }, { id: 'asc' }],
+        ...pageArgs(page),
       });
+      return checkCursor(events, page, id => context.prisma.event.findUnique({ where: { id } }));
     },
 
     event: async (_: any, { id }: { id: string }, context: Context) => {
@@ -1059,14 +1067,15 @@ export const resolvers = {
     },
 
     // Message queries
-    messages: async (_: any, { groupId, limit }: { groupId: string; limit: number }, context: Context) => {
+    messages: async (_: any, { groupId, ...page }: { groupId: string } & PageArgs, context: Context) => {
       await requireGroupMember(context, groupId);
-      return await context.prisma.message.findMany({
+      const messages = await context.prisma.message.findMany({
         where: { groupId },
-        take: limit,
-        orderBy: { createdAt: 'desc' },
+        orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
         include: { user: true },
+        ...pageArgs(page),
       });
+      return checkCursor(messages, page, id => context.prisma.message.findUnique({ where: { id } }));
     },
 
     // Tennis queries - merge from tennisResolvers
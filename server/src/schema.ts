@@ -167,18 +167,21 @@ export const typeDefs = gql`
     userSearch(query: String!): [User!]!
 
     # Group queries
-    groups: [Group!]!
+    # List queries take cursor pagination: pass the id of the last item of a
+    # page as "after" to get the next "limit" items (at most 500). An "after"
+    # item that has since been deleted is an error: start from the first page
+    groups(limit: Int, after: ID): [Group!]!
     group(id: ID!): Group
     myGroups: [Group!]!
     publicGroups(query: String): [Group!]!
 
     # Event queries
-    events(groupId: ID!): [Event!]!
+    events(groupId: ID!, limit: Int, after: ID): [Event!]!
     event(id: ID!): Event
     userPendingEvents: [Event!]!
 
     # Message queries
-    messages(groupId: ID!, limit: Int = 50): [Message!]!
+    messages(groupId: ID!, limit: Int = 50, after: ID): [Message!]!
 
     # Tennis queries
     tennisLeagues: [TeamLeague!]!
@@ -0,0 +1,35 @@
+import { GraphQLError } from 'graphql';
+
+// Cursor pagination for list queries: `after` is the id of the last item of
+// the previous page and `limit` the page size. Lists keep their ordering
+// (with id as a tiebreaker), so a page ends where the next one starts even
+// while new rows are added.
+export interface PageArgs {
+  limit?: number | null;
+  after?: string | null;
+}
+
+// Limits are clamped to 1..MAX_PAGE_SIZE; without one the whole list is returned
+export const MAX_PAGE_SIZE = 500;
+
+export function pageArgs({ limit, after }: PageArgs) {
+  return {
+    ...(limit != null ? { take: Math.min(Math.max(limit, 1), MAX_PAGE_SIZE) } : {}),
+    ...(after ? { cursor: { id: after }, skip: 1 } : {}),
+  };
+}
+
+// Prisma answers a cursor whose row has been deleted with an empty page,
+// which clients would take for the end of the list; report it instead
+export async function checkCursor<T>(
+  items: T[],
+  { after }: PageArgs,
+  exists: (id: string) => Promise<unknown>
+): Promise<T[]> {
+  if (items.length === 0 && after && !(await exists(after))) {
+    throw new GraphQLError(`Cursor ${after} no longer exists; start again from the first page`, {
+      extensions: { code: 'BAD_USER_INPUT' },
+    });
+  }
+  return items;
+}